@@ -3,14 +3,28 @@ import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import re
+import sys
 from config import settings
 from models import Property, PropertyType, PropertyStatus
 from mls_connector import MLSConnector
 
 logger = logging.getLogger(__name__)
 
+_intern = sys.intern
+
+
+def _intern_str(value: Any) -> Any:
+    """Intern repeated neighborhood strings (subdivision, zoning) shared across comps."""
+    return _intern(value) if isinstance(value, str) else value
+
+
+# Shared pooled session so repeated connector calls reuse TCP/TLS connections
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
 
 class ZillowAPIConnector(MLSConnector):
     """Zillow API connector (requires API key approval)."""
@@ -127,17 +141,18 @@ class ZillowAPIConnector(MLSConnector):
 class EstatedAPIConnector(MLSConnector):
     """Estated Data API connector (free tier available)."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         super().__init__()
         self.api_key = api_key
         self.base_url = "https://apis.estated.com/v4"
+        self.session = session or _HTTP_SESSION
 
     def connect(self) -> bool:
         """Connect to Estated API."""
         try:
             # Test connection
             headers = {"Authorization": f"Bearer {self.api_key}"}
-            response = requests.get(f"{self.base_url}/property", headers=headers, params={"address": "test"})
+            response = self.session.get(f"{self.base_url}/property", headers=headers, params={"address": "test"})
             # Even if it fails, we're "connected" - actual errors will show in search
             self.connected = True
             logger.info("Connected to Estated API")
@@ -192,7 +207,7 @@ class EstatedAPIConnector(MLSConnector):
             }
 
             # Try the property endpoint
-            response = requests.get(f"{self.base_url}/property", headers=headers, params=params, timeout=10)
+            response = self.session.get(f"{self.base_url}/property", headers=headers, params=params, timeout=10)
 
             # If that fails, try with individual components
             if response.status_code != 200:
@@ -203,7 +218,7 @@ class EstatedAPIConnector(MLSConnector):
                     "state": state,
                     "zip": zip_code
                 }
-                response = requests.get(f"{self.base_url}/property", headers=headers, params=params, timeout=10)
+                response = self.session.get(f"{self.base_url}/property", headers=headers, params=params, timeout=10)
 
             response.raise_for_status()
             data = response.json()
@@ -406,11 +421,12 @@ class RealtyMoleAPIConnector(MLSConnector):
 class OxylabsScraperConnector(MLSConnector):
     """Oxylabs Web Scraper API connector for scraping Redfin/Zillow."""
 
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password: str, session: Optional[requests.Session] = None):
         super().__init__()
         self.username = username
         self.password = password
         self.base_url = "https://realtime.oxylabs.io/v1/queries"
+        self.session = session or _HTTP_SESSION
 
     def connect(self) -> bool:
         """Connect to Oxylabs API."""
@@ -491,7 +507,7 @@ class OxylabsScraperConnector(MLSConnector):
             }
 
             logger.info(f"Calling Oxylabs API for Redfin: {redfin_url}")
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
                 auth=(self.username, self.password),
                 json=payload,
@@ -546,7 +562,7 @@ class OxylabsScraperConnector(MLSConnector):
             }
 
             logger.info(f"Calling Oxylabs API for Zillow: {zillow_url}")
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
                 auth=(self.username, self.password),
                 json=payload,
@@ -1200,7 +1216,8 @@ class PropertyRadarConnector(MLSConnector):
 
             return self._parse_property_data(property_data, address, city, state, zip_code)
 
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError covers undecodable JSON and pydantic validation errors
             logger.warning(f"PropertyRadar lookup failed: {e}")
             return None
 
@@ -1302,6 +1319,8 @@ class PropertyRadarConnector(MLSConnector):
 
             radar_id = None
             for item in results:
+                if not isinstance(item, dict):
+                    continue
                 candidate_radar = (
                     item.get("RadarID") or item.get("radarId") or item.get("radar_id")
                 )
@@ -1343,8 +1362,8 @@ class PropertyRadarConnector(MLSConnector):
         except requests.exceptions.RequestException as e:
             logger.warning(f"PropertyRadar search request failed: {e}")
             return None
-        except Exception as e:
-            logger.warning(f"PropertyRadar search error: {e}")
+        except ValueError as e:
+            logger.warning(f"PropertyRadar search returned invalid JSON: {e}")
             return None
 
     def _get_property_by_radar_id(self, radar_id: str) -> Optional[Dict[str, Any]]:
@@ -1379,14 +1398,20 @@ class PropertyRadarConnector(MLSConnector):
                 results = data.get('results', [])
                 if results:
                     return results[0]
+            elif response.status_code == 404:
+                # Unknown RadarID is an ordinary miss, not worth a warning
+                logger.debug(f"PropertyRadar has no property for RadarID {radar_id}")
             else:
                 logger.warning(f"PropertyRadar property lookup failed: {response.status_code}")
 
             return None
 
-        except Exception as e:
+        except requests.exceptions.RequestException as e:
             logger.warning(f"PropertyRadar property lookup error: {e}")
             return None
+        except ValueError as e:
+            logger.warning(f"PropertyRadar property lookup returned invalid JSON: {e}")
+            return None
 
     def get_investor_data(self, radar_id: str) -> Dict[str, Any]:
         """Get investor-focused data (equity, liens, ownership status)."""
@@ -1403,8 +1428,8 @@ class PropertyRadarConnector(MLSConnector):
             "is_absentee_owner": property_data.get("isNotSameMailingOrExempt") == 1,
             "last_transfer_date": property_data.get("LastTransferRecDate"),
             "last_transfer_value": property_data.get("LastTransferValue"),
-            "subdivision": property_data.get("Subdivision"),
-            "zoning": property_data.get("Zoning"),
+            "subdivision": _intern_str(property_data.get("Subdivision")),
+            "zoning": _intern_str(property_data.get("Zoning")),
         }
 
     def _parse_property_data(
@@ -1459,8 +1484,8 @@ class PropertyRadarConnector(MLSConnector):
                 "is_free_and_clear": data.get("isFreeAndClear") == 1,
                 "is_cash_buyer": data.get("isCashBuyer") == 1,
                 "is_absentee_owner": data.get("isNotSameMailingOrExempt") == 1,
-                "subdivision": data.get("Subdivision"),
-                "zoning": data.get("Zoning"),
+                "subdivision": _intern_str(data.get("Subdivision")),
+                "zoning": _intern_str(data.get("Zoning")),
                 "has_fireplace": has_fireplace,
                 "has_heating": has_heating,
             }
@@ -1,6 +1,7 @@
 """ATTOM Data Solutions API connector for comparable properties."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
@@ -3074,15 +3075,25 @@ class ATTOMConnector(MLSConnector):
     # ENRICHMENT METHODS - Add data from additional APIs
     # ============================================================================
 
-    def enrich_property_with_additional_data(
-        self, property: Property, max_api_calls: int = 5
-    ) -> Property:
-        """Enrich a property with data from additional ATTOM APIs."""
-        if not self.connected or not property:
-            return property
+    # Cap on in-flight enrichment requests (ATTOM rate-limits per API key)
+    MAX_ENRICHMENT_CONCURRENCY = 8
 
-        api_calls_made = 0
+    def _get_enrichment_attom_id(self, property: Property) -> Optional[str]:
+        """Extract an ATTOM ID for detailed lookups from property metadata."""
+        if not property.mls_data:
+            return None
+        # Try to extract ATTOM ID from various places
+        return (
+            property.mls_data.get("attom_id")
+            or property.mls_data.get("attomID")
+            or property.mls_data.get("@RTPropertyID_ext")
+            or property.mls_data.get("RTPropertyID_ext")
+        )
 
+    def _needed_enrichment_endpoints(
+        self, property: Property, max_api_calls: int
+    ) -> List[str]:
+        """Return the enrichment endpoints to call for a property, in priority order."""
         # Skip enrichment if we already have all the key data we want
         has_school = bool(property.school_district)
         has_description = bool(property.description)
@@ -3107,72 +3118,114 @@ class ATTOMConnector(MLSConnector):
             and (has_sale_data or has_avm_data)
         ):
             logger.debug("Property already has comprehensive data, skipping enrichment")
-            return property
+            return []
 
-        # Get ATTOM ID for detailed lookups (if available)
-        attom_id = None
-        if property.mls_data:
-            # Try to extract ATTOM ID from various places
-            attom_id = (
-                property.mls_data.get("attom_id")
-                or property.mls_data.get("attomID")
-                or property.mls_data.get("@RTPropertyID_ext")
-                or property.mls_data.get("RTPropertyID_ext")
-            )
+        # Endpoints in priority order: assessment -> sale -> AVM -> school.
+        # (AVM is commonly "missing" if we spend the budget on other lookups first)
+        endpoints: List[str] = []
 
         # If no ATTOM ID but we have address, we could try to get it via property search
         # But that would be another API call, so skip for now
-
-        if attom_id:
-            # Priority order: assessment -> sale -> AVM
-            # (AVM is commonly "missing" if we spend the budget on other lookups first)
-
-            # 1. Enhanced assessment data (more detailed than basic v1 assessment)
-            if (
-                not property.mls_data.get("assessment_detail_data")
-                and api_calls_made < max_api_calls
-            ):
-                assessment_data = self.get_assessment_detail(attom_id=attom_id)
-                if assessment_data:
-                    property.mls_data["assessment_detail_data"] = assessment_data
-                    logger.info("✓ Added enhanced assessment data")
-                api_calls_made += 1
-
-            # 2. Enhanced sale data
-            if (
-                not property.mls_data.get("sale_detail_data")
-                and api_calls_made < max_api_calls
-            ):
-                sale_data = self.get_sale_detail(attom_id=attom_id)
-                if sale_data:
-                    property.mls_data["sale_detail_data"] = sale_data
-                    logger.info("✓ Added enhanced sale data")
-                api_calls_made += 1
-
-            # 3. AVM data (automated valuation)
-            if (
-                not property.mls_data.get("avm_data")
-                and api_calls_made < max_api_calls
-            ):
-                avm_data = self.get_avm_detail(attom_id=attom_id)
-                if avm_data:
-                    property.mls_data["avm_data"] = avm_data
-                    logger.info("✓ Added AVM data")
-                api_calls_made += 1
+        if self._get_enrichment_attom_id(property):
+            if not property.mls_data.get("assessment_detail_data"):
+                endpoints.append("assessment")
+            if not property.mls_data.get("sale_detail_data"):
+                endpoints.append("sale")
+            if not property.mls_data.get("avm_data"):
+                endpoints.append("avm")
 
         # Secondary: school district lookup (needs lat/lon, and can be spotty)
-        lat = property.latitude
-        lon = property.longitude
-        if (
-            lat
-            and lon
-            and not property.school_district
-            and api_calls_made < max_api_calls
-        ):
-            school_district = self.get_school_district_by_location(lat, lon)
-            if school_district:
-                property.school_district = school_district
-                logger.info(f"✓ Added school district: {school_district}")
-            api_calls_made += 1
+        if property.latitude and property.longitude and not property.school_district:
+            endpoints.append("school")
 
-        return property
+        # Every attempted call counts against the budget, hit or miss
+        return endpoints[:max_api_calls]
+
+    def _fetch_enrichment(self, property: Property, endpoint: str) -> Any:
+        """Call a single enrichment endpoint for a property."""
+        if endpoint == "school":
+            return self.get_school_district_by_location(
+                property.latitude, property.longitude
+            )
+
+        attom_id = self._get_enrichment_attom_id(property)
+        if endpoint == "assessment":
+            return self.get_assessment_detail(attom_id=attom_id)
+        if endpoint == "sale":
+            return self.get_sale_detail(attom_id=attom_id)
+        if endpoint == "avm":
+            return self.get_avm_detail(attom_id=attom_id)
+
+        raise ValueError(f"Unknown enrichment endpoint: {endpoint}")
+
+    def _apply_enrichment(self, property: Property, endpoint: str, data: Any) -> None:
+        """Store an enrichment endpoint response on the property."""
+        if not data:
+            return
+
+        if endpoint == "assessment":
+            property.mls_data["assessment_detail_data"] = data
+            logger.info("✓ Added enhanced assessment data")
+        elif endpoint == "sale":
+            property.mls_data["sale_detail_data"] = data
+            logger.info("✓ Added enhanced sale data")
+        elif endpoint == "avm":
+            property.mls_data["avm_data"] = data
+            logger.info("✓ Added AVM data")
+        elif endpoint == "school":
+            property.school_district = data
+            logger.info(f"✓ Added school district: {data}")
+
+    def enrich_property_with_additional_data(
+        self, property: Property, max_api_calls: int = 5
+    ) -> Property:
+        """Enrich a property with data from additional ATTOM APIs."""
+        if not self.connected or not property:
+            return property
+
+        return self.enrich_properties(
+            [property], max_api_calls_per_property=max_api_calls
+        )[0]
+
+    def enrich_properties(
+        self, properties: List[Property], max_api_calls_per_property: int = 2
+    ) -> List[Property]:
+        """Enrich several properties with additional ATTOM APIs in one concurrent wave.
+
+        All (property, endpoint) lookups are collected up front and dispatched
+        together, capped at MAX_ENRICHMENT_CONCURRENCY in-flight requests, instead
+        of one sequential round-trip per endpoint per property. Responses are
+        applied back to each property in priority order, so the result matches
+        enriching the properties one at a time.
+        """
+        if not self.connected:
+            return properties
+
+        jobs = [
+            (index, endpoint)
+            for index, prop in enumerate(properties)
+            if prop
+            for endpoint in self._needed_enrichment_endpoints(
+                prop, max_api_calls_per_property
+            )
+        ]
+        if not jobs:
+            return properties
+
+        if len(jobs) == 1:
+            results = [self._fetch_enrichment(properties[jobs[0][0]], jobs[0][1])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.MAX_ENRICHMENT_CONCURRENCY, len(jobs))
+            ) as executor:
+                results = list(
+                    executor.map(
+                        lambda job: self._fetch_enrichment(properties[job[0]], job[1]),
+                        jobs,
+                    )
+                )
+
+        for (index, endpoint), data in zip(jobs, results):
+            self._apply_enrichment(properties[index], endpoint, data)
+
+        return properties
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+
+from unittest_helpers import make_property
+
+
+class TestATTOMEnrichment(unittest.TestCase):
+    def setUp(self) -> None:
+        from attom_connector import ATTOMConnector
+
+        self.conn = ATTOMConnector(api_key="test")
+        # Force "connected" for unit test (no network)
+        self.conn.connected = True
+
+    def test_enrich_properties_applies_responses_by_property(self) -> None:
+        props = [
+            make_property("A", mls_data={"attom_id": "1"}),
+            make_property("B", mls_data={"attom_id": "2"}),
+        ]
+
+        with patch.object(
+            self.conn, "get_assessment_detail", side_effect=lambda attom_id: {"id": attom_id}
+        ) as assessment, patch.object(
+            self.conn, "get_sale_detail", side_effect=lambda attom_id: {"sale": attom_id}
+        ) as sale, patch.object(self.conn, "get_avm_detail") as avm:
+            result = self.conn.enrich_properties(props, max_api_calls_per_property=2)
+
+        self.assertIs(result[0], props[0])
+        self.assertEqual(props[0].mls_data["assessment_detail_data"], {"id": "1"})
+        self.assertEqual(props[1].mls_data["assessment_detail_data"], {"id": "2"})
+        self.assertEqual(props[0].mls_data["sale_detail_data"], {"sale": "1"})
+        self.assertEqual(props[1].mls_data["sale_detail_data"], {"sale": "2"})
+        self.assertEqual(assessment.call_count, 2)
+        self.assertEqual(sale.call_count, 2)
+        # Budget of 2 calls per property is spent before AVM
+        avm.assert_not_called()
+
+    def test_enrich_property_respects_call_budget_order(self) -> None:
+        prop = make_property(
+            "A",
+            mls_data={"attom_id": "1", "assessment_detail_data": {"x": 1}},
+            latitude=33.4,
+            longitude=-111.8,
+        )
+
+        with patch.object(self.conn, "get_sale_detail", return_value=None), patch.object(
+            self.conn, "get_avm_detail", return_value={"avm": 1}
+        ), patch.object(
+            self.conn, "get_school_district_by_location", return_value="Mesa USD"
+        ) as school:
+            self.conn.enrich_property_with_additional_data(prop, max_api_calls=2)
+
+        self.assertNotIn("sale_detail_data", prop.mls_data)
+        self.assertEqual(prop.mls_data["avm_data"], {"avm": 1})
+        school.assert_not_called()
+        self.assertIsNone(prop.school_district)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,14 @@
 """Main bot interface for ATTOM comp analysis."""
 
 import logging
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 
 from attom_connector import ATTOMConnector
 from comp_analyzer import CompAnalyzer
 from comp_guidelines_trainer import CompGuidelinesTrainer
-from config import settings
+from config import runtime_policy, settings
 from models import CompResult, Property, PropertyStatus
 from trainer import CompTrainer
 
@@ -16,6 +17,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Feature switches resolved once at import (they are not toggled at runtime)
+_ENABLE_LEARNING = settings.enable_learning
+_ESTATED_ENABLED = bool(settings.estated_enabled and settings.estated_api_key)
+
+# Square-footage tiers for room estimation: upper bounds (exclusive) and the
+# bedrooms/bathrooms typical for each tier. Homes past the last bound use a ratio.
+_SQFT_TIERS = (1000, 1500, 2000, 2500, 3000, 3500, 4000, 5000)
+_BEDS_BY_TIER = (2, 2, 3, 3, 4, 4, 5, 5)
+_BATHS_BY_TIER = (1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5)
+
+# Property-type families that shift the room estimate
+_ROOM_TYPE_DEFAULT = 0
+_ROOM_TYPE_CONDO = 1  # Condos/townhouses
+_ROOM_TYPE_MULTI = 2  # Multi-family
+
+
+def _room_type_family(property_type) -> int:
+    """Classify a property type for room estimation."""
+    if property_type and hasattr(property_type, "value"):
+        prop_type_str = property_type.value.lower()
+        if "condo" in prop_type_str or "townhouse" in prop_type_str:
+            return _ROOM_TYPE_CONDO
+        if "multi" in prop_type_str:
+            return _ROOM_TYPE_MULTI
+    return _ROOM_TYPE_DEFAULT
+
 
 def estimate_rooms_from_sqft(
     square_feet: Optional[int], property_type=None
@@ -33,49 +60,82 @@ def estimate_rooms_from_sqft(
 
     # Use tiered estimation based on square footage ranges
     # This is more accurate than a simple ratio
-    if square_feet < 1000:
-        estimated_bedrooms = 2
-        estimated_bathrooms = 1.0
-    elif square_feet < 1500:
-        estimated_bedrooms = 2
-        estimated_bathrooms = 1.5
-    elif square_feet < 2000:
-        estimated_bedrooms = 3
-        estimated_bathrooms = 2.0
-    elif square_feet < 2500:
-        estimated_bedrooms = 3
-        estimated_bathrooms = 2.5
-    elif square_feet < 3000:
-        estimated_bedrooms = 4
-        estimated_bathrooms = 3.0
-    elif square_feet < 3500:
-        estimated_bedrooms = 4
-        estimated_bathrooms = 3.5
-    elif square_feet < 4000:
-        estimated_bedrooms = 5
-        estimated_bathrooms = 4.0
-    elif square_feet < 5000:
-        estimated_bedrooms = 5
-        estimated_bathrooms = 4.5
+    tier = bisect_right(_SQFT_TIERS, square_feet)
+    if tier < len(_SQFT_TIERS):
+        estimated_bedrooms = _BEDS_BY_TIER[tier]
+        estimated_bathrooms = _BATHS_BY_TIER[tier]
     else:
         # For very large homes, use ratio but cap reasonably
         estimated_bedrooms = min(6, max(5, int(square_feet / 800)))
         estimated_bathrooms = min(6.0, max(5.0, round(square_feet / 900, 1)))
 
     # Adjust for property type
-    if property_type and hasattr(property_type, "value"):
-        prop_type_str = property_type.value.lower()
-        if "condo" in prop_type_str or "townhouse" in prop_type_str:
-            # Condos/townhouses typically have 1 less bedroom for same sqft
-            estimated_bedrooms = max(1, estimated_bedrooms - 1)
-            estimated_bathrooms = max(1.0, estimated_bathrooms - 0.5)
-        elif "multi" in prop_type_str:
-            # Multi-family may have more bedrooms
-            estimated_bedrooms = estimated_bedrooms + 1
+    family = _room_type_family(property_type)
+    if family == _ROOM_TYPE_CONDO:
+        # Condos/townhouses typically have 1 less bedroom for same sqft
+        estimated_bedrooms = max(1, estimated_bedrooms - 1)
+        estimated_bathrooms = max(1.0, estimated_bathrooms - 0.5)
+    elif family == _ROOM_TYPE_MULTI:
+        # Multi-family may have more bedrooms
+        estimated_bedrooms = estimated_bedrooms + 1
 
     return estimated_bedrooms, estimated_bathrooms
 
 
+# Subject fields merged from the v2 Sales Comparables response. v2 wins when it
+# has a value; otherwise the v1 value is kept.
+_V2_SUBJECT_FIELDS_IF_SET = (
+    "bedrooms",
+    "bathrooms",
+    "bathrooms_full",
+    "bathrooms_half",
+    "total_rooms",
+    "square_feet",
+    "lot_size_sqft",
+    "lot_size_acres",
+    "year_built",
+    "stories",
+    "parking_spaces",
+    "sale_recency_days",
+    "arms_length_transaction",
+)
+# Same, but empty strings/lists/zero also count as "no value"
+_V2_SUBJECT_FIELDS_IF_TRUTHY = (
+    "garage_type",
+    "heating_type",
+    "cooling_type",
+    "roof_material",
+    "exterior_features",
+    "amenities",
+    "street_view_url",
+    "street_view_image_url",
+    "sold_price",
+    "sold_date",
+    "price_per_sqft",
+    "financing_type",
+)
+
+
+# Bits of the missing-field mask used to gate the subject fallback/estimation stages
+_MASK_FIELDS = ("bedrooms", "bathrooms", "year_built", "lot_size_sqft", "square_feet")
+_MISSING_BEDROOMS = 1 << 0
+_MISSING_BATHROOMS = 1 << 1
+_MISSING_YEAR_BUILT = 1 << 2
+_MISSING_LOT_SIZE = 1 << 3
+_MISSING_SQUARE_FEET = 1 << 4
+_MISSING_ROOMS = _MISSING_BEDROOMS | _MISSING_BATHROOMS
+_MISSING_COUNTY_RECORD = _MISSING_YEAR_BUILT | _MISSING_LOT_SIZE | _MISSING_SQUARE_FEET
+
+
+def _missing_field_mask(prop: Property) -> int:
+    """Pack which of _MASK_FIELDS are None into one int (bit i = _MASK_FIELDS[i])."""
+    mask = 0
+    for bit, field in enumerate(_MASK_FIELDS):
+        if getattr(prop, field) is None:
+            mask |= 1 << bit
+    return mask
+
+
 class MLSCompBot:
     """Main bot class for finding comparable properties using ATTOM."""
 
@@ -86,6 +146,8 @@ class MLSCompBot:
         self.guidelines_trainer = CompGuidelinesTrainer(self.analyzer)
         self.connected = False
         self.last_error: Optional[str] = None
+        # Feedback received since the model was last trained
+        self._feedback_since_training = 0
 
     def connect(self) -> bool:
         """Connect to ATTOM API."""
@@ -125,6 +187,10 @@ class MLSCompBot:
             self.last_error = "not_connected"
             return None
 
+        # Bind hot attribute chains to locals once for the whole lookup
+        connector = self.connector
+        log_info = logger.info
+
         # Get subject property - ATTOM requires address-based lookup
         # Note: We'll get better data from the v2 Sales Comparables response
         # So we'll use v1 for initial lookup, then enhance with v2 data
@@ -133,7 +199,7 @@ class MLSCompBot:
         if address and city:
             # First, try to get property by address
             # We'll enhance it later with v2 data which may include ATTOM ID
-            subject = self.connector.get_property_by_address(
+            subject = connector.get_property_by_address(
                 address=address,
                 city=city or "",
                 state=state or "AZ",  # Default to AZ if not provided
@@ -152,7 +218,7 @@ class MLSCompBot:
             logger.error("Could not find subject property in ATTOM database")
             # Preserve any connector-provided detail if available
             connector_error = (
-                getattr(self.connector, "last_error", None) if self.connector else None
+                getattr(connector, "last_error", None) if connector else None
             )
             self.last_error = (
                 f"subject_not_found: {connector_error}"
@@ -166,7 +232,7 @@ class MLSCompBot:
         )
 
         # Use ATTOM's Sales Comparables endpoint
-        sold_after = datetime.now() - timedelta(days=settings.max_comp_age_days)
+        sold_after = datetime.now() - timedelta(days=runtime_policy.max_comp_age_days)
         months_ago = (datetime.now() - sold_after).days // 30
 
         # For ATTOM, don't use assessed value for price filtering (it's too low)
@@ -196,12 +262,12 @@ class MLSCompBot:
         )
 
         # Try initial search with standard criteria
-        candidates = self.connector.get_sales_comparables(
+        candidates = connector.get_sales_comparables(
             address=subject.address,
             city=search_city,
             state=search_state,
             zip_code=search_zip,
-            miles=settings.max_comp_distance_miles,
+            miles=runtime_policy.max_comp_distance_miles,
             max_comps=(max_comps or settings.max_comps_to_return)
             * 3,  # Get more candidates to filter
             bedrooms_range=subject.bedrooms,  # ATTOM will use this with ±1 tolerance
@@ -221,13 +287,13 @@ class MLSCompBot:
                 "No comparables found with standard criteria. Trying with relaxed criteria..."
             )
             # Relax: increase radius, extend date range, remove price filters
-            candidates = self.connector.get_sales_comparables(
+            candidates = connector.get_sales_comparables(
                 address=subject.address,
                 city=search_city,
                 state=search_state,
                 zip_code=search_zip,
                 miles=min(
-                    settings.max_comp_distance_miles * 2, 10.0
+                    runtime_policy.max_comp_distance_miles * 2, 10.0
                 ),  # Double the radius, max 10 miles
                 max_comps=(max_comps or settings.max_comps_to_return) * 3,
                 bedrooms_range=None,  # Remove bedroom filter
@@ -242,7 +308,7 @@ class MLSCompBot:
                 logger.info(f"Found {len(candidates)} candidates with relaxed criteria")
             else:
                 connector_error = (
-                    getattr(self.connector, "last_error", None) if self.connector else None
+                    getattr(connector, "last_error", None) if connector else None
                 )
                 self.last_error = (
                     f"no_comps: {connector_error}" if connector_error else "no_comps"
@@ -254,8 +320,8 @@ class MLSCompBot:
         # v2 response has much more complete data, so prefer it over v1
         # Check if v2 subject was extracted and stored
         v2_subject = None
-        if hasattr(self.connector, "_last_subject_from_v2"):
-            v2_subject = getattr(self.connector, "_last_subject_from_v2", None)
+        if hasattr(connector, "_last_subject_from_v2"):
+            v2_subject = getattr(connector, "_last_subject_from_v2", None)
             logger.info(f"Checking for v2 subject: found={v2_subject is not None}")
             if v2_subject:
                 logger.info(
@@ -273,127 +339,17 @@ class MLSCompBot:
             )
 
             # Replace subject with v2 data (v2 is more complete from Sales Comparables endpoint)
-            # Keep v1 data only if v2 doesn't have it
-            # IMPORTANT: Preserve v1 fields that v2 doesn't have (architectural_style, school_district, condition, etc.)
-
-            # Store v1-only fields before overwriting
-            v1_architectural_style = subject.architectural_style
-            v1_condition = subject.condition
-            v1_recent_upgrades = (
-                subject.recent_upgrades.copy() if subject.recent_upgrades else []
-            )
-            v1_renovation_year = subject.renovation_year
-            v1_major_repairs_needed = (
-                subject.major_repairs_needed.copy()
-                if subject.major_repairs_needed
-                else []
-            )
-            v1_school_district = subject.school_district
-            v1_proximity_to_parks = subject.proximity_to_parks
-            v1_proximity_to_shopping = subject.proximity_to_shopping
-            v1_proximity_to_highway = subject.proximity_to_highway
-            v1_waterfront_view = subject.waterfront_view
-            v1_view_type = subject.view_type
-            v1_seller_concessions = subject.seller_concessions
-            v1_seller_concessions_description = subject.seller_concessions_description
-            v1_financing_type = subject.financing_type
-            v1_arms_length_transaction = subject.arms_length_transaction
-            v1_sold_price = subject.sold_price
-            v1_sold_date = subject.sold_date
-            v1_sale_recency_days = subject.sale_recency_days
-            v1_price_per_sqft = subject.price_per_sqft
-
-            # Update with v2 data
-            subject.bedrooms = (
-                v2_subject.bedrooms
-                if v2_subject.bedrooms is not None
-                else subject.bedrooms
-            )
-            subject.bathrooms = (
-                v2_subject.bathrooms
-                if v2_subject.bathrooms is not None
-                else subject.bathrooms
-            )
-            subject.bathrooms_full = (
-                v2_subject.bathrooms_full
-                if v2_subject.bathrooms_full is not None
-                else subject.bathrooms_full
-            )
-            subject.bathrooms_half = (
-                v2_subject.bathrooms_half
-                if v2_subject.bathrooms_half is not None
-                else subject.bathrooms_half
-            )
-            subject.total_rooms = (
-                v2_subject.total_rooms
-                if v2_subject.total_rooms is not None
-                else subject.total_rooms
-            )
-            subject.square_feet = (
-                v2_subject.square_feet
-                if v2_subject.square_feet is not None
-                else subject.square_feet
-            )
-            subject.lot_size_sqft = (
-                v2_subject.lot_size_sqft
-                if v2_subject.lot_size_sqft is not None
-                else subject.lot_size_sqft
-            )
-            subject.lot_size_acres = (
-                v2_subject.lot_size_acres
-                if v2_subject.lot_size_acres is not None
-                else subject.lot_size_acres
-            )
-            subject.year_built = (
-                v2_subject.year_built
-                if v2_subject.year_built is not None
-                else subject.year_built
-            )
-            subject.stories = (
-                v2_subject.stories
-                if v2_subject.stories is not None
-                else subject.stories
-            )
-            subject.parking_spaces = (
-                v2_subject.parking_spaces
-                if v2_subject.parking_spaces is not None
-                else subject.parking_spaces
-            )
-            subject.garage_type = (
-                v2_subject.garage_type
-                if v2_subject.garage_type
-                else subject.garage_type
-            )
-            subject.heating_type = (
-                v2_subject.heating_type
-                if v2_subject.heating_type
-                else subject.heating_type
-            )
-            subject.cooling_type = (
-                v2_subject.cooling_type
-                if v2_subject.cooling_type
-                else subject.cooling_type
-            )
-            subject.roof_material = (
-                v2_subject.roof_material
-                if v2_subject.roof_material
-                else subject.roof_material
-            )
-            # For lists, replace if v2 has data
-            if v2_subject.exterior_features:
-                subject.exterior_features = v2_subject.exterior_features
-            if v2_subject.amenities:
-                subject.amenities = v2_subject.amenities
-            subject.street_view_url = (
-                v2_subject.street_view_url
-                if v2_subject.street_view_url
-                else subject.street_view_url
-            )
-            subject.street_view_image_url = (
-                v2_subject.street_view_image_url
-                if v2_subject.street_view_image_url
-                else subject.street_view_image_url
-            )
+            # Keep v1 data only if v2 doesn't have it. v1-only fields (architectural_style,
+            # school_district, condition, seller concessions, etc.) are not in the merge
+            # tables, so they are preserved as-is.
+            for field in _V2_SUBJECT_FIELDS_IF_SET:
+                value = getattr(v2_subject, field)
+                if value is not None:
+                    setattr(subject, field, value)
+            for field in _V2_SUBJECT_FIELDS_IF_TRUTHY:
+                value = getattr(v2_subject, field)
+                if value:
+                    setattr(subject, field, value)
 
             # Use better price from v2 if available
             if v2_subject.list_price:
@@ -403,55 +359,6 @@ class MLSCompBot:
                 ):
                     subject.list_price = v2_subject.list_price
 
-            # Restore v1-only fields (v2 doesn't have these, so preserve from v1)
-            subject.architectural_style = v1_architectural_style
-            subject.condition = v1_condition
-            subject.recent_upgrades = v1_recent_upgrades
-            subject.renovation_year = v1_renovation_year
-            subject.major_repairs_needed = v1_major_repairs_needed
-            subject.school_district = v1_school_district
-            subject.proximity_to_parks = v1_proximity_to_parks
-            subject.proximity_to_shopping = v1_proximity_to_shopping
-            subject.proximity_to_highway = v1_proximity_to_highway
-            subject.waterfront_view = v1_waterfront_view
-            subject.view_type = v1_view_type
-
-            # Preserve v1 transaction data, but use v2 if it's more complete
-            if v2_subject.sold_price:
-                subject.sold_price = v2_subject.sold_price
-            elif v1_sold_price:
-                subject.sold_price = v1_sold_price
-
-            if v2_subject.sold_date:
-                subject.sold_date = v2_subject.sold_date
-            elif v1_sold_date:
-                subject.sold_date = v1_sold_date
-
-            if v2_subject.sale_recency_days is not None:
-                subject.sale_recency_days = v2_subject.sale_recency_days
-            elif v1_sale_recency_days is not None:
-                subject.sale_recency_days = v1_sale_recency_days
-
-            if v2_subject.price_per_sqft:
-                subject.price_per_sqft = v2_subject.price_per_sqft
-            elif v1_price_per_sqft:
-                subject.price_per_sqft = v1_price_per_sqft
-
-            # Preserve v1 transaction details (v2 may have some, but v1 might be more complete)
-            if v2_subject.arms_length_transaction is not None:
-                subject.arms_length_transaction = v2_subject.arms_length_transaction
-            elif v1_arms_length_transaction is not None:
-                subject.arms_length_transaction = v1_arms_length_transaction
-
-            if v2_subject.financing_type:
-                subject.financing_type = v2_subject.financing_type
-            elif v1_financing_type:
-                subject.financing_type = v1_financing_type
-
-            # Seller concessions are only in v1, so always preserve
-            subject.seller_concessions = v1_seller_concessions
-            subject.seller_concessions_description = v1_seller_concessions_description
-
             logger.info(
                 f"Final enhanced subject: rooms={subject.total_rooms}, lot_sqft={subject.lot_size_sqft}, "
                 f"lot_acres={subject.lot_size_acres}, parking={subject.parking_spaces}, "
@@ -461,22 +368,25 @@ class MLSCompBot:
             )
 
             # Enrich with additional ATTOM APIs (School, Assessment, Sale, AVM)
-            subject = self.connector.enrich_property_with_additional_data(
+            subject = connector.enrich_property_with_additional_data(
                 subject, max_api_calls=5
             )
 
         else:
             logger.warning("No v2 subject data available for enhancement")
 
+        # Which fillable subject fields are still empty; recomputed after each fill stage
+        missing = _missing_field_mask(subject)
+
         # Try Estated API as fallback if bedrooms/bathrooms are missing
         # NOTE: Estated is being deprecated in 2026 and migrated to ATTOM
         # This is a temporary fallback until ATTOM completes their migration
-        if settings.estated_enabled and settings.estated_api_key:
-            if subject.bedrooms is None or subject.bathrooms is None:
+        if _ESTATED_ENABLED:
+            if missing & _MISSING_ROOMS:
                 try:
                     from alternative_apis import EstatedAPIConnector
 
-                    logger.info(
+                    log_info(
                         "Attempting to fetch missing data from Estated API (deprecated 2026 - migrating to ATTOM)..."
                     )
                     estated = EstatedAPIConnector(settings.estated_api_key)
@@ -492,7 +402,7 @@ class MLSCompBot:
                             and estated_prop.bedrooms is not None
                         ):
                             subject.bedrooms = estated_prop.bedrooms
-                            logger.info(
+                            log_info(
                                 f"✓ Got bedrooms from Estated: {estated_prop.bedrooms}"
                             )
 
@@ -502,7 +412,7 @@ class MLSCompBot:
                             and estated_prop.bathrooms is not None
                         ):
                             subject.bathrooms = estated_prop.bathrooms
-                            logger.info(
+                            log_info(
                                 f"✓ Got bathrooms from Estated: {estated_prop.bathrooms}"
                             )
 
@@ -538,18 +448,12 @@ class MLSCompBot:
             and (subject.state or "").strip().upper() == "AZ"
         ):
             # Only call if we actually have gaps that assessor data can commonly fill.
-            needs_maricopa = any(
-                [
-                    subject.year_built is None,
-                    subject.lot_size_sqft is None,
-                    subject.square_feet is None,
-                ]
-            )
-            if needs_maricopa:
+            missing = _missing_field_mask(subject)
+            if missing & _MISSING_COUNTY_RECORD:
                 try:
                     from maricopa_assessor_connector import MaricopaAssessorConnector
 
-                    logger.info(
+                    log_info(
                         "Attempting to enrich missing fields from Maricopa County Assessor API..."
                     )
                     maricopa = MaricopaAssessorConnector()
@@ -564,7 +468,7 @@ class MLSCompBot:
                             # Fill missing fields only
                             if subject.year_built is None and mc_prop.year_built:
                                 subject.year_built = mc_prop.year_built
-                                logger.info(
+                                log_info(
                                     f"✓ Got year_built from Maricopa Assessor: {mc_prop.year_built}"
                                 )
                             if (
@@ -572,12 +476,12 @@ class MLSCompBot:
                                 and mc_prop.lot_size_sqft is not None
                             ):
                                 subject.lot_size_sqft = mc_prop.lot_size_sqft
-                                logger.info(
+                                log_info(
                                     f"✓ Got lot_size_sqft from Maricopa Assessor: {mc_prop.lot_size_sqft}"
                                 )
                             if subject.square_feet is None and mc_prop.square_feet:
                                 subject.square_feet = mc_prop.square_feet
-                                logger.info(
+                                log_info(
                                     f"✓ Got square_feet from Maricopa Assessor: {mc_prop.square_feet}"
                                 )
 
@@ -604,9 +508,8 @@ class MLSCompBot:
                     logger.warning(f"Maricopa Assessor enrichment failed: {e}")
 
         # Estimate bedrooms/bathrooms from square footage if still missing
-        if (
-            subject.bedrooms is None or subject.bathrooms is None
-        ) and subject.square_feet:
+        missing = _missing_field_mask(subject)
+        if missing & _MISSING_ROOMS and subject.square_feet:
             estimated_beds, estimated_baths = estimate_rooms_from_sqft(
                 subject.square_feet, subject.property_type
             )
@@ -625,23 +528,31 @@ class MLSCompBot:
         comp_result = self.analyzer.find_comps(subject, candidates, max_comps=max_comps)
 
         # Enrich comps with additional ATTOM APIs (limit to top comps to avoid too many API calls)
-        if comp_result.comparable_properties:
-            enriched_count = 0
-            for comp in comp_result.comparable_properties[
-                :5
-            ]:  # Only enrich top 5 comps
-                if enriched_count >= 2:  # Limit total API calls for comps
-                    break
-                original_property = comp.property
-                enriched_property = self.connector.enrich_property_with_additional_data(
-                    original_property, max_api_calls=2
-                )
-                if enriched_property != original_property:
-                    comp.property = enriched_property
-                    enriched_count += 1
+        # All (comp, endpoint) lookups go out in one concurrent wave instead of
+        # one sequential round-trip per endpoint per comp; comps that already carry
+        # the enrichment data need no lookups and are left alone by the connector.
+        top_comps = comp_result.comparable_properties[:5]  # Only enrich top 5 comps
+        # Early exit: if even the weakest top comp already clears the quality bar,
+        # enrichment won't change the selection, so skip the API calls entirely.
+        if (
+            top_comps
+            and min(comp.similarity_score for comp in top_comps)
+            >= settings.enrichment_early_exit_threshold
+        ):
+            logger.info(
+                "Top comps already meet the similarity threshold "
+                f"({settings.enrichment_early_exit_threshold}); skipping comp enrichment"
+            )
+            top_comps = []
+        if top_comps:
+            enriched_properties = connector.enrich_properties(
+                [comp.property for comp in top_comps], max_api_calls_per_property=2
+            )
+            for comp, enriched_property in zip(top_comps, enriched_properties):
+                comp.property = enriched_property
 
         # Record for learning
-        if settings.enable_learning:
+        if _ENABLE_LEARNING:
             self.analyzer.record_comp_selection(
                 subject, comp_result.comparable_properties
             )
@@ -672,34 +583,55 @@ class MLSCompBot:
 
     def train_model(self):
         """Train the model using collected learning data."""
-        if not settings.enable_learning:
+        if not _ENABLE_LEARNING:
             logger.warning("Learning is disabled in settings")
             return
 
-        learning_data = self.analyzer.learning_data
-        if not learning_data:
-            logger.warning("No learning data available")
-            return
+        learning_store = self.analyzer.learning_store
+        if learning_store is not None:
+            # Persistent columnar log: train on every stored selection
+            table = learning_store.read()
+            if table.empty:
+                logger.warning("No learning data available")
+                return
 
-        logger.info(f"Training model with {len(learning_data)} records")
-        self.trainer.train_from_feedback(learning_data)
+            logger.info(f"Training model with {len(table)} stored comp selections")
+            self.trainer.train_from_table(table)
+        else:
+            learning_data = self.analyzer.learning_data
+            if not learning_data:
+                logger.warning("No learning data available")
+                return
+
+            logger.info(f"Training model with {len(learning_data)} records")
+            self.trainer.train_from_feedback(learning_data)
+        self._feedback_since_training = 0
         logger.info("Model training completed")
 
     def provide_feedback(
         self, comp_result: CompResult, rating: float, notes: Optional[str] = None
     ):
         """Provide feedback on comp results for learning."""
-        if not settings.enable_learning:
+        if not _ENABLE_LEARNING:
             return
 
         # Update the learning data with feedback
-        for record in self.analyzer.learning_data:
-            if record["subject"].mls_number == comp_result.subject_property.mls_number:
-                record["user_feedback"] = rating
-                if notes:
-                    record["notes"] = notes
-                break
-
-        # Retrain if we have enough data
-        if len(self.analyzer.learning_data) >= 10:
+        record = self.analyzer.find_learning_record(
+            comp_result.subject_property.mls_number
+        )
+        if record is not None:
+            record["user_feedback"] = rating
+            if notes:
+                record["notes"] = notes
+        if self.analyzer.learning_store is not None:
+            self.analyzer.learning_store.record_feedback(
+                comp_result.subject_property.mls_number, rating, notes
+            )
+
+        # Retrain once every retrain_interval pieces of feedback, if we have enough data
+        self._feedback_since_training += 1
+        if (
+            len(self.analyzer.learning_data) >= 10
+            and self._feedback_since_training >= settings.retrain_interval
+        ):
             self.train_model()
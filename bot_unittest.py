@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import Mock
+
+from models import Property
+from unittest_helpers import make_property
+
+
+class TestFindCompsForProperty(unittest.TestCase):
+    def _make_bot(self, subject: Property, v2_subject: Property, candidates: list):
+        from bot import MLSCompBot
+
+        bot = MLSCompBot()
+        connector = Mock()
+        connector.get_property_by_address.return_value = subject
+        connector.get_sales_comparables.return_value = candidates
+        connector._last_subject_from_v2 = v2_subject
+        connector.enrich_property_with_additional_data.side_effect = (
+            lambda prop, **kwargs: prop
+        )
+        connector.enrich_properties.side_effect = lambda props, **kwargs: props
+        bot.connector = connector
+        bot.connected = True
+        return bot
+
+    def test_v2_subject_fields_merge_over_v1(self) -> None:
+        subject = make_property(
+            "S",
+            bedrooms=3,
+            bathrooms=2.0,
+            square_feet=1800,
+            heating_type="Gas",
+            architectural_style="Ranch",
+            sold_price=300000.0,
+        )
+        v2_subject = make_property(
+            "S",
+            bedrooms=4,
+            bathrooms=None,
+            square_feet=1850,
+            heating_type="",
+            cooling_type="Central",
+            sold_price=None,
+        )
+        bot = self._make_bot(subject, v2_subject, [])
+
+        result = bot.find_comps_for_property(address="1 MAIN ST", city="MESA")
+
+        merged = result.subject_property
+        self.assertEqual(merged.bedrooms, 4)
+        self.assertEqual(merged.bathrooms, 2.0)
+        self.assertEqual(merged.square_feet, 1850)
+        self.assertEqual(merged.heating_type, "Gas")
+        self.assertEqual(merged.cooling_type, "Central")
+        self.assertEqual(merged.architectural_style, "Ranch")
+        self.assertEqual(merged.sold_price, 300000.0)
+
+    def test_comp_enrichment_skipped_when_top_comps_meet_threshold(self) -> None:
+        from models import CompProperty, CompResult
+
+        subject = make_property("S", square_feet=1800)
+        bot = self._make_bot(subject, None, [])
+
+        def comp_result(score: float) -> CompResult:
+            return CompResult(
+                subject_property=subject,
+                comparable_properties=[
+                    CompProperty(
+                        property=make_property(f"C{i}", mls_data={"attom_id": str(i)}),
+                        similarity_score=score,
+                    )
+                    for i in range(3)
+                ],
+            )
+
+        bot.analyzer.find_comps = Mock(return_value=comp_result(0.95))
+        bot.find_comps_for_property(address="1 MAIN ST", city="MESA")
+        bot.connector.enrich_properties.assert_not_called()
+
+        bot.analyzer.find_comps = Mock(return_value=comp_result(0.6))
+        bot.find_comps_for_property(address="1 MAIN ST", city="MESA")
+        bot.connector.enrich_properties.assert_called_once()
+
+
+class TestProvideFeedback(unittest.TestCase):
+    def test_feedback_updates_latest_record_and_retrains_per_interval(self) -> None:
+        from bot import MLSCompBot
+        from config import settings
+        from models import CompResult
+
+        bot = MLSCompBot()
+        bot.trainer.train_from_feedback = Mock()
+        for i in range(12):
+            bot.analyzer.record_comp_selection(make_property(f"S{i % 3}"), [])
+
+        result = CompResult(
+            subject_property=make_property("S1"), comparable_properties=[]
+        )
+        for _ in range(settings.retrain_interval - 1):
+            bot.provide_feedback(result, 0.9, notes="good")
+        bot.trainer.train_from_feedback.assert_not_called()
+
+        latest = bot.analyzer.learning_data[10]
+        self.assertEqual(latest["subject"].mls_number, "S1")
+        self.assertEqual(latest["user_feedback"], 0.9)
+        self.assertEqual(latest["notes"], "good")
+
+        bot.provide_feedback(result, 0.9)
+        bot.trainer.train_from_feedback.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
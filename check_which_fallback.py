@@ -1,13 +1,18 @@
 """Check which fallback provided the data by testing each one."""
 import os
+import sys
+import threading
+import time
 from dotenv import load_dotenv
 from bot import MLSCompBot
 
 load_dotenv()
 
-print("=" * 80)
-print("CHECKING WHICH FALLBACK PROVIDED THE DATA")
-print("=" * 80)
+# Output is collected into a buffer and written in one go instead of one print per line
+out = []
+out.append("=" * 80)
+out.append("CHECKING WHICH FALLBACK PROVIDED THE DATA")
+out.append("=" * 80)
 
 # Test property
 address = "3644 E CONSTITUTION DR"
@@ -15,70 +20,123 @@ city = "GILBERT"
 state = "AZ"
 zip_code = "85296"
 
-print(f"\nTesting property: {address}, {city}, {state} {zip_code}\n")
+# Upper bound on the whole diagnostic (Oxylabs scraping can take 30-90s); each
+# connector also sets its own per-request timeout
+PROBE_TIMEOUT_SECONDS = 120
+
+out.append(f"\nTesting property: {address}, {city}, {state} {zip_code}\n")
 
 # Check which services are enabled
 from config import settings
-print("Service Status:")
-print(f"  Estated Enabled: {settings.estated_enabled}")
-print(f"  Estated API Key: {'SET' if settings.estated_api_key else 'NOT SET'}")
-print(f"  Oxylabs Enabled: {settings.oxylabs_enabled}")
-print(f"  Oxylabs Username: {settings.oxylabs_username[:20] + '...' if settings.oxylabs_username else 'NOT SET'}")
-print()
-
-# Test Estated if enabled
-if settings.estated_enabled and settings.estated_api_key:
-    print("Testing Estated API...")
+# Read the service settings once rather than on every probe/status line
+estated_enabled, estated_api_key = settings.estated_enabled, settings.estated_api_key
+oxylabs_enabled, oxylabs_username, oxylabs_password = (
+    settings.oxylabs_enabled, settings.oxylabs_username, settings.oxylabs_password
+)
+out.append("Service Status:")
+out.append(f"  Estated Enabled: {estated_enabled}")
+out.append(f"  Estated API Key: {'SET' if estated_api_key else 'NOT SET'}")
+out.append(f"  Oxylabs Enabled: {oxylabs_enabled}")
+out.append(f"  Oxylabs Username: {oxylabs_username[:20] + '...' if oxylabs_username else 'NOT SET'}")
+out.append("")
+
+# Each probe returns (name, ok, data, error); ok=None means the service was skipped
+def probe_estated():
+    if not (estated_enabled and estated_api_key):
+        return ("Estated", None, None, "not enabled or not configured")
     try:
         from alternative_apis import EstatedAPIConnector
-        estated = EstatedAPIConnector(settings.estated_api_key)
+        estated = EstatedAPIConnector(estated_api_key)
         estated.connect()
         estated_prop = estated.get_property_by_address(address, city, state, zip_code)
-        
-        if estated_prop:
-            print("  [SUCCESS] Estated returned data:")
-            print(f"    Bedrooms: {estated_prop.bedrooms}")
-            print(f"    Bathrooms: {estated_prop.bathrooms}")
-            print(f"    Lot Size: {estated_prop.lot_size_sqft}")
-            print(f"    Year Built: {estated_prop.year_built}")
-            if estated_prop.bedrooms == 3 and estated_prop.bathrooms == 3:
-                print("\n  ✓ Estated matches the results! Estated likely provided the data.")
-        else:
-            print("  [FAILED] Estated returned no data")
+        return ("Estated", estated_prop is not None, estated_prop, None)
     except Exception as e:
-        print(f"  [ERROR] Estated failed: {e}")
-else:
-    print("Estated is not enabled or not configured")
+        return ("Estated", False, None, str(e))
 
-print()
 
-# Test Oxylabs if enabled
-if settings.oxylabs_enabled and settings.oxylabs_username and settings.oxylabs_password:
-    print("Testing Oxylabs API...")
-    print("  (This may take 30-90 seconds - checking if it would work...)")
-    print("  Note: We won't wait for the full call, just checking configuration")
+def probe_oxylabs():
+    if not (oxylabs_enabled and oxylabs_username and oxylabs_password):
+        return ("Oxylabs", None, None, "not enabled or not configured")
     try:
         from alternative_apis import OxylabsScraperConnector
-        oxylabs = OxylabsScraperConnector(settings.oxylabs_username, settings.oxylabs_password)
+        oxylabs = OxylabsScraperConnector(oxylabs_username, oxylabs_password)
         oxylabs.connect()
-        print("  [INFO] Oxylabs connector created and connected")
-        print("  [INFO] Oxylabs is configured and would be called if Estated fails")
-        print("  [INFO] To test Oxylabs fully, it needs to make the API call (30-90s)")
+        oxylabs_prop = oxylabs.get_property_by_address(address, city, state, zip_code)
+        return ("Oxylabs", oxylabs_prop is not None, oxylabs_prop, None)
     except Exception as e:
-        print(f"  [ERROR] Oxylabs setup failed: {e}")
-else:
-    print("Oxylabs is not enabled or not configured")
-
-print("\n" + "=" * 80)
-print("CONCLUSION:")
-print("=" * 80)
-print("Based on the results you showed:")
-print("  - Bedrooms: 3")
-print("  - Bathrooms: 3")
-print("  - Lot Size: 3,825 sqft")
-print("  - Year Built: 2002")
-print()
-print("If Estated returned matching data above, Estated provided it.")
-print("If Estated didn't return data, Oxylabs likely provided it.")
-print("=" * 80)
+        return ("Oxylabs", False, None, str(e))
+
+
+def run_probes():
+    # Probes run concurrently, so the whole check takes as long as the slowest one
+    # instead of the sum of all of them. They run on daemon threads: a probe still
+    # going at PROBE_TIMEOUT_SECONDS is reported as timed out and abandoned, without
+    # holding up the report or interpreter exit.
+    probes = (("Estated", probe_estated), ("Oxylabs", probe_oxylabs))
+    results = {}
+
+    def run(name, probe):
+        results[name] = probe()
+
+    threads = [
+        threading.Thread(target=run, args=probe, daemon=True) for probe in probes
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + PROBE_TIMEOUT_SECONDS
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    return [
+        results.get(name, (name, False, None, f"did not finish within {PROBE_TIMEOUT_SECONDS}s"))
+        for name, _ in probes
+    ]
+
+
+def format_probe_result(name, ok, prop, error):
+    """Format one probe outcome as its own block of lines."""
+    lines = []
+    if ok is None:
+        lines.append(f"{name} is {error}")
+    elif error:
+        lines.append(f"  [ERROR] {name} failed: {error}")
+    elif ok:
+        lines.append(f"  [SUCCESS] {name} returned data:")
+        lines.append(f"    Bedrooms: {prop.bedrooms}")
+        lines.append(f"    Bathrooms: {prop.bathrooms}")
+        lines.append(f"    Lot Size: {prop.lot_size_sqft}")
+        lines.append(f"    Year Built: {prop.year_built}")
+        if prop.bedrooms == 3 and prop.bathrooms == 3:
+            lines.append(f"\n  ✓ {name} matches the results! {name} likely provided the data.")
+    else:
+        lines.append(f"  [FAILED] {name} returned no data")
+    lines.append("")
+    return lines
+
+
+out.append(f"Testing Estated and Oxylabs in parallel (up to {PROBE_TIMEOUT_SECONDS}s - Oxylabs may take 30-90 seconds)...")
+out.append("")
+# Show what is being tested before the (possibly long) wait
+sys.stdout.write("\n".join(out) + "\n")
+sys.stdout.flush()
+out = []
+
+results = run_probes()
+
+# Probe blocks are appended in a fixed order, so concurrent probes never interleave
+for result in results:
+    out.extend(format_probe_result(*result))
 
+out.append("\n" + "=" * 80)
+out.append("CONCLUSION:")
+out.append("=" * 80)
+out.append("Based on the results you showed:")
+out.append("  - Bedrooms: 3")
+out.append("  - Bathrooms: 3")
+out.append("  - Lot Size: 3,825 sqft")
+out.append("  - Year Built: 2002")
+out.append("")
+out.append("If Estated returned matching data above, Estated provided it.")
+out.append("If Estated didn't return data, Oxylabs likely provided it.")
+out.append("=" * 80)
+sys.stdout.write("\n".join(out) + "\n")
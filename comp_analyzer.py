@@ -1,20 +1,277 @@
 """Comparable property analysis engine with professional dollar adjustments."""
 import logging
+import math
+import threading
+from collections import OrderedDict, deque
 from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
-from geopy.distance import geodesic
 import numpy as np
-from config import settings
-from models import Property, CompProperty, CompResult, PropertyStatus, Adjustment
+from config import runtime_policy, settings
+from models import Property, CompProperty, CompResult, PropertyStatus, PropertyType, Adjustment
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit: run the function as plain Python."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Resolved once at import (learning is not toggled at runtime)
+_ENABLE_LEARNING = settings.enable_learning
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+@njit(cache=True, fastmath=True)
+def _haversine_radians(lat1: float, lon1: float, cos_lat1: float,
+                       lat2: float, lon2: float, cos_lat2: float) -> float:
+    """Great-circle distance in miles between two points given in radians.
+    
+    Takes the cosine of each latitude precomputed, so callers measuring from
+    the same points repeatedly compute it once.
+    """
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + cos_lat1 * cos_lat2 * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+@njit(cache=True, fastmath=True)
+def _haversine_scalar(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in miles between two points.
+    
+    Within ~0.5% of the ellipsoidal geodesic distance, which is plenty for comp
+    scoring and distance limits.
+    """
+    lat1, lon1 = math.radians(lat1), math.radians(lon1)
+    lat2, lon2 = math.radians(lat2), math.radians(lon2)
+    return _haversine_radians(lat1, lon1, math.cos(lat1), lat2, lon2, math.cos(lat2))
+
+
+def _haversine_vec_radians(lat1: float, lon1: float, cos_lat1: float, lat2: np.ndarray,
+                           lon2: np.ndarray, cos_lat2: np.ndarray) -> np.ndarray:
+    """Vectorized _haversine_radians from one point to arrays of points (NaN in, NaN out)."""
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _haversine_vec(lat1: float, lon1: float, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance in miles from one point to arrays of points (NaN in, NaN out)."""
+    lat1, lon1 = np.radians(lat1), np.radians(lon1)
+    lat2, lon2 = np.radians(lat2), np.radians(lon2)
+    return _haversine_vec_radians(lat1, lon1, np.cos(lat1), lat2, lon2, np.cos(lat2))
+
+
+# Small integer codes for property types, so type matching is an int8 comparison
+_PROPERTY_TYPE_CODES = {property_type: code for code, property_type in enumerate(PropertyType)}
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def _epoch_microseconds(moment: datetime) -> float:
+    """Microseconds since 1970 for a naive local datetime (exact as a float).
+    
+    Timezone-aware datetimes are converted to naive local time first, to line
+    up with datetime.now().
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return float((moment - _EPOCH) // timedelta(microseconds=1))
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    """Convert a NumPy scalar to a float, with NaN meaning None."""
+    return None if np.isnan(value) else float(value)
+
+
+# Serial on purpose: find_comps runs on concurrent request threads, and numba's
+# default workqueue threading layer aborts on concurrent parallel launches
+@njit(cache=True)
+def _score_kernel(subject_values, subject_type, lat_rad, lon_rad, cos_lat, square_feet, price,
+                  bedrooms, bathrooms, year_built, property_type, weights, max_distance,
+                  scores, distances, factor_scores):
+    """Distances and similarity scores for all candidates in one compiled pass.
+    
+    Compiled equivalent of the distance calculation plus CompAnalyzer._score_batch.
+    subject_values: [latitude, longitude, square_feet, list_price, bedrooms,
+    bathrooms, year_built], NaN where missing; candidate columns are as built by
+    _candidates_to_soa, with coordinates in radians. Candidates beyond max_distance are left unscored (NaN).
+    Fills the scores, the distances (NaN without coordinates) and the factor
+    score matrix (columns in CompAnalyzer._FACTOR_ORDER), which may hold stale
+    values from an earlier call, and returns them.
+    """
+    subj_lat, subj_lon, subj_sqft, subj_price, subj_beds, subj_baths, subj_year = subject_values
+    has_location = not np.isnan(subj_lat) and not np.isnan(subj_lon)
+    subj_lat, subj_lon = math.radians(subj_lat), math.radians(subj_lon)
+    subj_cos_lat = math.cos(subj_lat)
+    for i in range(lat_rad.shape[0]):
+        scores[i] = np.nan
+        distances[i] = np.nan
+        factor_scores[i, :] = 0.5
+        
+        # Distance score (closer is better); neutral if no coordinates
+        if has_location and not np.isnan(lat_rad[i]) and not np.isnan(lon_rad[i]):
+            distance = _haversine_radians(
+                subj_lat, subj_lon, subj_cos_lat, lat_rad[i], lon_rad[i], cos_lat[i]
+            )
+            distances[i] = distance
+            if distance > max_distance:
+                continue
+            factor_scores[i, 0] = max(0.0, 1.0 - (distance / max_distance))
+        
+        # Square footage score: 10% diff = 0.8 score
+        if not np.isnan(subj_sqft) and not np.isnan(square_feet[i]):
+            factor_scores[i, 1] = max(0.0, 1.0 - (abs(subj_sqft - square_feet[i]) / subj_sqft * 2))
+        
+        # Price score (comp sold price, else list price, vs subject's list price)
+        if not np.isnan(subj_price) and not np.isnan(price[i]):
+            factor_scores[i, 2] = max(0.0, 1.0 - (abs(price[i] - subj_price) / subj_price * 2))
+        
+        # Bedrooms score - neutral 0.6 when only the candidate has bedrooms
+        if not np.isnan(bedrooms[i]) and bedrooms[i] != 0:
+            if np.isnan(subj_beds):
+                factor_scores[i, 3] = 0.6
+            else:
+                diff = abs(subj_beds - bedrooms[i])
+                factor_scores[i, 3] = 1.0 if diff == 0 else (0.7 if diff == 1 else 0.3)
+        
+        # Bathrooms score - neutral 0.6 when only the candidate has bathrooms
+        if not np.isnan(bathrooms[i]) and bathrooms[i] != 0:
+            if np.isnan(subj_baths):
+                factor_scores[i, 4] = 0.6
+            else:
+                diff = abs(subj_baths - bathrooms[i])
+                if diff == 0:
+                    factor_scores[i, 4] = 1.0
+                elif diff <= 0.5:
+                    factor_scores[i, 4] = 0.8
+                elif diff <= 1.0:
+                    factor_scores[i, 4] = 0.5
+                else:
+                    factor_scores[i, 4] = 0.2
+        
+        # Year built score (similar age)
+        if not np.isnan(subj_year) and not np.isnan(year_built[i]):
+            diff = abs(subj_year - year_built[i])
+            if diff <= 5:
+                factor_scores[i, 5] = 1.0
+            elif diff <= 10:
+                factor_scores[i, 5] = 0.7
+            elif diff <= 20:
+                factor_scores[i, 5] = 0.4
+            else:
+                factor_scores[i, 5] = 0.2
+        
+        # Property type score
+        factor_scores[i, 6] = 1.0 if property_type[i] == subject_type else 0.0
+        
+        # Weighted sum in factor order, like the scalar and NumPy scorers
+        score = 0.0
+        for j in range(7):
+            score += factor_scores[i, j] * weights[j]
+        scores[i] = score
+    return scores, distances, factor_scores
+
+
+# Adjustment categories, in the column order of _adjustment_amounts
+_ADJUSTMENT_CATEGORIES = (
+    "Square Footage", "Bedrooms", "Bathrooms", "Lot Size", "Age", "Time", "Concessions"
+)
+
+
+@njit(cache=True)
+def _adjustment_amounts(subject_values, comps):
+    """Dollar adjustment amounts for comps, one column per _ADJUSTMENT_CATEGORIES entry.
+    
+    subject_values: [square_feet, bedrooms, bathrooms, lot_size_sqft, year_built,
+    price_per_sqft]. comps: one row per comp of [price, square_feet, bedrooms,
+    bathrooms, lot_size_sqft, year_built, days_since_sale, seller_concessions,
+    price_per_sqft].
+    Missing values are NaN; bedrooms/bathrooms of 0 are real values, every other
+    zero counts as missing. A zero amount means no adjustment.
+    """
+    subj_sqft, subj_beds, subj_baths, subj_lot, subj_year, subj_ppsf = subject_values
+    amounts = np.zeros((comps.shape[0], 7))
+    for i in range(comps.shape[0]):
+        price = comps[i, 0]
+        if np.isnan(price):
+            continue
+        
+        # Price per square foot for size adjustments: subject's, else comp's,
+        # else a $200/sqft fallback
+        comp_sqft = comps[i, 1]
+        if not np.isnan(subj_ppsf):
+            price_per_sqft = subj_ppsf
+        elif not np.isnan(comps[i, 8]):
+            price_per_sqft = comps[i, 8]
+        else:
+            price_per_sqft = 200.0
+        
+        # 1. Square footage: only adjust for differences over 50 sqft
+        if not np.isnan(subj_sqft) and not np.isnan(comp_sqft):
+            diff = comp_sqft - subj_sqft
+            if abs(diff) > 50:
+                amounts[i, 0] = -(diff * price_per_sqft)
+        
+        # 2. Bedrooms: 1.5% of comp price per bedroom
+        diff = comps[i, 2] - subj_beds
+        if not np.isnan(diff) and diff != 0:
+            amounts[i, 1] = -diff * (price * 0.015)
+        
+        # 3. Bathrooms: 1% of comp price per full bathroom, from a half bath up
+        diff = comps[i, 3] - subj_baths
+        if not np.isnan(diff) and abs(diff) >= 0.5:
+            amounts[i, 2] = -diff * (price * 0.01)
+        
+        # 4. Lot size: 0.001% of comp price per sqft, over 1000 sqft difference
+        diff = comps[i, 4] - subj_lot
+        if not np.isnan(diff) and abs(diff) > 1000:
+            amounts[i, 3] = -diff * (price * 0.00001)
+        
+        # 5. Age: 0.7% depreciation per year, over 5 years difference
+        diff = comps[i, 5] - subj_year
+        if not np.isnan(diff) and abs(diff) > 5:
+            amounts[i, 4] = price * 0.007 * diff
+        
+        # 6. Time: 0.8% market appreciation per month, for sales over 3 months ago
+        months_ago = comps[i, 6] / 30.0
+        if months_ago > 3:
+            amounts[i, 5] = -(price * 0.008 * months_ago)
+        
+        # 7. Seller concessions are added back to get true market value
+        if comps[i, 7] > 0:
+            amounts[i, 6] = comps[i, 7]
+    return amounts
+
 
 class CompAnalyzer:
     """Analyzes and finds comparable properties."""
     
+    # Similarity factors, in the column order of the vectorized score matrix
+    _FACTOR_ORDER = (
+        'distance', 'square_feet', 'price', 'bedrooms',
+        'bathrooms', 'year_built', 'property_type'
+    )
+    
+    # Most recent adjustment lists kept by _calculate_adjustments
+    ADJUSTMENT_CACHE_SIZE = 4096
+    LEARNING_DATA_MAXLEN = 1000
+    
     def __init__(self):
-        self.weights = {
+        self._set_weights({
             'distance': 0.15,
             'square_feet': 0.25,
             'price': 0.20,
@@ -22,8 +279,22 @@ class CompAnalyzer:
             'bathrooms': 0.10,
             'year_built': 0.10,
             'property_type': 0.05
-        }
-        self.learning_data = []  # Store successful comp selections for training
+        })
+        # Recent comp selections for training (oldest dropped once full)
+        self.learning_data: "deque[dict]" = deque(maxlen=self.LEARNING_DATA_MAXLEN)
+        # mls_number -> most recent learning_data record for that subject
+        self._feedback_index: Dict[str, dict] = {}
+        # Per-thread scoring scratch arrays and the last candidates' column arrays
+        self._scratch = threading.local()
+        # LRU of adjustments keyed by every subject/comp value they depend on;
+        # shared by request threads, so it is only touched under the lock
+        self._adjustment_cache: "OrderedDict[bytes, List[Adjustment]]" = OrderedDict()
+        self._adjustment_lock = threading.Lock()
+        # Optional persistent Parquet log of selections (LEARNING_DATA_DIR)
+        self.learning_store = None
+        if settings.learning_data_dir:
+            from learning_store import LearningDataStore
+            self.learning_store = LearningDataStore(settings.learning_data_dir)
     
     def find_comps(
         self,
@@ -39,68 +310,58 @@ class CompAnalyzer:
                 confidence_score=0.0
             )
         
+        # Read settings and subject fields once per call (settings may be retuned
+        # between calls by the guidelines trainer)
         max_comps = max_comps or settings.max_comps_to_return
+        max_distance = runtime_policy.max_comp_distance_miles
+        # Be more lenient if the subject is missing key data (bedrooms, bathrooms,
+        # or price): 20% lower threshold (0.7 -> 0.56)
+        min_score = settings.min_comp_score
+        if not (subject.bedrooms and subject.bathrooms and subject.list_price):
+            min_score *= 0.8
         
-        # Filter and score candidates
-        comp_properties = []
-        for candidate in candidates:
-            # Skip if it's the same property
-            if candidate.mls_number == subject.mls_number:
-                continue
-            
-            # Calculate similarity score
-            score, reasons = self._calculate_similarity(subject, candidate)
-            
-            # Calculate distance if coordinates available
-            distance = None
-            if subject.latitude and subject.longitude and candidate.latitude and candidate.longitude:
-                distance = geodesic(
-                    (subject.latitude, subject.longitude),
-                    (candidate.latitude, candidate.longitude)
-                ).miles
-            
-            # Filter by distance if configured
-            if distance and distance > settings.max_comp_distance_miles:
-                continue
-            
-            # Filter by minimum score - but be more lenient if subject property has missing data
-            min_score = settings.min_comp_score
-            # Lower threshold if subject is missing key data (bedrooms, bathrooms, or price)
-            if (not subject.bedrooms or not subject.bathrooms or not subject.list_price):
-                min_score = min_score * 0.8  # 20% lower threshold (0.7 -> 0.56)
-            
-            if score < min_score:
-                continue
-            
-            # Calculate price differences
-            price_diff = None
-            price_diff_pct = None
-            if subject.list_price and candidate.sold_price:
-                price_diff = candidate.sold_price - subject.list_price
-                price_diff_pct = (price_diff / subject.list_price) * 100
-            elif subject.list_price and candidate.list_price:
-                price_diff = candidate.list_price - subject.list_price
-                price_diff_pct = (price_diff / subject.list_price) * 100
-            
-            comp_prop = CompProperty(
-                property=candidate,
-                similarity_score=score,
-                distance_miles=distance,
-                price_difference=price_diff,
-                price_difference_percent=price_diff_pct,
-                match_reasons=reasons
-            )
-            comp_properties.append(comp_prop)
+        # Score all candidates at once on column arrays
+        soa = self._candidates_soa(candidates)
+        indices, distances, scores, factor_scores = self._score_candidates(
+            subject, soa, max_distance
+        )
+        
+        # Filter by minimum score, then keep the best max_comps
+        kept = np.flatnonzero(scores >= min_score)
+        kept = self._top_indices(kept, scores[kept], max_comps)
         
         # Sort by similarity score (highest first)
-        comp_properties.sort(key=lambda x: x.similarity_score, reverse=True)
+        top = kept[np.argsort(-scores[kept], kind='stable')]
+        
+        # Price differences vs the subject's list price (NaN where unknown)
+        if subject.list_price:
+            price_diffs = soa['price'][indices[top]] - subject.list_price
+            price_diff_pcts = (price_diffs / subject.list_price) * 100
+        else:
+            price_diffs = price_diff_pcts = np.full(len(top), np.nan)
         
-        # Take top N
-        comp_properties = comp_properties[:max_comps]
+        # Everything so far lives in arrays; build CompProperty objects only
+        # for the selected comps
+        comp_properties = []
+        for i, price_diff, price_diff_pct in zip(top, price_diffs, price_diff_pcts):
+            candidate = candidates[indices[i]]
+            distance = _nan_to_none(distances[i])
+            comp_properties.append(CompProperty(
+                property=candidate,
+                similarity_score=float(scores[i]),
+                distance_miles=distance,
+                price_difference=_nan_to_none(price_diff),
+                price_difference_percent=_nan_to_none(price_diff_pct),
+                match_reasons=self._match_reasons(candidate, distance, factor_scores[i])
+            ))
         
         # Apply professional dollar adjustments to each comp (Step 4 from guide)
-        for comp_prop in comp_properties:
-            adjustments = self._calculate_adjustments(subject, comp_prop.property)
+        selected = indices[top]
+        all_adjustments = self._calculate_adjustments_batch(
+            subject, [comp_prop.property for comp_prop in comp_properties],
+            {name: column[selected] for name, column in soa.items()}
+        )
+        for comp_prop, adjustments in zip(comp_properties, all_adjustments):
             comp_prop.adjustments = adjustments
             comp_prop.adjustment_count = len(adjustments)
             comp_prop.total_adjustment_amount = sum(adj.amount for adj in adjustments)
@@ -112,43 +373,52 @@ class CompAnalyzer:
         
         # Calculate statistics using ADJUSTED prices (Step 5 from guide)
         if comp_properties:
-            # Use adjusted prices for final valuation
-            adjusted_prices = [
-                cp.adjusted_price
-                for cp in comp_properties
-                if cp.adjusted_price is not None
-            ]
+            # Use adjusted prices for final valuation (NaN where a comp has no price)
+            n = len(comp_properties)
+            adjusted_prices = np.fromiter(
+                (np.nan if cp.adjusted_price is None else cp.adjusted_price for cp in comp_properties),
+                dtype=np.float64, count=n
+            )
+            priced = ~np.isnan(adjusted_prices)
             
-            if adjusted_prices:
+            if priced.any():
+                adjustment_counts = np.fromiter(
+                    (cp.adjustment_count for cp in comp_properties), dtype=np.float64, count=n
+                )
+                total_adjustments = np.fromiter(
+                    (cp.total_adjustment_amount for cp in comp_properties), dtype=np.float64, count=n
+                )
+                similarity_scores = np.fromiter(
+                    (cp.similarity_score for cp in comp_properties), dtype=np.float64, count=n
+                )
+                square_feet = np.fromiter(
+                    (cp.property.square_feet or np.nan for cp in comp_properties),
+                    dtype=np.float64, count=n
+                )
+                
                 # Weight comps: fewer/smaller adjustments = more weight
-                weights = []
-                for cp in comp_properties:
-                    if cp.adjusted_price is not None:
-                        # Weight based on: similarity score, adjustment count, adjustment size
-                        adj_count_weight = 1.0 / (1.0 + cp.adjustment_count * 0.1)  # Fewer adjustments = higher weight
-                        adj_size_weight = 1.0 / (1.0 + abs(cp.total_adjustment_amount) / (cp.adjusted_price * 0.01))  # Smaller % adjustments = higher weight
-                        weight = cp.similarity_score * adj_count_weight * adj_size_weight
-                        weights.append(weight)
-                    else:
-                        weights.append(0.0)
+                adj_count_weight = 1.0 / (1.0 + adjustment_counts * 0.1)
+                adj_size_weight = 1.0 / (1.0 + np.abs(total_adjustments) / (adjusted_prices * 0.01))
+                weights = np.where(
+                    priced, similarity_scores * adj_count_weight * adj_size_weight, 0.0
+                )
                 
                 # Normalize weights
-                total_weight = sum(weights)
+                total_weight = weights.sum()
                 if total_weight > 0:
-                    weights = [w / total_weight for w in weights]
+                    weights /= total_weight
                 else:
-                    weights = [1.0 / len(weights)] * len(weights)
+                    weights = np.full(n, 1.0 / n)
                 
                 # Weighted average of adjusted prices
-                avg_price = sum(p * w for p, w in zip(adjusted_prices, weights))
+                avg_price = float(np.dot(adjusted_prices[priced], weights[priced]))
                 
                 # Calculate average price per sqft from adjusted prices
-                sqft_prices = []
-                for cp, weight in zip(comp_properties, weights):
-                    if cp.adjusted_price and cp.property.square_feet:
-                        sqft_prices.append((cp.adjusted_price / cp.property.square_feet) * weight)
-                
-                avg_price_per_sqft = sum(sqft_prices) if sqft_prices else None
+                has_sqft = priced & (adjusted_prices != 0) & ~np.isnan(square_feet)
+                avg_price_per_sqft = (
+                    float(np.dot(adjusted_prices[has_sqft] / square_feet[has_sqft], weights[has_sqft]))
+                    if has_sqft.any() else None
+                )
                 
                 # Estimate value based on subject's square footage using adjusted comps
                 estimated_value = None
@@ -156,11 +426,11 @@ class CompAnalyzer:
                     estimated_value = avg_price_per_sqft * subject.square_feet
                 
                 # Confidence based on number, quality, and adjustment consistency
-                base_confidence = min(1.0, len(comp_properties) / 10.0) * np.mean([cp.similarity_score for cp in comp_properties])
+                base_confidence = min(1.0, n / 10.0) * similarity_scores.mean()
                 # Reduce confidence if adjustments vary widely (indicates inconsistent comps)
-                if len(adjusted_prices) > 1:
-                    price_std = np.std(adjusted_prices)
-                    price_mean = np.mean(adjusted_prices)
+                if np.count_nonzero(priced) > 1:
+                    price_std = adjusted_prices[priced].std()
+                    price_mean = adjusted_prices[priced].mean()
                     if price_mean > 0:
                         cv = price_std / price_mean  # Coefficient of variation
                         consistency_factor = max(0.5, 1.0 - cv)  # Lower CV = higher consistency
@@ -206,19 +476,296 @@ class CompAnalyzer:
             confidence_score=confidence
         )
     
-    def _calculate_similarity(self, subject: Property, candidate: Property) -> tuple:
-        """Calculate similarity score between two properties."""
+    @staticmethod
+    def _top_indices(indices: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+        """Select the k highest-scoring indices in O(N), keeping their original order.
+        
+        Ties at the cutoff go to the earliest indices, so the selection matches
+        a stable full sort truncated to k.
+        """
+        if len(indices) <= k:
+            return indices
+        cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = scores > cutoff
+        at_cutoff = np.flatnonzero(scores == cutoff)[:k - np.count_nonzero(above)]
+        above[at_cutoff] = True
+        return indices[above]
+    
+    def _get_buf(self, name: str, shape: tuple, dtype=np.float64) -> np.ndarray:
+        """Return a scratch array of the given shape, reused across calls.
+        
+        Buffers are per thread and only reallocated when a call needs more rows
+        than any before it. Their contents are left over from earlier calls.
+        """
+        buffers = getattr(self._scratch, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch.buffers = {}
+        buf = buffers.get(name)
+        if buf is None or buf.shape[0] < shape[0] or buf.shape[1:] != shape[1:] or buf.dtype != dtype:
+            buf = buffers[name] = np.empty(shape, dtype=dtype)
+        return buf[:shape[0]]
+    
+    def _candidates_soa(self, candidates: List[Property]) -> Dict[str, np.ndarray]:
+        """Column arrays for candidates, reused when the same list is scored again.
+        
+        Scoring several subjects against one candidates list converts it only
+        once per thread. The list is matched by identity and length, so pass a
+        new list after changing the candidates themselves.
+        """
+        memo = getattr(self._scratch, 'soa', None)
+        if memo is not None and memo[0] is candidates and memo[1] == len(candidates):
+            return memo[2]
+        soa = self._candidates_to_soa(candidates)
+        for column in soa.values():
+            column.flags.writeable = False
+        self._scratch.soa = (candidates, len(candidates), soa)
+        return soa
+    
+    @staticmethod
+    def _candidates_to_soa(candidates: List[Property]) -> Dict[str, np.ndarray]:
+        """Convert candidates to column arrays for vectorized scoring and adjustments.
+        
+        Missing (or zero) numeric values become NaN, matching the truthiness
+        checks in _calculate_similarity; bedroom and bathroom counts of 0 are
+        kept, since adjustments treat them as real values. Subject-independent
+        derived values (price per sqft, sale time) are computed here once.
+        """
+        n = len(candidates)
+        
+        def column(values) -> np.ndarray:
+            return np.fromiter(
+                (value or np.nan for value in values), dtype=np.float64, count=n
+            )
+        
+        def count_column(values) -> np.ndarray:
+            return np.fromiter(
+                (np.nan if value is None else value for value in values),
+                dtype=np.float64, count=n
+            )
+        
+        price = column(c.sold_price or c.list_price for c in candidates)
+        square_feet = column(c.square_feet for c in candidates)
+        latitude = column(c.latitude for c in candidates)
+        longitude = column(c.longitude for c in candidates)
+        lat_rad = np.radians(latitude)
+        return {
+            'mls_number': np.array([c.mls_number for c in candidates], dtype=object),
+            'latitude': latitude,
+            'longitude': longitude,
+            # Radians and latitude cosines for the haversine distance
+            'lat_rad': lat_rad,
+            'lon_rad': np.radians(longitude),
+            'cos_lat': np.cos(lat_rad),
+            'square_feet': square_feet,
+            'price': price,
+            'price_per_sqft': price / square_feet,
+            'bedrooms': count_column(c.bedrooms for c in candidates),
+            'bathrooms': count_column(c.bathrooms for c in candidates),
+            'lot_size_sqft': column(c.lot_size_sqft for c in candidates),
+            'year_built': column(c.year_built for c in candidates),
+            # Sale time in microseconds since 1970 (NaN if never sold)
+            'sold_at': column(
+                c.sold_date and _epoch_microseconds(c.sold_date) for c in candidates
+            ),
+            'seller_concessions': column(c.seller_concessions for c in candidates),
+            'property_type': np.fromiter(
+                (_PROPERTY_TYPE_CODES.get(c.property_type, -1) for c in candidates),
+                dtype=np.int8, count=n
+            ),
+        }
+    
+    def _score_candidates(
+        self,
+        subject: Property,
+        soa: Dict[str, np.ndarray],
+        max_distance: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Score every candidate except the subject itself within max_distance.
+        
+        Candidates without coordinates are never distance-filtered. Returns the
+        kept candidate indices with their distances (NaN without coordinates),
+        scores and factor score rows. Runs the compiled _score_kernel when numba
+        is installed, otherwise _score_batch after NumPy distance filtering.
+        """
+        nearby = soa['mls_number'] != subject.mls_number
+        subject_lat, subject_lon = subject.latitude, subject.longitude
+        
+        if NUMBA_AVAILABLE:
+            n = len(nearby)
+            subject_values = np.array([
+                subject_lat or np.nan, subject_lon or np.nan,
+                subject.square_feet or np.nan, subject.list_price or np.nan,
+                subject.bedrooms or np.nan, subject.bathrooms or np.nan,
+                subject.year_built or np.nan,
+            ], dtype=np.float64)
+            scores, distances, factor_scores = _score_kernel(
+                subject_values, _PROPERTY_TYPE_CODES.get(subject.property_type, -1),
+                soa['lat_rad'], soa['lon_rad'], soa['cos_lat'], soa['square_feet'], soa['price'],
+                soa['bedrooms'], soa['bathrooms'], soa['year_built'], soa['property_type'],
+                np.array(self._weight_vector), max_distance,
+                self._get_buf('scores', (n,)), self._get_buf('distances', (n,)),
+                self._get_buf('factor_scores', (n, len(self._FACTOR_ORDER)))
+            )
+            indices = np.flatnonzero(nearby & ~(distances > max_distance))
+            return indices, distances[indices], scores[indices], factor_scores[indices]
+        
+        if subject_lat and subject_lon:
+            # A degree of latitude is ~69.09 miles, so a bigger latitude gap than
+            # this is out of range without any trig (only for candidates with both
+            # coordinates; the rest are never distance-filtered)
+            max_lat_gap = max_distance / 69.0
+            out_of_band = (
+                ~np.isnan(soa['longitude'])
+                & (np.abs(soa['latitude'] - subject_lat) > max_lat_gap)
+            )
+            nearby &= ~out_of_band
+            indices = np.flatnonzero(nearby)
+            # NaN for candidates without coordinates
+            subject_lat_rad = np.radians(subject_lat)
+            distances = _haversine_vec_radians(
+                subject_lat_rad, np.radians(subject_lon), np.cos(subject_lat_rad),
+                soa['lat_rad'][indices], soa['lon_rad'][indices], soa['cos_lat'][indices]
+            )
+            in_range = ~(distances > max_distance)
+            indices, distances = indices[in_range], distances[in_range]
+        else:
+            indices = np.flatnonzero(nearby)
+            distances = np.full(len(indices), np.nan)
+        
+        soa = {name: column[indices] for name, column in soa.items()}
+        scores, factor_scores = self._score_batch(subject, soa, distances, max_distance)
+        return indices, distances, scores, factor_scores
+    
+    def _score_batch(
+        self,
+        subject: Property,
+        soa: Dict[str, np.ndarray],
+        distances: np.ndarray,
+        max_distance: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score all candidates against the subject.
+        
+        Vectorized equivalent of _calculate_similarity, with distances in miles
+        normalized by max_distance. Returns the final scores and the per-factor
+        score matrix (columns in _FACTOR_ORDER).
+        """
+        factor_scores = np.full((len(distances), len(self._FACTOR_ORDER)), 0.5)
+        
+        # Distance score (closer is better); neutral if no coordinates
+        factor_scores[:, 0] = np.where(
+            np.isnan(distances),
+            0.5,
+            np.maximum(0, 1.0 - (distances / max_distance))
+        )
+        
+        # Square footage score: 10% diff = 0.8 score
+        if subject.square_feet:
+            sqft = soa['square_feet']
+            factor_scores[:, 1] = np.where(
+                np.isnan(sqft),
+                0.5,
+                np.maximum(0, 1.0 - (np.abs(subject.square_feet - sqft) / subject.square_feet * 2))
+            )
+        
+        # Price score (comp sold price, else list price, vs subject's list price)
+        if subject.list_price:
+            price = soa['price']
+            factor_scores[:, 2] = np.where(
+                np.isnan(price),
+                0.5,
+                np.maximum(0, 1.0 - (np.abs(price - subject.list_price) / subject.list_price * 2))
+            )
+        
+        # Bedrooms score - neutral 0.6 when only the candidate has bedrooms
+        beds = soa['bedrooms']
+        has_beds = ~np.isnan(beds) & (beds != 0)
+        if subject.bedrooms:
+            bed_diff = np.abs(subject.bedrooms - beds)
+            factor_scores[:, 3] = np.where(
+                has_beds, np.select([bed_diff == 0, bed_diff == 1], [1.0, 0.7], 0.3), 0.5
+            )
+        else:
+            factor_scores[:, 3] = np.where(has_beds, 0.6, 0.5)
+        
+        # Bathrooms score - neutral 0.6 when only the candidate has bathrooms
+        baths = soa['bathrooms']
+        has_baths = ~np.isnan(baths) & (baths != 0)
+        if subject.bathrooms:
+            bath_diff = np.abs(subject.bathrooms - baths)
+            factor_scores[:, 4] = np.where(
+                has_baths,
+                np.select([bath_diff == 0, bath_diff <= 0.5, bath_diff <= 1.0], [1.0, 0.8, 0.5], 0.2),
+                0.5
+            )
+        else:
+            factor_scores[:, 4] = np.where(has_baths, 0.6, 0.5)
+        
+        # Year built score (similar age)
+        if subject.year_built:
+            age_diff = np.abs(subject.year_built - soa['year_built'])
+            factor_scores[:, 5] = np.where(
+                np.isnan(age_diff),
+                0.5,
+                np.select([age_diff <= 5, age_diff <= 10, age_diff <= 20], [1.0, 0.7, 0.4], 0.2)
+            )
+        
+        # Property type score
+        factor_scores[:, 6] = (
+            soa['property_type'] == _PROPERTY_TYPE_CODES.get(subject.property_type, -1)
+        )
+        
+        # Weighted sum with the pre-normalized weights, accumulated factor by factor
+        # like the scalar scorer so tied scores stay bit-identical (a matrix
+        # product may round differently)
+        scores = np.zeros(len(distances))
+        for column, weight in zip(factor_scores.T, self._weight_vector):
+            scores += column * weight
+        return scores, factor_scores
+    
+    def _match_reasons(
+        self,
+        candidate: Property,
+        distance: Optional[float],
+        factor_scores: np.ndarray
+    ) -> List[str]:
+        """Build match reasons for a scored candidate from its factor scores."""
+        reasons = []
+        distance_score, sqft_score, price_score, bed_score, _, _, type_score = factor_scores
+        if distance is not None and distance_score > 0.7:
+            reasons.append(f"Close proximity ({distance:.2f} miles)")
+        if sqft_score > 0.7:
+            reasons.append(f"Similar size ({candidate.square_feet:,} sqft)")
+        if price_score > 0.7:
+            reasons.append(f"Similar price (${candidate.sold_price or candidate.list_price:,.0f})")
+        if bed_score == 1.0:
+            reasons.append(f"Same bedrooms ({candidate.bedrooms})")
+        if type_score == 1.0:
+            reasons.append(f"Same property type ({candidate.property_type.value})")
+        return reasons
+    
+    def _calculate_similarity(
+        self,
+        subject: Property,
+        candidate: Property,
+        distance: Optional[float] = None
+    ) -> tuple:
+        """Calculate similarity score between two properties.
+        
+        Pass distance (in miles) when the caller already has it to skip
+        recomputing it from the coordinates.
+        """
         scores = []
         reasons = []
         
         # Distance score (closer is better)
-        if subject.latitude and subject.longitude and candidate.latitude and candidate.longitude:
-            distance = geodesic(
-                (subject.latitude, subject.longitude),
-                (candidate.latitude, candidate.longitude)
-            ).miles
+        if distance is None and subject.latitude and subject.longitude and candidate.latitude and candidate.longitude:
+            distance = _haversine_scalar(
+                subject.latitude, subject.longitude,
+                candidate.latitude, candidate.longitude
+            )
+        if distance is not None:
             # Normalize: 0 miles = 1.0, 5 miles = 0.0
-            distance_score = max(0, 1.0 - (distance / settings.max_comp_distance_miles))
+            distance_score = max(0, 1.0 - (distance / runtime_policy.max_comp_distance_miles))
             scores.append(('distance', distance_score))
             if distance_score > 0.7:
                 reasons.append(f"Close proximity ({distance:.2f} miles)")
@@ -306,15 +853,10 @@ class CompAnalyzer:
         else:
             scores.append(('property_type', 0.0))
         
-        # Calculate weighted average
-        total_score = 0.0
-        total_weight = 0.0
-        for factor, score in scores:
-            weight = self.weights.get(factor, 0.1)
-            total_score += score * weight
-            total_weight += weight
-        
-        final_score = total_score / total_weight if total_weight > 0 else 0.0
+        # Weighted average (weights are pre-normalized, in _FACTOR_ORDER like scores)
+        final_score = 0.0
+        for (_, score), weight in zip(scores, self._weight_vector):
+            final_score += score * weight
         
         return final_score, reasons
     
@@ -325,19 +867,31 @@ class CompAnalyzer:
         user_feedback: Optional[float] = None
     ):
         """Record a comp selection for learning."""
-        if not settings.enable_learning:
+        if not _ENABLE_LEARNING:
             return
         
-        self.learning_data.append({
+        record = {
             'subject': subject,
             'selected_comps': selected_comps,
             'user_feedback': user_feedback,
             'timestamp': datetime.now()
-        })
-        
-        # Keep only recent data (last 1000 selections)
-        if len(self.learning_data) > 1000:
-            self.learning_data = self.learning_data[-1000:]
+        }
+        # Keep only recent data: the deque drops its oldest record on append
+        if len(self.learning_data) == self.learning_data.maxlen:
+            evicted = self.learning_data[0]
+            mls_number = evicted['subject'].mls_number
+            if self._feedback_index.get(mls_number) is evicted:
+                del self._feedback_index[mls_number]
+        self.learning_data.append(record)
+        self._feedback_index[subject.mls_number] = record
+        if self.learning_store is not None:
+            self.learning_store.append(
+                subject, selected_comps, user_feedback, record['timestamp']
+            )
+    
+    def find_learning_record(self, mls_number: str) -> Optional[dict]:
+        """Return the most recent learning record for a subject, if any."""
+        return self._feedback_index.get(mls_number)
     
     def _calculate_adjustments(self, subject: Property, comp: Property) -> List[Adjustment]:
         """Calculate professional dollar adjustments for a comparable property.
@@ -346,134 +900,150 @@ class CompAnalyzer:
         - If comp is better than subject: subtract value (negative adjustment)
         - If comp is worse than subject: add value (positive adjustment)
         """
+        return self._calculate_adjustments_batch(subject, [comp])[0]
+    
+    def _calculate_adjustments_batch(
+        self,
+        subject: Property,
+        comps: List[Property],
+        soa: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[List[Adjustment]]:
+        """Calculate adjustments for several comps with one kernel call.
+        
+        soa holds the comps' column arrays from _candidates_to_soa, row for row;
+        it is built here when not given. The amounts come from the compiled
+        _adjustment_amounts kernel; Adjustment objects are only built for the
+        categories that apply. Results are cached by input values, so re-running
+        the same subject and comps is a lookup. Callers get their own copies of
+        the cached Adjustment objects.
+        """
+        if soa is None:
+            soa = self._candidates_to_soa(comps)
+        subject_values = np.array([
+            subject.square_feet or np.nan,
+            np.nan if subject.bedrooms is None else subject.bedrooms,
+            np.nan if subject.bathrooms is None else subject.bathrooms,
+            subject.lot_size_sqft or np.nan,
+            subject.year_built or np.nan,
+            subject.list_price / subject.square_feet
+            if subject.list_price and subject.square_feet else np.nan,
+        ], dtype=np.float64)
+        # Whole days since each sale, as timedelta.days would count them
+        days_since_sale = (
+            _epoch_microseconds(datetime.now()) - soa['sold_at']
+        ) // _MICROSECONDS_PER_DAY
+        comp_values = np.column_stack([
+            soa['price'], soa['square_feet'], soa['bedrooms'], soa['bathrooms'],
+            soa['lot_size_sqft'], soa['year_built'], days_since_sale,
+            soa['seller_concessions'], soa['price_per_sqft'],
+        ])
+        
+        # The kernel inputs fully determine the adjustments, so they are the cache key
+        subject_key = subject_values.tobytes()
+        results: List[Optional[List[Adjustment]]] = []
+        misses = []
+        with self._adjustment_lock:
+            for i, values in enumerate(comp_values):
+                cache_key = subject_key + values.tobytes()
+                cached = self._adjustment_cache.get(cache_key)
+                if cached is not None:
+                    self._adjustment_cache.move_to_end(cache_key)
+                    results.append([adjustment.model_copy() for adjustment in cached])
+                else:
+                    results.append(None)
+                    misses.append((i, cache_key))
+        if not misses:
+            return results
+        
+        miss_rows = [i for i, _ in misses]
+        amounts = _adjustment_amounts(subject_values, comp_values[miss_rows])
+        
+        built = []
+        for row, (i, cache_key) in zip(amounts, misses):
+            days = days_since_sale[i]
+            adjustments = self._build_adjustments(
+                subject, comps[i], row, None if np.isnan(days) else int(days)
+            )
+            built.append((cache_key, adjustments))
+            results[i] = [adjustment.model_copy() for adjustment in adjustments]
+        with self._adjustment_lock:
+            for cache_key, adjustments in built:
+                self._adjustment_cache[cache_key] = adjustments
+                self._adjustment_cache.move_to_end(cache_key)
+            while len(self._adjustment_cache) > self.ADJUSTMENT_CACHE_SIZE:
+                self._adjustment_cache.popitem(last=False)
+        return results
+    
+    @staticmethod
+    def _build_adjustments(
+        subject: Property,
+        comp: Property,
+        amounts: np.ndarray,
+        days_since_sale: Optional[int]
+    ) -> List[Adjustment]:
+        """Describe the nonzero adjustment amounts for a comp as Adjustment objects."""
         adjustments = []
-        comp_price = comp.sold_price or comp.list_price
-        
-        if not comp_price:
-            return adjustments
-        
-        # Get price per square foot for size-based adjustments
-        comp_price_per_sqft = comp_price / comp.square_feet if comp.square_feet else None
-        subject_price_per_sqft = (subject.list_price / subject.square_feet) if (subject.list_price and subject.square_feet) else comp_price_per_sqft
-        price_per_sqft = subject_price_per_sqft or comp_price_per_sqft or 200.0  # Fallback to $200/sqft if unknown
-        
-        # 1. Square Footage Adjustment
-        if subject.square_feet and comp.square_feet:
-            sqft_diff = comp.square_feet - subject.square_feet
-            if abs(sqft_diff) > 50:  # Only adjust if difference is significant (>50 sqft)
-                adjustment_amount = sqft_diff * price_per_sqft
-                if adjustment_amount != 0:
-                    adjustments.append(Adjustment(
-                        category="Square Footage",
-                        description=f"Size difference: {sqft_diff:+,} sqft",
-                        amount=-adjustment_amount,  # Negative: comp larger subtracts value, comp smaller adds value
-                        reason=f"Comp is {abs(sqft_diff):,} sqft {'larger' if sqft_diff > 0 else 'smaller'} than subject"
-                    ))
-        
-        # 2. Bedrooms Adjustment
-        if subject.bedrooms is not None and comp.bedrooms is not None:
-            bed_diff = comp.bedrooms - subject.bedrooms
-            if bed_diff != 0:
-                # Typical bedroom value: $10,000-$20,000 depending on market
-                # Use 1% of comp price per bedroom as conservative estimate
-                bedroom_value = comp_price * 0.015  # 1.5% per bedroom
-                adjustment_amount = -bed_diff * bedroom_value
-                if adjustment_amount != 0:
-                    adjustments.append(Adjustment(
-                        category="Bedrooms",
-                        description=f"Bedroom difference: {bed_diff:+d}",
-                        amount=adjustment_amount,
-                        reason=f"Comp has {abs(bed_diff)} {'more' if bed_diff > 0 else 'fewer'} bedroom(s) than subject"
-                    ))
-        
-        # 3. Bathrooms Adjustment
-        if subject.bathrooms is not None and comp.bathrooms is not None:
-            bath_diff = comp.bathrooms - subject.bathrooms
-            if abs(bath_diff) >= 0.5:  # Only adjust for significant differences
-                # Typical bathroom value: $5,000-$15,000
-                bathroom_value = comp_price * 0.01  # 1% per full bathroom
-                adjustment_amount = -bath_diff * bathroom_value
-                if adjustment_amount != 0:
-                    adjustments.append(Adjustment(
-                        category="Bathrooms",
-                        description=f"Bathroom difference: {bath_diff:+.1f}",
-                        amount=adjustment_amount,
-                        reason=f"Comp has {abs(bath_diff):.1f} {'more' if bath_diff > 0 else 'fewer'} bathroom(s) than subject"
-                    ))
-        
-        # 4. Lot Size Adjustment
-        if subject.lot_size_sqft and comp.lot_size_sqft:
-            lot_diff = comp.lot_size_sqft - subject.lot_size_sqft
-            if abs(lot_diff) > 1000:  # Only adjust for significant differences (>1000 sqft)
-                # Lot value typically $1-$5 per sqft depending on area
-                lot_value_per_sqft = comp_price * 0.00001  # Conservative: 0.001% of price per sqft
-                adjustment_amount = -lot_diff * lot_value_per_sqft
-                if adjustment_amount != 0:
-                    adjustments.append(Adjustment(
-                        category="Lot Size",
-                        description=f"Lot size difference: {lot_diff:+,} sqft",
-                        amount=adjustment_amount,
-                        reason=f"Comp lot is {abs(lot_diff):,} sqft {'larger' if lot_diff > 0 else 'smaller'} than subject"
-                    ))
-        
-        # 5. Age/Year Built Adjustment
-        if subject.year_built and comp.year_built:
-            age_diff = comp.year_built - subject.year_built
-            if abs(age_diff) > 5:  # Only adjust for significant age differences (>5 years)
-                # Depreciation: typically 0.5-1% per year of age difference
-                depreciation_rate = 0.007  # 0.7% per year
-                if age_diff > 0:  # Comp is older
-                    adjustment_amount = comp_price * depreciation_rate * age_diff
-                    adjustments.append(Adjustment(
-                        category="Age",
-                        description=f"Age difference: {age_diff:+d} years",
-                        amount=adjustment_amount,  # Positive: comp older adds value (comp is worse)
-                        reason=f"Comp is {age_diff} years older than subject (depreciation adjustment)"
-                    ))
-                else:  # Comp is newer
-                    adjustment_amount = comp_price * depreciation_rate * abs(age_diff)
-                    adjustments.append(Adjustment(
-                        category="Age",
-                        description=f"Age difference: {age_diff:+d} years",
-                        amount=-adjustment_amount,  # Negative: comp newer subtracts value (comp is better)
-                        reason=f"Comp is {abs(age_diff)} years newer than subject (depreciation adjustment)"
-                    ))
-        
-        # 6. Time/Market Appreciation Adjustment
-        if comp.sold_date:
-            months_ago = (datetime.now() - comp.sold_date).days / 30.0
-            if months_ago > 3:  # Only adjust if sale was more than 3 months ago
-                # Market appreciation: typically 0.5-1% per month (varies by market)
-                appreciation_rate = 0.008  # 0.8% per month (conservative)
-                adjustment_amount = comp_price * appreciation_rate * months_ago
-                adjustments.append(Adjustment(
-                    category="Time",
-                    description=f"Sale recency: {months_ago:.1f} months ago",
-                    amount=-adjustment_amount,  # Negative: older sale subtracts value (market has appreciated)
-                    reason=f"Comp sold {months_ago:.1f} months ago; adjusting for market appreciation"
-                ))
-        
-        # 7. Seller Concessions Adjustment
-        if comp.seller_concessions and comp.seller_concessions > 0:
+        for code in np.flatnonzero(amounts):
+            amount = float(amounts[code])
+            category = _ADJUSTMENT_CATEGORIES[code]
+            if category == "Square Footage":
+                sqft_diff = comp.square_feet - subject.square_feet
+                description = f"Size difference: {sqft_diff:+,} sqft"
+                reason = f"Comp is {abs(sqft_diff):,} sqft {'larger' if sqft_diff > 0 else 'smaller'} than subject"
+            elif category == "Bedrooms":
+                bed_diff = comp.bedrooms - subject.bedrooms
+                description = f"Bedroom difference: {bed_diff:+d}"
+                reason = f"Comp has {abs(bed_diff)} {'more' if bed_diff > 0 else 'fewer'} bedroom(s) than subject"
+            elif category == "Bathrooms":
+                bath_diff = comp.bathrooms - subject.bathrooms
+                description = f"Bathroom difference: {bath_diff:+.1f}"
+                reason = f"Comp has {abs(bath_diff):.1f} {'more' if bath_diff > 0 else 'fewer'} bathroom(s) than subject"
+            elif category == "Lot Size":
+                lot_diff = comp.lot_size_sqft - subject.lot_size_sqft
+                description = f"Lot size difference: {lot_diff:+,} sqft"
+                reason = f"Comp lot is {abs(lot_diff):,} sqft {'larger' if lot_diff > 0 else 'smaller'} than subject"
+            elif category == "Age":
+                age_diff = comp.year_built - subject.year_built
+                description = f"Age difference: {age_diff:+d} years"
+                if age_diff > 0:
+                    reason = f"Comp is {age_diff} years older than subject (depreciation adjustment)"
+                else:
+                    reason = f"Comp is {abs(age_diff)} years newer than subject (depreciation adjustment)"
+            elif category == "Time":
+                months_ago = days_since_sale / 30.0
+                description = f"Sale recency: {months_ago:.1f} months ago"
+                reason = f"Comp sold {months_ago:.1f} months ago; adjusting for market appreciation"
+            else:
+                description = f"Seller concessions: ${comp.seller_concessions:,.0f}"
+                reason = f"Seller paid ${comp.seller_concessions:,.0f} in concessions; adding back to sale price"
             adjustments.append(Adjustment(
-                category="Concessions",
-                description=f"Seller concessions: ${comp.seller_concessions:,.0f}",
-                amount=comp.seller_concessions,  # Positive: add back concessions to get true market value
-                reason=f"Seller paid ${comp.seller_concessions:,.0f} in concessions; adding back to sale price"
+                category=category, description=description, amount=amount, reason=reason
             ))
         
-        # 8. Condition/Upgrades Adjustment (if data available)
-        # Note: This requires condition ratings or upgrade lists which may not be available
-        # For now, we'll skip this but the structure is ready for future enhancement
-        
-        # 9. Location Adjustment (basic - can be enhanced with traffic data)
-        # Note: Detailed location adjustments (busy street vs cul-de-sac) require additional data
-        # For now, distance is already factored into similarity score
-        
+        # Condition/upgrade and location adjustments need data we don't have yet
+        # (condition ratings, busy street vs cul-de-sac); distance is already
+        # factored into the similarity score
         return adjustments
     
     def update_weights(self, new_weights: dict):
         """Update similarity weights (can be called after training)."""
-        self.weights.update(new_weights)
+        self._set_weights({**self.weights, **new_weights})
         logger.info(f"Updated comp analysis weights: {self.weights}")
+    
+    def _set_weights(self, weights: dict):
+        """Store similarity weights normalized to sum to 1.
+        
+        Also caches them as a tuple in _FACTOR_ORDER (a missing factor weighs
+        0.1 before normalizing), so scoring is a plain weighted sum.
+        """
+        total = sum(weights.values())
+        if total > 0:
+            weights = {factor: weight / total for factor, weight in weights.items()}
+        self.weights = weights
+        
+        ordered = [weights.get(factor, 0.1) for factor in self._FACTOR_ORDER]
+        total = sum(ordered)
+        self._weight_vector = tuple(
+            weight / total if total > 0 else 0.0 for weight in ordered
+        )
 
@@ -0,0 +1,275 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from models import PropertyType
+from unittest_helpers import make_property
+
+
+def _candidates() -> list:
+    """A small pool mixing complete, partial and off-type candidates."""
+    return [
+        make_property(
+            "C1", latitude=33.41, longitude=-111.81, square_feet=1750, bedrooms=3,
+            bathrooms=2.0, year_built=1999, sold_price=395000.0,
+            sold_date=datetime.now() - timedelta(days=200), lot_size_sqft=7000,
+        ),
+        make_property(
+            "C2", latitude=33.42, longitude=-111.79, square_feet=2100, bedrooms=4,
+            bathrooms=2.5, year_built=2010, list_price=450000.0,
+        ),
+        make_property("C3", square_feet=1800, bedrooms=3, list_price=405000.0),
+        make_property(
+            "C4", property_type=PropertyType.CONDO, latitude=33.40,
+            longitude=-111.80, square_feet=1100, bedrooms=2, bathrooms=1.0,
+            sold_price=250000.0,
+        ),
+        make_property(
+            "C5", latitude=33.40, longitude=-111.80, square_feet=1820, bedrooms=3,
+            bathrooms=2.0, year_built=2001, sold_price=402000.0,
+            seller_concessions=5000.0,
+        ),
+        make_property("S"),  # same MLS number as the subject
+    ]
+
+
+class TestFindComps(unittest.TestCase):
+    def setUp(self) -> None:
+        from comp_analyzer import CompAnalyzer
+
+        self.analyzer = CompAnalyzer()
+        self.subject = make_property(
+            "S", latitude=33.40, longitude=-111.80, square_feet=1800, bedrooms=3,
+            bathrooms=2.0, year_built=2001, list_price=400000.0, lot_size_sqft=6500,
+        )
+
+    def test_scores_and_reasons_match_scalar_similarity(self) -> None:
+        candidates = _candidates()
+        result = self.analyzer.find_comps(self.subject, candidates, max_comps=10)
+
+        comps = result.comparable_properties
+        self.assertNotIn("S", [c.property.mls_number for c in comps])
+        scores = [c.similarity_score for c in comps]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for comp in comps:
+            score, reasons = self.analyzer._calculate_similarity(self.subject, comp.property)
+            self.assertAlmostEqual(comp.similarity_score, score)
+            self.assertEqual(comp.match_reasons, reasons)
+            # Given the same distance, the scalar scorer is bit-identical
+            score, _ = self.analyzer._calculate_similarity(
+                self.subject, comp.property, distance=comp.distance_miles
+            )
+            self.assertEqual(comp.similarity_score, score)
+
+    def test_compiled_and_numpy_scoring_agree(self) -> None:
+        import comp_analyzer
+
+        if not comp_analyzer.NUMBA_AVAILABLE:
+            self.skipTest("numba is not installed")
+        candidates = _candidates() + [
+            make_property("FAR", latitude=34.40, longitude=-111.80, square_feet=1800)
+        ]
+        soa = self.analyzer._candidates_to_soa(candidates)
+        for subject in (self.subject, make_property("S", square_feet=1800)):
+            compiled = self.analyzer._score_candidates(subject, soa, 5.0)
+            with patch("comp_analyzer.NUMBA_AVAILABLE", False):
+                numpy_path = self.analyzer._score_candidates(subject, soa, 5.0)
+
+            self.assertEqual(list(compiled[0]), list(numpy_path[0]))
+            for actual, expected in zip(compiled[1:], numpy_path[1:]):
+                self.assertEqual(actual.shape, expected.shape)
+                for a, e in zip(actual.ravel(), expected.ravel()):
+                    if e != e:  # NaN distance
+                        self.assertNotEqual(a, a)
+                    else:
+                        self.assertAlmostEqual(a, e)
+
+    def test_numpy_path_never_distance_filters_partial_coordinates(self) -> None:
+        candidates = [
+            make_property("LAT_ONLY", latitude=34.40, square_feet=1800),
+            make_property("FAR", latitude=34.40, longitude=-111.80, square_feet=1800),
+        ]
+        soa = self.analyzer._candidates_to_soa(candidates)
+
+        with patch("comp_analyzer.NUMBA_AVAILABLE", False):
+            indices, distances, _, _ = self.analyzer._score_candidates(self.subject, soa, 5.0)
+
+        self.assertEqual(list(indices), [0])
+        self.assertNotEqual(distances[0], distances[0])  # NaN: not measurable
+
+    def test_candidate_columns_reused_for_same_list(self) -> None:
+        candidates = _candidates()
+        other_subject = make_property("C5", latitude=33.41, longitude=-111.81)
+        with patch.object(
+            self.analyzer, "_candidates_to_soa", wraps=self.analyzer._candidates_to_soa
+        ) as to_soa:
+            first = self.analyzer.find_comps(self.subject, candidates, max_comps=10)
+            self.analyzer.find_comps(other_subject, candidates, max_comps=10)
+            self.assertEqual(to_soa.call_count, 1)
+            again = self.analyzer.find_comps(self.subject, list(candidates), max_comps=10)
+            self.assertEqual(to_soa.call_count, 2)
+
+        self.assertEqual(
+            [(c.property.mls_number, c.similarity_score) for c in first.comparable_properties],
+            [(c.property.mls_number, c.similarity_score) for c in again.comparable_properties],
+        )
+
+    def test_adjustments_for_larger_newer_comp(self) -> None:
+        comp = _candidates()[1]
+
+        adjustments = self.analyzer._calculate_adjustments(self.subject, comp)
+
+        by_category = {adj.category: adj for adj in adjustments}
+        self.assertEqual(list(by_category), ["Square Footage", "Bedrooms", "Bathrooms", "Age"])
+        self.assertAlmostEqual(by_category["Square Footage"].amount, -300 * 400000.0 / 1800)
+        self.assertEqual(by_category["Square Footage"].description, "Size difference: +300 sqft")
+        self.assertAlmostEqual(by_category["Bedrooms"].amount, -6750.0)
+        self.assertAlmostEqual(by_category["Bathrooms"].amount, -2250.0)
+        self.assertAlmostEqual(by_category["Age"].amount, 450000.0 * 0.007 * 9)
+        self.assertEqual(
+            by_category["Age"].reason,
+            "Comp is 9 years older than subject (depreciation adjustment)",
+        )
+
+    def test_adjustments_for_old_sale_with_concessions(self) -> None:
+        comp = _candidates()[0].model_copy(update={"seller_concessions": 5000.0})
+
+        adjustments = self.analyzer._calculate_adjustments(self.subject, comp)
+
+        self.assertEqual([adj.category for adj in adjustments], ["Time", "Concessions"])
+        self.assertAlmostEqual(adjustments[0].amount, -(395000.0 * 0.008 * 200 / 30.0))
+        self.assertEqual(adjustments[0].description, "Sale recency: 6.7 months ago")
+        self.assertEqual(adjustments[1].amount, 5000.0)
+
+    def test_adjustments_accept_timezone_aware_sale_dates(self) -> None:
+        from datetime import timezone
+
+        sold_date = datetime.now(timezone.utc) - timedelta(days=200, hours=1)
+        comp = _candidates()[0].model_copy(update={"sold_date": sold_date})
+
+        adjustments = self.analyzer._calculate_adjustments(self.subject, comp)
+
+        self.assertEqual([adj.category for adj in adjustments], ["Time"])
+        self.assertAlmostEqual(adjustments[0].amount, -(395000.0 * 0.008 * 200 / 30.0))
+
+    def test_adjustments_cached_until_inputs_change(self) -> None:
+        import comp_analyzer
+
+        candidates = _candidates()
+        with patch.object(
+            comp_analyzer, "_adjustment_amounts", wraps=comp_analyzer._adjustment_amounts
+        ) as kernel:
+            first = self.analyzer.find_comps(self.subject, candidates)
+            calls = kernel.call_count
+            second = self.analyzer.find_comps(self.subject, candidates)
+            self.assertEqual(kernel.call_count, calls)
+
+            candidates[1].bedrooms = 5
+            self.analyzer._calculate_adjustments(self.subject, candidates[1])
+            self.assertEqual(kernel.call_count, calls + 1)
+
+        self.assertEqual(
+            [c.adjustments for c in first.comparable_properties],
+            [c.adjustments for c in second.comparable_properties],
+        )
+
+    def test_cached_adjustments_are_returned_as_copies(self) -> None:
+        comp = _candidates()[1]
+        first = self.analyzer._calculate_adjustments(self.subject, comp)
+        first[0].amount = 0.0
+
+        second = self.analyzer._calculate_adjustments(self.subject, comp)
+
+        self.assertNotEqual(second[0].amount, 0.0)
+        self.assertIsNot(second[0], first[0])
+
+    def test_adjustment_cache_is_safe_across_threads(self) -> None:
+        import time
+        from collections import OrderedDict
+        from concurrent.futures import ThreadPoolExecutor
+
+        class YieldingOrderedDict(OrderedDict):
+            # Give up the GIL after every lookup so check-then-act races surface
+            def get(self, *args):
+                value = super().get(*args)
+                time.sleep(0)
+                return value
+
+        self.analyzer.ADJUSTMENT_CACHE_SIZE = 2
+        self.analyzer._adjustment_cache = YieldingOrderedDict()
+        comps = [
+            make_property(f"C{i}", square_feet=1500 + 100 * i, sold_price=390000.0)
+            for i in range(4)
+        ]
+
+        def churn(worker: int) -> None:
+            for i in range(200):
+                comp = comps[(worker + i) % len(comps)]
+                self.analyzer._calculate_adjustments(self.subject, comp)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(churn, range(6)))
+
+        self.assertLessEqual(len(self.analyzer._adjustment_cache), 2)
+
+    def test_average_price_ignores_unpriced_comps(self) -> None:
+        shared = dict(
+            latitude=33.40, longitude=-111.80, square_feet=1800, bedrooms=3,
+            bathrooms=2.0, year_built=2001, lot_size_sqft=6500,
+        )
+        unpriced = make_property("A", **shared)
+        priced = make_property("B", sold_price=800000.0, **shared)
+
+        result = self.analyzer.find_comps(self.subject, [priced, unpriced])
+
+        self.assertEqual(
+            [c.property.mls_number for c in result.comparable_properties], ["A", "B"]
+        )
+        self.assertAlmostEqual(
+            result.average_price, result.comparable_properties[1].adjusted_price
+        )
+
+    def test_update_weights_keeps_weights_normalized(self) -> None:
+        self.analyzer.update_weights({"distance": 1.0, "price": 0.0})
+
+        self.assertAlmostEqual(sum(self.analyzer.weights.values()), 1.0)
+        self.assertEqual(self.analyzer.weights["price"], 0.0)
+        self.assertAlmostEqual(self.analyzer.weights["distance"], 1.0 / 1.65)
+
+        # A comp that only differs in price now scores as if price were ignored
+        comp = make_property(
+            "C", latitude=33.40, longitude=-111.80, square_feet=1800, bedrooms=3,
+            bathrooms=2.0, year_built=2001, sold_price=900000.0,
+        )
+        score, _ = self.analyzer._calculate_similarity(self.subject, comp)
+        self.assertAlmostEqual(score, 1.0)
+
+    def test_learning_data_bounded_and_feedback_index_evicted(self) -> None:
+        self.analyzer.learning_data = type(self.analyzer.learning_data)(maxlen=3)
+        with patch("comp_analyzer._ENABLE_LEARNING", True):
+            for mls_number in ["A", "B", "A", "C", "D"]:
+                self.analyzer.record_comp_selection(make_property(mls_number), [])
+
+        self.assertEqual(
+            [r["subject"].mls_number for r in self.analyzer.learning_data],
+            ["A", "C", "D"],
+        )
+        self.assertIsNone(self.analyzer.find_learning_record("B"))
+        self.assertIs(
+            self.analyzer.find_learning_record("A"), self.analyzer.learning_data[0]
+        )
+
+    def test_top_indices_matches_stable_sort_with_ties(self) -> None:
+        import numpy as np
+
+        scores = np.array([0.5, 0.9, 0.7, 0.9, 0.7, 0.7, 0.1])
+        indices = np.arange(10, 17)
+
+        for k in range(1, 8):
+            expected = indices[np.argsort(-scores, kind="stable")][:k]
+            selected = self.analyzer._top_indices(indices, scores, k)
+            self.assertEqual(sorted(selected), sorted(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,46 +1,251 @@
 """Training system for learning from comp guidelines and instructions."""
 import logging
-import json
-from typing import List, Dict, Any, Optional
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from pathlib import Path
-from comp_analyzer import CompAnalyzer
+import numpy as np
+from pydantic import BaseModel
+from comp_analyzer import CompAnalyzer, _haversine_vec
 from models import Property, CompProperty
-from config import settings
+from config import runtime_policy
+from json_utils import dumps_line, loads
 
 logger = logging.getLogger(__name__)
 
 
+def _guideline_line(guideline: Dict[str, Any]) -> bytes:
+    """Encode one guideline as an NDJSON line."""
+    return dumps_line(guideline, default=str)
+
+# Patterns for add_instruction_text, matched against the lowercased instruction
+_MILES_RE = re.compile(r'within\s+(\d+(?:\.\d+)?)\s+miles?')
+_MONTHS_RE = re.compile(r'within\s+(\d+)\s+months?')
+_PERCENT_RE = re.compile(r'within\s+(\d+)%')  # lot size and price tolerances
+_BEDROOMS_RE = re.compile(r'within\s+(\d+)')
+_BATHROOMS_RE = re.compile(r'by\s+(\d+(?:\.\d+)?)')
+
+
+@lru_cache(maxsize=1024)
+def _parse_instruction(instruction_lower: str) -> Tuple[Tuple[Tuple[str, Any], ...], float]:
+    """Parse a lowercased instruction into (criteria items, priority).
+    
+    Cached on the text, so repeated instructions skip the keyword scans and
+    regex searches. Criteria come back as a tuple of items to keep the cached
+    value immutable.
+    """
+    # Simple keyword-based parsing (can be enhanced with NLP)
+    criteria = {}
+    priority = 1.0
+    
+    # Keywords shared by several rules are looked up once
+    has_within = "within" in instruction_lower
+    has_vary = "vary" in instruction_lower
+    has_match_exactly = "match exactly" in instruction_lower
+    has_must = "must" in instruction_lower
+    
+    # Parse distance requirements ("mile" also matches "miles")
+    if "mile" in instruction_lower:
+        distance_match = _MILES_RE.search(instruction_lower)
+        if distance_match:
+            criteria['max_distance_miles'] = float(distance_match.group(1))
+    
+    # Parse time requirements
+    if "month" in instruction_lower:
+        month_match = _MONTHS_RE.search(instruction_lower)
+        if month_match:
+            criteria['max_age_months'] = int(month_match.group(1))
+    
+    # Parse similarity requirements
+    if "similar" in instruction_lower and "lot" in instruction_lower:
+        lot_match = _PERCENT_RE.search(instruction_lower)
+        if lot_match:
+            criteria['lot_size_tolerance_percent'] = float(lot_match.group(1))
+    
+    # Parse bedroom requirements
+    if "bedroom" in instruction_lower:
+        if has_match_exactly or (has_must and "must match" in instruction_lower):
+            criteria['bedrooms_exact_match'] = True
+        elif has_vary or has_within:
+            bed_match = _BEDROOMS_RE.search(instruction_lower)
+            if bed_match:
+                criteria['bedrooms_tolerance'] = int(bed_match.group(1))
+    
+    # Parse bathroom requirements
+    if "bathroom" in instruction_lower:
+        if has_match_exactly:
+            criteria['bathrooms_exact_match'] = True
+        elif has_vary:
+            bath_match = _BATHROOMS_RE.search(instruction_lower)
+            if bath_match:
+                criteria['bathrooms_tolerance'] = float(bath_match.group(1))
+    
+    # Parse price requirements
+    if has_within and "price" in instruction_lower:
+        price_match = _PERCENT_RE.search(instruction_lower)
+        if price_match:
+            criteria['price_tolerance_percent'] = float(price_match.group(1))
+    
+    # Check for priority keywords
+    if has_must or "required" in instruction_lower:
+        priority = 2.0
+    elif "prefer" in instruction_lower or "should" in instruction_lower:
+        priority = 1.5
+    
+    return tuple(criteria.items()), priority
+
+
+def _candidates_to_arrays(candidates: List[Property]) -> Dict[str, np.ndarray]:
+    """Candidate fields checked by guidelines as arrays, NaN where missing (or zero)."""
+    n = len(candidates)
+    
+    def column(values) -> np.ndarray:
+        return np.fromiter((value or np.nan for value in values), dtype=np.float64, count=n)
+    
+    return {
+        'latitude': column(c.latitude for c in candidates),
+        'longitude': column(c.longitude for c in candidates),
+        'bedrooms': column(c.bedrooms for c in candidates),
+        'bathrooms': column(c.bathrooms for c in candidates),
+        'lot_size_sqft': column(c.lot_size_sqft for c in candidates),
+        'price': column(c.sold_price or c.list_price for c in candidates),
+    }
+
+
+# Candidate checks: each returns a mask of the candidates that pass, and passes
+# candidates missing the data it needs (NaN compares False)
+
+def _distance_check(
+    subject: Property, latitude: np.ndarray, longitude: np.ndarray, max_miles: float
+) -> np.ndarray:
+    if not (subject.latitude and subject.longitude):
+        return np.ones(len(latitude), dtype=bool)
+    distances = _haversine_vec(subject.latitude, subject.longitude, latitude, longitude)
+    return ~(distances > max_miles)
+
+
+def _percent_check(subject_value: Optional[float], values: np.ndarray, tolerance: float) -> np.ndarray:
+    if not subject_value:
+        return np.ones(len(values), dtype=bool)
+    diff_pct = np.abs(values - subject_value) / subject_value * 100
+    return ~(diff_pct > tolerance)
+
+
+def _exact_check(subject_value: Optional[float], values: np.ndarray) -> np.ndarray:
+    if not subject_value:
+        return np.ones(len(values), dtype=bool)
+    return (values == subject_value) | np.isnan(values)
+
+
+def _tolerance_check(subject_value: Optional[float], values: np.ndarray, tolerance: float) -> np.ndarray:
+    if not subject_value:
+        return np.ones(len(values), dtype=bool)
+    return ~(np.abs(values - subject_value) > tolerance)
+
+
+class EffectiveConstraints(BaseModel):
+    """The combined must-pass (priority >= 2.0) criteria of all guidelines.
+    
+    A candidate fails the guidelines if it fails any one of them, so each
+    numeric limit is simply the strictest one given; None means unconstrained.
+    """
+    max_distance_miles: Optional[float] = None
+    lot_size_tolerance_percent: Optional[float] = None
+    bedrooms_exact_match: bool = False
+    bedrooms_tolerance: Optional[float] = None
+    bathrooms_exact_match: bool = False
+    bathrooms_tolerance: Optional[float] = None
+    price_tolerance_percent: Optional[float] = None
+    
+    @property
+    def unconstrained(self) -> bool:
+        """True when no must-pass guideline set any limit."""
+        return not self.model_fields_set
+    
+    @classmethod
+    def from_guidelines(cls, guidelines: List[Dict[str, Any]]) -> "EffectiveConstraints":
+        """Collapse the must-pass guidelines into one set of constraints."""
+        limits: Dict[str, Any] = {}
+        
+        def tighten(name: str, value: float):
+            limits[name] = value if limits.get(name) is None else min(limits[name], value)
+        
+        for guideline in guidelines:
+            if guideline.get('priority', 1.0) < 2.0:
+                continue
+            criteria = guideline.get('criteria', {})
+            for name in ('max_distance_miles', 'lot_size_tolerance_percent', 'price_tolerance_percent'):
+                if name in criteria:
+                    tighten(name, criteria[name])
+            # An exact match requirement takes the place of that guideline's tolerance
+            for room in ('bedrooms', 'bathrooms'):
+                if criteria.get(f'{room}_exact_match'):
+                    limits[f'{room}_exact_match'] = True
+                elif f'{room}_tolerance' in criteria:
+                    tighten(f'{room}_tolerance', criteria[f'{room}_tolerance'])
+        return cls(**limits)
+
+
 class CompGuidelinesTrainer:
     """Trains the bot from comp guidelines and instructions."""
     
     def __init__(self, analyzer: CompAnalyzer):
         self.analyzer = analyzer
-        self.guidelines_file = Path("comp_guidelines.json")
+        # One JSON guideline per line, so adding one is an append
+        self.guidelines_file = Path("comp_guidelines.ndjson")
         self.guidelines: List[Dict[str, Any]] = []
+        # Must-pass criteria of all guidelines, rebuilt when guidelines change
+        self._constraints = EffectiveConstraints()
+        # Inside bulk_update: guidelines added since it began, or None when not deferring
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._needs_rewrite = False
         self.load_guidelines()
     
     def load_guidelines(self):
-        """Load comp guidelines from file."""
+        """Load comp guidelines from file.
+        
+        Guidelines saved by older versions as a single JSON array (the same path
+        with a .json suffix) are loaded and rewritten in the current format.
+        """
+        legacy_file = self.guidelines_file.with_suffix('.json')
         if self.guidelines_file.exists():
             try:
-                with open(self.guidelines_file, 'r', encoding='utf-8') as f:
-                    self.guidelines = json.load(f)
+                with open(self.guidelines_file, 'rb') as f:
+                    self.guidelines = [loads(line) for line in f if line.strip()]
                 logger.info(f"Loaded {len(self.guidelines)} comp guidelines")
             except Exception as e:
                 logger.error(f"Error loading guidelines: {e}")
                 self.guidelines = []
+        elif legacy_file.exists():
+            try:
+                self.guidelines = loads(legacy_file.read_bytes())
+                logger.info(f"Loaded {len(self.guidelines)} comp guidelines from {legacy_file}")
+                self.save_guidelines()
+            except Exception as e:
+                logger.error(f"Error loading guidelines: {e}")
+                self.guidelines = []
         else:
             self.guidelines = []
+        self._constraints = EffectiveConstraints.from_guidelines(self.guidelines)
     
     def save_guidelines(self):
-        """Save comp guidelines to file."""
+        """Save all comp guidelines to file, replacing its contents."""
         try:
-            with open(self.guidelines_file, 'w', encoding='utf-8') as f:
-                json.dump(self.guidelines, f, indent=2, default=str)
+            with open(self.guidelines_file, 'wb') as f:
+                f.writelines(_guideline_line(g) for g in self.guidelines)
             logger.info(f"Saved {len(self.guidelines)} comp guidelines")
         except Exception as e:
             logger.error(f"Error saving guidelines: {e}")
     
+    def _append_guidelines(self, guidelines: List[Dict[str, Any]]):
+        """Append new guidelines to the file without rewriting the existing ones."""
+        try:
+            with open(self.guidelines_file, 'ab') as f:
+                f.writelines(_guideline_line(g) for g in guidelines)
+        except Exception as e:
+            logger.error(f"Error saving guidelines: {e}")
+    
     def add_guideline(
         self,
         description: str,
@@ -65,10 +270,42 @@ class CompGuidelinesTrainer:
             'usage_count': 0
         }
         self.guidelines.append(guideline)
-        self.save_guidelines()
         logger.info(f"Added guideline: {description}")
+        if self._pending is not None:
+            self._pending.append(guideline)
+            return
+        self._append_guidelines([guideline])
         self.apply_guidelines()
     
+    def add_guidelines_batch(self, items: List[Tuple[str, Dict[str, Any], float]]):
+        """Add several (description, criteria, priority) guidelines, saving and applying once."""
+        with self.bulk_update():
+            for description, criteria, priority in items:
+                self.add_guideline(description, criteria, priority)
+    
+    @contextmanager
+    def bulk_update(self) -> Iterator[None]:
+        """Defer saving and applying guidelines until the block exits.
+        
+        Use around many add_guideline/add_instruction_text/remove_guideline
+        calls to write the file once and re-apply the guidelines once.
+        """
+        if self._pending is not None:  # already inside a bulk update
+            yield
+            return
+        self._pending = []
+        try:
+            yield
+        finally:
+            pending, self._pending = self._pending, None
+            if self._needs_rewrite:
+                self._needs_rewrite = False
+                self.save_guidelines()
+                self.apply_guidelines()
+            elif pending:
+                self._append_guidelines(pending)
+                self.apply_guidelines()
+    
     def add_instruction_text(self, instruction_text: str):
         """
         Parse and add guidelines from natural language instructions.
@@ -79,65 +316,8 @@ class CompGuidelinesTrainer:
         - "Bedrooms must match exactly, bathrooms can vary by 0.5"
         - "Price should be within 15% of subject property"
         """
-        # Simple keyword-based parsing (can be enhanced with NLP)
-        criteria = {}
-        priority = 1.0
-        
-        instruction_lower = instruction_text.lower()
-        
-        # Parse distance requirements
-        if "mile" in instruction_lower or "miles" in instruction_lower:
-            import re
-            distance_match = re.search(r'within\s+(\d+(?:\.\d+)?)\s+miles?', instruction_lower)
-            if distance_match:
-                criteria['max_distance_miles'] = float(distance_match.group(1))
-        
-        # Parse time requirements
-        if "month" in instruction_lower or "months" in instruction_lower:
-            import re
-            month_match = re.search(r'within\s+(\d+)\s+months?', instruction_lower)
-            if month_match:
-                criteria['max_age_months'] = int(month_match.group(1))
-        
-        # Parse similarity requirements
-        if "similar" in instruction_lower and "lot" in instruction_lower:
-            import re
-            lot_match = re.search(r'within\s+(\d+)%', instruction_lower)
-            if lot_match:
-                criteria['lot_size_tolerance_percent'] = float(lot_match.group(1))
-        
-        # Parse bedroom requirements
-        if "bedroom" in instruction_lower:
-            if "match exactly" in instruction_lower or "must match" in instruction_lower:
-                criteria['bedrooms_exact_match'] = True
-            elif "vary" in instruction_lower or "within" in instruction_lower:
-                import re
-                bed_match = re.search(r'within\s+(\d+)', instruction_lower)
-                if bed_match:
-                    criteria['bedrooms_tolerance'] = int(bed_match.group(1))
-        
-        # Parse bathroom requirements
-        if "bathroom" in instruction_lower:
-            if "match exactly" in instruction_lower:
-                criteria['bathrooms_exact_match'] = True
-            elif "vary" in instruction_lower:
-                import re
-                bath_match = re.search(r'by\s+(\d+(?:\.\d+)?)', instruction_lower)
-                if bath_match:
-                    criteria['bathrooms_tolerance'] = float(bath_match.group(1))
-        
-        # Parse price requirements
-        if "price" in instruction_lower and "within" in instruction_lower:
-            import re
-            price_match = re.search(r'within\s+(\d+)%', instruction_lower)
-            if price_match:
-                criteria['price_tolerance_percent'] = float(price_match.group(1))
-        
-        # Check for priority keywords
-        if "must" in instruction_lower or "required" in instruction_lower:
-            priority = 2.0
-        elif "prefer" in instruction_lower or "should" in instruction_lower:
-            priority = 1.5
+        criteria_items, priority = _parse_instruction(instruction_text.lower())
+        criteria = dict(criteria_items)
         
         if criteria:
             self.add_guideline(instruction_text, criteria, priority)
@@ -148,10 +328,13 @@ class CompGuidelinesTrainer:
     
     def apply_guidelines(self):
         """Apply guidelines to update analyzer settings and weights."""
+        self._constraints = EffectiveConstraints.from_guidelines(self.guidelines)
         if not self.guidelines:
             return
         
-        # Update settings based on guidelines
+        # Update the runtime comp limits based on guidelines
+        max_distance = runtime_policy.max_comp_distance_miles
+        max_age_days = runtime_policy.max_comp_age_days
         for guideline in self.guidelines:
             criteria = guideline.get('criteria', {})
             priority = guideline.get('priority', 1.0)
@@ -160,17 +343,20 @@ class CompGuidelinesTrainer:
             if 'max_distance_miles' in criteria:
                 new_distance = criteria['max_distance_miles']
                 if priority >= 2.0:  # High priority - override
-                    settings.max_comp_distance_miles = new_distance
-                elif new_distance < settings.max_comp_distance_miles:  # Use stricter
-                    settings.max_comp_distance_miles = new_distance
+                    max_distance = new_distance
+                elif new_distance < max_distance:  # Use stricter
+                    max_distance = new_distance
             
             # Update max age if specified
             if 'max_age_months' in criteria:
                 new_age_days = criteria['max_age_months'] * 30
                 if priority >= 2.0:
-                    settings.max_comp_age_days = new_age_days
-                elif new_age_days < settings.max_comp_age_days:
-                    settings.max_comp_age_days = new_age_days
+                    max_age_days = new_age_days
+                elif new_age_days < max_age_days:
+                    max_age_days = new_age_days
+        
+        runtime_policy.max_comp_distance_miles = max_distance
+        runtime_policy.max_comp_age_days = max_age_days
         
         # Update similarity weights based on guidelines
         # Count how many guidelines mention each factor
@@ -225,91 +411,50 @@ class CompGuidelinesTrainer:
         candidates: List[Property]
     ) -> List[Property]:
         """Filter candidates based on guidelines."""
-        if not self.guidelines:
+        # Only must-pass guidelines can reject a candidate; each check runs on
+        # all candidates at once
+        constraints = self._constraints
+        if constraints.unconstrained:
             return candidates
-        
-        filtered = []
-        for candidate in candidates:
-            passes = True
-            
-            for guideline in self.guidelines:
-                criteria = guideline.get('criteria', {})
-                priority = guideline.get('priority', 1.0)
-                
-                # Check distance requirement
-                if 'max_distance_miles' in criteria:
-                    from geopy.distance import geodesic
-                    if subject.latitude and subject.longitude and candidate.latitude and candidate.longitude:
-                        distance = geodesic(
-                            (subject.latitude, subject.longitude),
-                            (candidate.latitude, candidate.longitude)
-                        ).miles
-                        if distance > criteria['max_distance_miles']:
-                            if priority >= 2.0:  # Must pass
-                                passes = False
-                                break
-                
-                # Check lot size requirement
-                if 'lot_size_tolerance_percent' in criteria and subject.lot_size_sqft and candidate.lot_size_sqft:
-                    lot_diff_pct = abs(subject.lot_size_sqft - candidate.lot_size_sqft) / subject.lot_size_sqft * 100
-                    if lot_diff_pct > criteria['lot_size_tolerance_percent']:
-                        if priority >= 2.0:
-                            passes = False
-                            break
-                
-                # Check bedroom requirement
-                if 'bedrooms_exact_match' in criteria and criteria['bedrooms_exact_match']:
-                    if subject.bedrooms and candidate.bedrooms and subject.bedrooms != candidate.bedrooms:
-                        if priority >= 2.0:
-                            passes = False
-                            break
-                elif 'bedrooms_tolerance' in criteria:
-                    if subject.bedrooms and candidate.bedrooms:
-                        bed_diff = abs(subject.bedrooms - candidate.bedrooms)
-                        if bed_diff > criteria['bedrooms_tolerance']:
-                            if priority >= 2.0:
-                                passes = False
-                                break
-                
-                # Check bathroom requirement
-                if 'bathrooms_exact_match' in criteria and criteria['bathrooms_exact_match']:
-                    if subject.bathrooms and candidate.bathrooms and subject.bathrooms != candidate.bathrooms:
-                        if priority >= 2.0:
-                            passes = False
-                            break
-                elif 'bathrooms_tolerance' in criteria:
-                    if subject.bathrooms and candidate.bathrooms:
-                        bath_diff = abs(subject.bathrooms - candidate.bathrooms)
-                        if bath_diff > criteria['bathrooms_tolerance']:
-                            if priority >= 2.0:
-                                passes = False
-                                break
-                
-                # Check price requirement
-                if 'price_tolerance_percent' in criteria and subject.list_price:
-                    comp_price = candidate.sold_price or candidate.list_price
-                    if comp_price:
-                        price_diff_pct = abs(comp_price - subject.list_price) / subject.list_price * 100
-                        if price_diff_pct > criteria['price_tolerance_percent']:
-                            if priority >= 2.0:
-                                passes = False
-                                break
-            
-            if passes:
-                filtered.append(candidate)
-        
-        return filtered
+        arrays = _candidates_to_arrays(candidates)
+        passes = np.ones(len(candidates), dtype=bool)
+        if constraints.lot_size_tolerance_percent is not None:
+            passes &= _percent_check(
+                subject.lot_size_sqft, arrays['lot_size_sqft'], constraints.lot_size_tolerance_percent
+            )
+        if constraints.bedrooms_exact_match:
+            passes &= _exact_check(subject.bedrooms, arrays['bedrooms'])
+        if constraints.bedrooms_tolerance is not None:
+            passes &= _tolerance_check(subject.bedrooms, arrays['bedrooms'], constraints.bedrooms_tolerance)
+        if constraints.bathrooms_exact_match:
+            passes &= _exact_check(subject.bathrooms, arrays['bathrooms'])
+        if constraints.bathrooms_tolerance is not None:
+            passes &= _tolerance_check(subject.bathrooms, arrays['bathrooms'], constraints.bathrooms_tolerance)
+        if constraints.price_tolerance_percent is not None:
+            passes &= _percent_check(subject.list_price, arrays['price'], constraints.price_tolerance_percent)
+        # Distance is the only check needing trig, so it runs last and only on
+        # the candidates the cheap comparisons kept
+        if constraints.max_distance_miles is not None:
+            kept = np.flatnonzero(passes)
+            passes[kept] = _distance_check(
+                subject, arrays['latitude'][kept], arrays['longitude'][kept],
+                constraints.max_distance_miles
+            )
+        return [candidates[i] for i in np.flatnonzero(passes)]
     
-    def list_guidelines(self) -> List[Dict[str, Any]]:
-        """List all current guidelines."""
-        return self.guidelines.copy()
+    def list_guidelines(self) -> Tuple[Dict[str, Any], ...]:
+        """List all current guidelines (read-only; wrap in list() to modify)."""
+        return tuple(self.guidelines)
     
     def remove_guideline(self, index: int):
         """Remove a guideline by index."""
         if 0 <= index < len(self.guidelines):
             removed = self.guidelines.pop(index)
-            self.save_guidelines()
             logger.info(f"Removed guideline: {removed.get('description', 'Unknown')}")
+            if self._pending is not None:
+                self._needs_rewrite = True
+                return True
+            self.save_guidelines()
             self.apply_guidelines()
             return True
         return False
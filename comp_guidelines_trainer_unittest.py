@@ -0,0 +1,190 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from config import runtime_policy
+from unittest_helpers import make_property
+
+
+class _TrainerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        from comp_analyzer import CompAnalyzer
+        from comp_guidelines_trainer import CompGuidelinesTrainer
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        # apply_guidelines retunes the global comp limits; restore them afterwards
+        for name in ("max_comp_distance_miles", "max_comp_age_days"):
+            patcher = patch.object(runtime_policy, name, getattr(runtime_policy, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.trainer = CompGuidelinesTrainer(CompAnalyzer())
+        self.trainer.guidelines_file = Path(tmpdir.name) / "comp_guidelines.ndjson"
+        self.trainer.guidelines = []
+
+
+class TestAddInstructionText(_TrainerTestCase):
+    def test_parses_criteria_and_priority(self) -> None:
+        cases = [
+            (
+                "Comparables must be within 1.5 miles and sold within 6 months",
+                {"max_distance_miles": 1.5, "max_age_months": 6},
+                2.0,
+            ),
+            (
+                "Prefer properties with similar lot sizes (within 20%)",
+                {"lot_size_tolerance_percent": 20.0},
+                1.5,
+            ),
+            (
+                "Bedrooms within 1, bathrooms can vary by 0.5",
+                {"bedrooms_tolerance": 1, "bathrooms_tolerance": 0.5},
+                1.0,
+            ),
+            (
+                "Price should be within 15% of subject property",
+                {"price_tolerance_percent": 15.0},
+                1.5,
+            ),
+        ]
+        for text, criteria, priority in cases:
+            self.assertTrue(self.trainer.add_instruction_text(text))
+            guideline = self.trainer.guidelines[-1]
+            self.assertEqual(guideline["criteria"], criteria)
+            self.assertEqual(guideline["priority"], priority)
+
+        self.assertFalse(self.trainer.add_instruction_text("Pick good comps"))
+        self.assertEqual(len(self.trainer.guidelines), len(cases))
+
+    def test_repeated_instruction_gets_independent_criteria(self) -> None:
+        text = "Comparables must be within 2 miles"
+        self.assertTrue(self.trainer.add_instruction_text(text))
+        self.trainer.guidelines[-1]["criteria"]["max_distance_miles"] = 9.0
+
+        self.assertTrue(self.trainer.add_instruction_text(text.upper()))
+
+        self.assertEqual(self.trainer.guidelines[-1]["criteria"], {"max_distance_miles": 2.0})
+
+
+class TestGuidelineStorage(_TrainerTestCase):
+    def test_add_appends_and_reload_round_trips(self) -> None:
+        from comp_guidelines_trainer import CompGuidelinesTrainer
+
+        self.trainer.add_guideline("near", {"max_distance_miles": 1.0}, priority=2.0)
+        self.trainer.add_guideline("beds", {"bedrooms_exact_match": True})
+        lines = self.trainer.guidelines_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+
+        self.assertTrue(self.trainer.remove_guideline(0))
+        reloaded = CompGuidelinesTrainer.__new__(CompGuidelinesTrainer)
+        reloaded.guidelines_file = self.trainer.guidelines_file
+        reloaded.load_guidelines()
+        self.assertEqual(reloaded.guidelines, self.trainer.guidelines)
+        self.assertEqual(reloaded.guidelines[0]["description"], "beds")
+
+    def test_bulk_update_saves_and_applies_once(self) -> None:
+        with patch.object(
+            self.trainer, "_append_guidelines", wraps=self.trainer._append_guidelines
+        ) as append, patch.object(
+            self.trainer, "apply_guidelines", wraps=self.trainer.apply_guidelines
+        ) as apply:
+            self.trainer.add_guidelines_batch([
+                ("near", {"max_distance_miles": 1.0}, 2.0),
+                ("beds", {"bedrooms_exact_match": True}, 2.0),
+            ])
+            with self.trainer.bulk_update():
+                self.trainer.add_instruction_text("Price must be within 10% of subject")
+                self.assertIsNone(self.trainer._constraints.price_tolerance_percent)
+
+        self.assertEqual(append.call_count, 2)
+        self.assertEqual(apply.call_count, 2)
+        self.assertEqual(self.trainer._constraints.price_tolerance_percent, 10.0)
+        lines = self.trainer.guidelines_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_legacy_json_array_is_migrated(self) -> None:
+        import json
+
+        legacy_file = self.trainer.guidelines_file.with_suffix(".json")
+        legacy = [{"description": "near", "criteria": {"max_distance_miles": 1.0}, "priority": 2.0}]
+        legacy_file.write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+
+        self.trainer.load_guidelines()
+
+        self.assertEqual(self.trainer.guidelines, legacy)
+        lines = self.trainer.guidelines_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], legacy)
+
+
+class TestApplyGuidelines(_TrainerTestCase):
+    def test_settings_follow_guidelines_in_order(self) -> None:
+        runtime_policy.max_comp_distance_miles = 5.0
+        runtime_policy.max_comp_age_days = 180
+        with self.trainer.bulk_update():
+            self.trainer.add_guideline("soft", {"max_distance_miles": 1.0, "max_age_months": 3})
+            self.trainer.add_guideline("must", {"max_distance_miles": 2.0}, priority=2.0)
+            self.trainer.add_guideline("looser", {"max_distance_miles": 3.0, "max_age_months": 9})
+
+        self.assertEqual(runtime_policy.max_comp_distance_miles, 2.0)
+        self.assertEqual(runtime_policy.max_comp_age_days, 90)
+
+class TestFilterByGuidelines(_TrainerTestCase):
+    def test_only_must_pass_guidelines_reject(self) -> None:
+        subject = make_property(
+            "S", latitude=33.40, longitude=-111.80, bedrooms=3, bathrooms=2.0,
+            lot_size_sqft=6000, list_price=400000.0,
+        )
+        candidates = [
+            make_property("NEAR", latitude=33.405, longitude=-111.80, bedrooms=3),
+            make_property("FAR", latitude=33.45, longitude=-111.80, bedrooms=3),
+            make_property("NO_COORDS", bedrooms=3, bathrooms=2.0),
+            make_property("BEDS", latitude=33.40, longitude=-111.80, bedrooms=5),
+            make_property("PRICE", bedrooms=3, sold_price=500000.0),
+            make_property("LOT", bedrooms=3, lot_size_sqft=9000),
+            make_property("BATHS", bedrooms=3, bathrooms=3.0),
+        ]
+        self.trainer.add_guideline("near", {"max_distance_miles": 1.0}, priority=2.0)
+        self.trainer.add_guideline(
+            "beds", {"bedrooms_exact_match": False, "bedrooms_tolerance": 1}, priority=2.0
+        )
+        self.trainer.add_guideline(
+            "price and lot", {"price_tolerance_percent": 10.0, "lot_size_tolerance_percent": 20.0},
+            priority=3.0,
+        )
+        self.trainer.add_guideline("baths", {"bathrooms_exact_match": True}, priority=1.5)
+
+        filtered = self.trainer.filter_by_guidelines(subject, candidates)
+
+        self.assertEqual(
+            [c.mls_number for c in filtered], ["NEAR", "NO_COORDS", "BATHS"]
+        )
+
+    def test_soft_guidelines_only_skip_filtering(self) -> None:
+        subject = make_property("S", latitude=33.40, longitude=-111.80, bedrooms=3)
+        candidates = [make_property("FAR", latitude=34.40, longitude=-111.80, bedrooms=5)]
+        self.trainer.add_guideline("near", {"max_distance_miles": 1.0}, priority=1.5)
+
+        self.assertIs(self.trainer.filter_by_guidelines(subject, candidates), candidates)
+
+    def test_constraints_keep_strictest_must_pass_limits(self) -> None:
+        from comp_guidelines_trainer import EffectiveConstraints
+
+        constraints = EffectiveConstraints.from_guidelines([
+            {"criteria": {"max_distance_miles": 2.0, "bedrooms_tolerance": 2}, "priority": 2.0},
+            {"criteria": {"max_distance_miles": 1.0, "bedrooms_exact_match": True}, "priority": 3.0},
+            {"criteria": {"max_distance_miles": 0.5, "price_tolerance_percent": 5.0}},
+            {"criteria": {"bathrooms_exact_match": False, "bathrooms_tolerance": 1.0}, "priority": 2.0},
+        ])
+
+        self.assertEqual(constraints.max_distance_miles, 1.0)
+        self.assertTrue(constraints.bedrooms_exact_match)
+        self.assertEqual(constraints.bedrooms_tolerance, 2)
+        self.assertFalse(constraints.bathrooms_exact_match)
+        self.assertEqual(constraints.bathrooms_tolerance, 1.0)
+        self.assertIsNone(constraints.price_tolerance_percent)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 """Compare data extraction from ATTOM vs Oxylabs for the same property."""
 import os
+import traceback
 from dotenv import load_dotenv
 from bot import MLSCompBot
 from attom_connector import ATTOMConnector
@@ -16,10 +17,44 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# (display name, Property attribute) for every field compared between sources
+_FIELDS = (
+    ("Bedrooms", "bedrooms"),
+    ("Bathrooms", "bathrooms"),
+    ("Bathrooms Full", "bathrooms_full"),
+    ("Bathrooms Half", "bathrooms_half"),
+    ("Total Rooms", "total_rooms"),
+    ("Square Feet", "square_feet"),
+    ("Lot Size (sqft)", "lot_size_sqft"),
+    ("Lot Size (acres)", "lot_size_acres"),
+    ("Year Built", "year_built"),
+    ("Stories", "stories"),
+    ("Parking Spaces", "parking_spaces"),
+    ("Garage Type", "garage_type"),
+    ("Heating Type", "heating_type"),
+    ("Cooling Type", "cooling_type"),
+    ("Roof Material", "roof_material"),
+    ("Architectural Style", "architectural_style"),
+    ("Condition", "condition"),
+    ("Amenities", "amenities"),
+    ("Exterior Features", "exterior_features"),
+    ("Recent Upgrades", "recent_upgrades"),
+    ("Renovation Year", "renovation_year"),
+    ("School District", "school_district"),
+    ("List Price", "list_price"),
+    ("Sold Price", "sold_price"),
+    ("Price per SqFt", "price_per_sqft"),
+    ("Sold Date", "sold_date"),
+)
+
+
+def _snapshot(prop) -> dict:
+    """Field values of a property, keyed by display name."""
+    return {name: getattr(prop, attr, None) for name, attr in _FIELDS}
+
+
 def compare_sources(address: str, city: str, state: str, zip_code: str):
     """Compare data extraction from ATTOM vs Oxylabs."""
-    import sys
-    
     print("=" * 80, flush=True)
     print("DATA SOURCE COMPARISON", flush=True)
     print("=" * 80, flush=True)
@@ -40,34 +75,7 @@ def compare_sources(address: str, city: str, state: str, zip_code: str):
         attom_prop = attom.get_property_by_address(address, city, state, zip_code)
         
         if attom_prop:
-            attom_data = {
-                "Bedrooms": attom_prop.bedrooms,
-                "Bathrooms": attom_prop.bathrooms,
-                "Bathrooms Full": attom_prop.bathrooms_full,
-                "Bathrooms Half": attom_prop.bathrooms_half,
-                "Total Rooms": attom_prop.total_rooms,
-                "Square Feet": attom_prop.square_feet,
-                "Lot Size (sqft)": attom_prop.lot_size_sqft,
-                "Lot Size (acres)": attom_prop.lot_size_acres,
-                "Year Built": attom_prop.year_built,
-                "Stories": attom_prop.stories,
-                "Parking Spaces": attom_prop.parking_spaces,
-                "Garage Type": attom_prop.garage_type,
-                "Heating Type": attom_prop.heating_type,
-                "Cooling Type": attom_prop.cooling_type,
-                "Roof Material": attom_prop.roof_material,
-                "Architectural Style": attom_prop.architectural_style,
-                "Condition": attom_prop.condition,
-                "Amenities": attom_prop.amenities,
-                "Exterior Features": attom_prop.exterior_features,
-                "Recent Upgrades": attom_prop.recent_upgrades,
-                "Renovation Year": attom_prop.renovation_year,
-                "School District": attom_prop.school_district,
-                "List Price": attom_prop.list_price,
-                "Sold Price": attom_prop.sold_price,
-                "Price per SqFt": attom_prop.price_per_sqft,
-                "Sold Date": attom_prop.sold_date,
-            }
+            attom_data = _snapshot(attom_prop)
             
             for key, value in attom_data.items():
                 if value is not None and value != "" and value != []:
@@ -76,7 +84,6 @@ def compare_sources(address: str, city: str, state: str, zip_code: str):
             print("  ❌ No data returned from ATTOM")
     except Exception as e:
         print(f"  ❌ Error: {e}")
-        import traceback
         traceback.print_exc()
     
     print()
@@ -100,34 +107,7 @@ def compare_sources(address: str, city: str, state: str, zip_code: str):
             oxylabs_prop = oxylabs.get_property_by_address(address, city, state, zip_code)
             
             if oxylabs_prop:
-                oxylabs_data = {
-                    "Bedrooms": oxylabs_prop.bedrooms,
-                    "Bathrooms": oxylabs_prop.bathrooms,
-                    "Bathrooms Full": oxylabs_prop.bathrooms_full,
-                    "Bathrooms Half": oxylabs_prop.bathrooms_half,
-                    "Total Rooms": oxylabs_prop.total_rooms,
-                    "Square Feet": oxylabs_prop.square_feet,
-                    "Lot Size (sqft)": oxylabs_prop.lot_size_sqft,
-                    "Lot Size (acres)": oxylabs_prop.lot_size_acres,
-                    "Year Built": oxylabs_prop.year_built,
-                    "Stories": oxylabs_prop.stories,
-                    "Parking Spaces": oxylabs_prop.parking_spaces,
-                    "Garage Type": oxylabs_prop.garage_type,
-                    "Heating Type": oxylabs_prop.heating_type,
-                    "Cooling Type": oxylabs_prop.cooling_type,
-                    "Roof Material": oxylabs_prop.roof_material,
-                    "Architectural Style": oxylabs_prop.architectural_style,
-                    "Condition": oxylabs_prop.condition,
-                    "Amenities": oxylabs_prop.amenities,
-                    "Exterior Features": oxylabs_prop.exterior_features,
-                    "Recent Upgrades": oxylabs_prop.recent_upgrades,
-                    "Renovation Year": oxylabs_prop.renovation_year,
-                    "School District": oxylabs_prop.school_district,
-                    "List Price": oxylabs_prop.list_price,
-                    "Sold Price": oxylabs_prop.sold_price,
-                    "Price per SqFt": oxylabs_prop.price_per_sqft,
-                    "Sold Date": oxylabs_prop.sold_date,
-                }
+                oxylabs_data = _snapshot(oxylabs_prop)
                 
                 for key, value in oxylabs_data.items():
                     if value is not None and value != "" and value != []:
@@ -136,7 +116,6 @@ def compare_sources(address: str, city: str, state: str, zip_code: str):
                 print("  ❌ No data returned from Oxylabs")
     except Exception as e:
         print(f"  ❌ Error: {e}")
-        import traceback
         traceback.print_exc()
     
     print()
@@ -146,53 +125,50 @@ def compare_sources(address: str, city: str, state: str, zip_code: str):
     print("COMPARISON SUMMARY")
     print("=" * 80)
     
-    all_fields = set(list(attom_data.keys()) + list(oxylabs_data.keys()))
-    
-    print("\nFields where ATTOM has data but Oxylabs doesn't:")
+    # Sort every field into exactly one bucket in a single pass (empty strings,
+    # empty lists and None all count as no data)
     attom_only = []
-    for field in all_fields:
+    oxylabs_only = []
+    both_have = []
+    missing_both = []
+    for field, _ in _FIELDS:
         attom_val = attom_data.get(field)
         oxylabs_val = oxylabs_data.get(field)
-        if attom_val and (not oxylabs_val or oxylabs_val == "" or oxylabs_val == []):
+        if attom_val and oxylabs_val:
+            both_have.append(field)
+        elif attom_val:
             attom_only.append(field)
-            print(f"  ✓ {field:30} ATTOM: {attom_val}")
+        elif oxylabs_val:
+            oxylabs_only.append(field)
+        else:
+            missing_both.append(field)
     
+    print("\nFields where ATTOM has data but Oxylabs doesn't:")
+    for field in attom_only:
+        print(f"  ✓ {field:30} ATTOM: {attom_data[field]}")
     if not attom_only:
         print("  (none)")
     
     print("\nFields where Oxylabs has data but ATTOM doesn't:")
-    oxylabs_only = []
-    for field in all_fields:
-        attom_val = attom_data.get(field)
-        oxylabs_val = oxylabs_data.get(field)
-        if oxylabs_val and (not attom_val or attom_val == "" or attom_val == []):
-            oxylabs_only.append(field)
-            print(f"  ✓ {field:30} Oxylabs: {oxylabs_val}")
-    
+    for field in oxylabs_only:
+        print(f"  ✓ {field:30} Oxylabs: {oxylabs_data[field]}")
     if not oxylabs_only:
         print("  (none)")
     
     print("\nFields where both have data (comparing values):")
-    both_have = []
-    for field in all_fields:
-        attom_val = attom_data.get(field)
-        oxylabs_val = oxylabs_data.get(field)
-        if attom_val and oxylabs_val:
-            both_have.append(field)
-            match = "✓" if str(attom_val) == str(oxylabs_val) else "⚠"
-            print(f"  {match} {field:30} ATTOM: {attom_val:20} | Oxylabs: {oxylabs_val}")
-    
+    # Count agreements here so the recommendations don't compare again
+    matches = 0
+    for field in both_have:
+        attom_val = attom_data[field]
+        oxylabs_val = oxylabs_data[field]
+        agree = str(attom_val) == str(oxylabs_val)
+        matches += agree
+        match = "✓" if agree else "⚠"
+        print(f"  {match} {field:30} ATTOM: {attom_val:20} | Oxylabs: {oxylabs_val}")
     if not both_have:
         print("  (none)")
     
     print("\nFields missing from both:")
-    missing_both = []
-    for field in all_fields:
-        attom_val = attom_data.get(field)
-        oxylabs_val = oxylabs_data.get(field)
-        if (not attom_val or attom_val == "" or attom_val == []) and (not oxylabs_val or oxylabs_val == "" or oxylabs_val == []):
-            missing_both.append(field)
-    
     if missing_both:
         for field in missing_both:
             print(f"  ✗ {field}")
@@ -209,7 +185,6 @@ def compare_sources(address: str, city: str, state: str, zip_code: str):
     if oxylabs_only:
         print(f"\n✓ Oxylabs provides {len(oxylabs_only)} unique fields: {', '.join(oxylabs_only[:5])}")
     if both_have:
-        matches = sum(1 for f in both_have if str(attom_data.get(f)) == str(oxylabs_data.get(f)))
         print(f"\n✓ Both sources agree on {matches}/{len(both_have)} fields")
     
     print("\n💡 Best Strategy:")
@@ -1,5 +1,6 @@
 """Configuration management for MLS Comp Bot."""
 
+from dataclasses import dataclass
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Literal
 import os
@@ -14,6 +15,9 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        # Loaded once from the environment; nothing re-validates on assignment
+        frozen=False,
+        validate_assignment=False,
     )
 
     # ATTOM API (only option now)
@@ -48,7 +52,10 @@ class Settings(BaseSettings):
     # Official search endpoint uses q= query
     maricopa_assessor_search_path: str = "/search/property/"
     maricopa_assessor_address_param: str = "q"
-    maricopa_assessor_timeout_seconds: int = 30
+    maricopa_assessor_timeout_seconds: int = 30  # read timeout
+    maricopa_assessor_connect_timeout: float = 3.05
+    # Keep the full search + parcel JSON in mls_data["raw"] (debugging only; can be tens of KB)
+    maricopa_assessor_store_raw: bool = False
 
     # Broker/Agent Branding for Reports
     broker_name: str = "Dallas Wormley"
@@ -81,7 +88,33 @@ class Settings(BaseSettings):
     max_comp_distance_miles: float = 5.0
     max_comp_age_days: int = 180
     max_comps_to_return: int = 10
+    # Directory for the persistent Parquet learning log (empty = in-memory only)
+    learning_data_dir: str = ""
+    # Retrain the learning model after this many pieces of user feedback
+    retrain_interval: int = 10
+    # Skip ATTOM enrichment of comps when every top comp scores at least this
+    # (set above 1.0 to always enrich)
+    enrichment_early_exit_threshold: float = 0.85
+
+
+@dataclass
+class RuntimePolicy:
+    """Comp limits retuned at runtime by the guidelines trainer.
+
+    Seeded from the environment-loaded settings and then owned by the running
+    process, so guideline updates are plain attribute writes rather than
+    changes to the validated Settings object.
+    """
+
+    max_comp_distance_miles: float = 5.0
+    max_comp_age_days: int = 180
 
 
 # Global settings instance
 settings = Settings()
+
+# Runtime-tunable comp limits, starting from the configured values
+runtime_policy = RuntimePolicy(
+    max_comp_distance_miles=settings.max_comp_distance_miles,
+    max_comp_age_days=settings.max_comp_age_days,
+)
@@ -1,6 +1,8 @@
 """Debug what Oxylabs is actually extracting."""
+import io
 import os
 import sys
+import textwrap
 from dotenv import load_dotenv
 from bot import MLSCompBot
 
@@ -32,52 +34,56 @@ try:
     
     if result:
         subject = result.subject_property
-        print("\n" + "=" * 80)
-        print("SUBJECT PROPERTY DATA")
-        print("=" * 80)
-        print(f"Bedrooms: {subject.bedrooms}")
-        print(f"Bathrooms: {subject.bathrooms}")
-        print(f"Cooling: {subject.cooling_type}")
-        print(f"Roof: {subject.roof_material}")
-        print(f"Amenities: {subject.amenities}")
-        print(f"Amenities count: {len(subject.amenities) if subject.amenities else 0}")
-        print(f"\nMLS Data (Oxylabs metadata):")
+        # Build the report in memory and write it out in one go
+        out = io.StringIO()
+        print("\n" + "=" * 80, file=out)
+        print("SUBJECT PROPERTY DATA", file=out)
+        print("=" * 80, file=out)
+        print(f"Bedrooms: {subject.bedrooms}", file=out)
+        print(f"Bathrooms: {subject.bathrooms}", file=out)
+        print(f"Cooling: {subject.cooling_type}", file=out)
+        print(f"Roof: {subject.roof_material}", file=out)
+        print(f"Amenities: {subject.amenities}", file=out)
+        print(f"Amenities count: {len(subject.amenities) if subject.amenities else 0}", file=out)
+        print(f"\nMLS Data (Oxylabs metadata):", file=out)
         if subject.mls_data:
             for key, value in subject.mls_data.items():
                 if key == 'source':
-                    print(f"  Source: {value}")
+                    print(f"  Source: {value}", file=out)
                 elif key == 'days_on_market':
-                    print(f"  Days on Market: {value}")
+                    print(f"  Days on Market: {value}", file=out)
                 elif key == 'property_description':
                     if value:
-                        desc_preview = value[:200] + "..." if len(value) > 200 else value
-                        print(f"  Property Description: {desc_preview}")
+                        desc_preview = textwrap.shorten(value, width=200, placeholder="...")
+                        print(f"  Property Description: {desc_preview}", file=out)
                 elif key == 'interior_features':
-                    print(f"  Interior Features: {value}")
+                    print(f"  Interior Features: {value}", file=out)
                 elif key == 'exterior_features':
-                    print(f"  Exterior Features: {value}")
+                    print(f"  Exterior Features: {value}", file=out)
         else:
-            print("  No MLS data")
+            print("  No MLS data", file=out)
         
-        print("\n" + "=" * 80)
-        print("ANALYSIS")
-        print("=" * 80)
+        print("\n" + "=" * 80, file=out)
+        print("ANALYSIS", file=out)
+        print("=" * 80, file=out)
         
         if subject.mls_data and subject.mls_data.get('source') == 'oxylabs_redfin':
-            print("[OK] Data came from Oxylabs (Redfin)")
+            print("[OK] Data came from Oxylabs (Redfin)", file=out)
             if subject.mls_data.get('days_on_market'):
-                print("[OK] Days on Market extracted")
+                print("[OK] Days on Market extracted", file=out)
             if subject.mls_data.get('property_description'):
-                print("[OK] Property description extracted")
+                print("[OK] Property description extracted", file=out)
             if len(subject.amenities) > 1:
-                print(f"[OK] Enhanced amenities extracted ({len(subject.amenities)} items)")
+                print(f"[OK] Enhanced amenities extracted ({len(subject.amenities)} items)", file=out)
             else:
-                print("[WARN] Only basic amenities found")
+                print("[WARN] Only basic amenities found", file=out)
         elif subject.mls_data and subject.mls_data.get('source') == 'oxylabs_zillow':
-            print("[OK] Data came from Oxylabs (Zillow)")
+            print("[OK] Data came from Oxylabs (Zillow)", file=out)
         else:
-            print("[WARN] Data did NOT come from Oxylabs")
-            print(f"  Source: {subject.mls_data.get('source') if subject.mls_data else 'Unknown'}")
+            print("[WARN] Data did NOT come from Oxylabs", file=out)
+            print(f"  Source: {subject.mls_data.get('source') if subject.mls_data else 'Unknown'}", file=out)
+        
+        sys.stdout.write(out.getvalue())
         
     else:
         print("[FAIL] No results returned")
@@ -11,7 +11,6 @@ Usage:
 from dotenv import load_dotenv
 
 from config import settings
-from alternative_apis import PropertyRadarConnector
 
 
 def main() -> int:
@@ -24,6 +23,9 @@ def main() -> int:
         print("PROPERTYRADAR_API_KEY is missing. Add it to your .env.")
         return 2
 
+    # Imported only once the checks pass, so a disabled run skips loading the connectors
+    from alternative_apis import PropertyRadarConnector
+
     # Replace with a property you know PropertyRadar should have
     address = "3644 E CONSTITUTION DR"
     city = "GILBERT"
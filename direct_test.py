@@ -1,29 +1,29 @@
 """Direct test with explicit output."""
 import sys
 
-# Force unbuffered output
+# Flush on every newline, so progress shows up without flush=True on each print
 sys.stdout.reconfigure(line_buffering=True)
 sys.stderr.reconfigure(line_buffering=True)
 
-print("Starting ATTOM Comp Bot Test...", flush=True)
-print("=" * 60, flush=True)
+print("Starting ATTOM Comp Bot Test...")
+print("=" * 60)
 
 try:
-    print("\n1. Loading configuration...", flush=True)
+    print("\n1. Loading configuration...")
     from config import settings
-    print(f"   Using ATTOM API", flush=True)
-    print(f"   API Key: {settings.attom_api_key[:15]}..." if settings.attom_api_key else "   API Key: NOT SET", flush=True)
+    print(f"   Using ATTOM API")
+    print(f"   API Key: {settings.attom_api_key[:15]}..." if settings.attom_api_key else "   API Key: NOT SET")
     
-    print("\n2. Creating bot...", flush=True)
+    print("\n2. Creating bot...")
     from bot import MLSCompBot
     bot = MLSCompBot()
-    print("   Bot created successfully", flush=True)
+    print("   Bot created successfully")
     
-    print("\n3. Connecting to ATTOM API...", flush=True)
+    print("\n3. Connecting to ATTOM API...")
     if bot.connect():
-        print("   ✓ Connected!", flush=True)
+        print("   ✓ Connected!")
         
-        print("\n4. Looking up property: 1342 E. Kramer Circle, Mesa, AZ 85203", flush=True)
+        print("\n4. Looking up property: 1342 E. Kramer Circle, Mesa, AZ 85203")
         result = bot.find_comps_for_property(
             address="1342 E. Kramer Circle",
             city="Mesa",
@@ -32,54 +32,56 @@ try:
         )
         
         if result:
-            print(f"\n   ✓ SUCCESS! Found comp analysis", flush=True)
-            print(f"\n   Subject Property:", flush=True)
-            print(f"     Address: {result.subject_property.address}", flush=True)
-            print(f"     City: {result.subject_property.city}, {result.subject_property.state}", flush=True)
-            print(f"     Bedrooms: {result.subject_property.bedrooms or 'N/A'}", flush=True)
-            print(f"     Bathrooms: {result.subject_property.bathrooms or 'N/A'}", flush=True)
-            print(f"     Square Feet: {result.subject_property.square_feet or 'N/A'}", flush=True)
+            print(f"\n   ✓ SUCCESS! Found comp analysis")
+            print(f"\n   Subject Property:")
+            print(f"     Address: {result.subject_property.address}")
+            print(f"     City: {result.subject_property.city}, {result.subject_property.state}")
+            print(f"     Bedrooms: {result.subject_property.bedrooms or 'N/A'}")
+            print(f"     Bathrooms: {result.subject_property.bathrooms or 'N/A'}")
+            print(f"     Square Feet: {result.subject_property.square_feet or 'N/A'}")
             
-            print(f"\n   Found {len(result.comparable_properties)} Comparable Properties", flush=True)
-            print(f"   Confidence Score: {result.confidence_score:.2%}", flush=True)
+            print(f"\n   Found {len(result.comparable_properties)} Comparable Properties")
+            print(f"   Confidence Score: {result.confidence_score:.2%}")
             
             if result.estimated_value:
-                print(f"   Estimated Value: ${result.estimated_value:,.0f}", flush=True)
+                print(f"   Estimated Value: ${result.estimated_value:,.0f}")
             if result.average_price:
-                print(f"   Average Comp Price: ${result.average_price:,.0f}", flush=True)
+                print(f"   Average Comp Price: ${result.average_price:,.0f}")
             if result.average_price_per_sqft:
-                print(f"   Avg Price/SqFt: ${result.average_price_per_sqft:,.2f}", flush=True)
+                print(f"   Avg Price/SqFt: ${result.average_price_per_sqft:,.2f}")
             
             if result.comparable_properties:
-                print(f"\n   Top Comparables:", flush=True)
+                # Collect the comp listing and write it in one call
+                out = ["\n   Top Comparables:"]
                 for i, comp in enumerate(result.comparable_properties[:3], 1):
                     prop = comp.property
-                    print(f"\n   {i}. {prop.address}", flush=True)
-                    print(f"      Score: {comp.similarity_score:.2%}", flush=True)
+                    out.append(f"\n   {i}. {prop.address}")
+                    out.append(f"      Score: {comp.similarity_score:.2%}")
                     if comp.distance_miles:
-                        print(f"      Distance: {comp.distance_miles:.2f} miles", flush=True)
+                        out.append(f"      Distance: {comp.distance_miles:.2f} miles")
                     if prop.sold_price:
-                        print(f"      Sold: ${prop.sold_price:,.0f}", flush=True)
+                        out.append(f"      Sold: ${prop.sold_price:,.0f}")
                         if prop.sold_date:
-                            print(f"      Date: {prop.sold_date.strftime('%Y-%m-%d')}", flush=True)
+                            out.append(f"      Date: {prop.sold_date.date().isoformat()}")
+                sys.stdout.write("\n".join(out) + "\n")
         else:
-            print("\n   ✗ No comps found", flush=True)
+            print("\n   ✗ No comps found")
         
-        print("\n5. Disconnecting...", flush=True)
+        print("\n5. Disconnecting...")
         bot.disconnect()
-        print("   ✓ Disconnected", flush=True)
+        print("   ✓ Disconnected")
     else:
-        print("   ✗ Failed to connect", flush=True)
-        print("   Check your ATTOM API key in .env file", flush=True)
+        print("   ✗ Failed to connect")
+        print("   Check your ATTOM API key in .env file")
         
 except ImportError as e:
-    print(f"\n✗ Import Error: {e}", flush=True)
+    print(f"\n✗ Import Error: {e}")
     import traceback
     traceback.print_exc()
 except Exception as e:
-    print(f"\n✗ Error: {e}", flush=True)
+    print(f"\n✗ Error: {e}")
     import traceback
     traceback.print_exc()
 
-print("\n" + "=" * 60, flush=True)
-print("Test Complete!", flush=True)
+print("\n" + "=" * 60)
+print("Test Complete!")
@@ -2,10 +2,10 @@
 
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import NoReturn
 
 from bot import MLSCompBot
-from report_generator import ReportGenerator
 
 ADDRESS = "3644 E CONSTITUTION DR"
 CITY = "GILBERT"
@@ -16,44 +16,55 @@ MAX_COMPS = 5
 logger = logging.getLogger(__name__)
 
 
+def _load_report_generator():
+    # Imports matplotlib and the report templates; done off the main thread
+    from report_generator import ReportGenerator
+
+    return ReportGenerator()
+
+
 def main() -> NoReturn:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    bot = MLSCompBot()
-    if not bot.connect():
-        logger.error("ATTOM connection failed. Check credentials/config.")
-        sys.exit(1)
+    # Load the report generator while the network-bound connect and comp
+    # lookup run. Reports are still rendered one after the other below, since
+    # pyplot is not thread-safe.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report_generator = executor.submit(_load_report_generator)
 
-    try:
-        comp_result = bot.find_comps_for_property(
-            address=ADDRESS,
-            city=CITY,
-            state=STATE,
-            zip_code=ZIP_CODE,
-            max_comps=MAX_COMPS,
-        )
-    except Exception as exc:  # pragma: no cover - operational script
-        logger.error(f"Failed to fetch comps: {exc}", exc_info=True)
-        sys.exit(1)
+        bot = MLSCompBot()
+        if not bot.connect():
+            logger.error("ATTOM connection failed. Check credentials/config.")
+            sys.exit(1)
 
-    if not comp_result:
-        logger.error("No comps returned.")
-        sys.exit(1)
+        try:
+            comp_result = bot.find_comps_for_property(
+                address=ADDRESS,
+                city=CITY,
+                state=STATE,
+                zip_code=ZIP_CODE,
+                max_comps=MAX_COMPS,
+            )
+        except Exception as exc:  # pragma: no cover - operational script
+            logger.error(f"Failed to fetch comps: {exc}", exc_info=True)
+            sys.exit(1)
+
+        if not comp_result:
+            logger.error("No comps returned.")
+            sys.exit(1)
 
-    rg = ReportGenerator()
     try:
-        html_path = rg.save_report(comp_result, format="html")
-        md_path = rg.save_report(comp_result, format="markdown")
+        paths = report_generator.result().save_reports(comp_result, ["html", "markdown"])
     except Exception as exc:  # pragma: no cover - operational script
         logger.error(f"Failed to save report: {exc}", exc_info=True)
         sys.exit(1)
 
     logger.info("Report generation complete.")
-    print(f"HTML report: {html_path}")
-    print(f"Markdown report: {md_path}")
+    print(f"HTML report: {paths['html']}")
+    print(f"Markdown report: {paths['markdown']}")
 
 
 if __name__ == "__main__":
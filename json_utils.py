@@ -0,0 +1,31 @@
+"""JSON encode/decode helpers that use orjson when it is installed."""
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON document (bytes or str)."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def dumps_line(
+    obj: Any, default: Optional[Callable[[Any], Any]] = None, indent: bool = False
+) -> bytes:
+    """Encode obj as UTF-8 JSON followed by a newline.
+
+    default is called for values neither encoder handles natively. orjson also
+    encodes datetimes and numpy values itself, so default only has to produce
+    the same output for the stdlib fallback.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    return (json.dumps(obj, default=default, indent=2 if indent else None) + '\n').encode('utf-8')
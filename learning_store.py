@@ -0,0 +1,146 @@
+"""Append-only Parquet storage for comp selection learning data."""
+import atexit
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from models import CompProperty, Property
+
+logger = logging.getLogger(__name__)
+
+
+class LearningDataStore:
+    """Stores comp selections as flat columnar rows in Parquet part files.
+
+    Each recorded selection becomes one row per selected comp, holding the
+    numeric fields the trainer needs plus a JSON copy of the subject. Rows are
+    buffered in memory and written as a new part file every ``flush_every``
+    selections (and at process exit), so nothing is ever rewritten. User
+    feedback arrives after the fact and is appended to its own part files,
+    then joined onto the selections by subject MLS number when read.
+    """
+
+    SELECTIONS_DIR = "selections"
+    FEEDBACK_DIR = "feedback"
+
+    def __init__(self, path: str, flush_every: int = 50):
+        self.path = path
+        self.flush_every = flush_every
+        self._selection_rows: List[Dict[str, Any]] = []
+        self._feedback_rows: List[Dict[str, Any]] = []
+        self._pending_selections = 0
+        self._part_counter = 0
+
+        os.makedirs(os.path.join(path, self.SELECTIONS_DIR), exist_ok=True)
+        os.makedirs(os.path.join(path, self.FEEDBACK_DIR), exist_ok=True)
+        atexit.register(self.flush)
+
+    def append(
+        self,
+        subject: Property,
+        selected_comps: List[CompProperty],
+        user_feedback: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ):
+        """Buffer one comp selection, flushing to disk every flush_every selections."""
+        timestamp = timestamp or datetime.now()
+        subject_json = subject.model_dump_json()
+        for comp_prop in selected_comps:
+            comp = comp_prop.property
+            self._selection_rows.append({
+                'subject_mls_number': subject.mls_number,
+                'comp_mls_number': comp.mls_number,
+                'timestamp': timestamp,
+                'user_feedback': user_feedback,
+                'similarity_score': comp_prop.similarity_score,
+                'distance_miles': comp_prop.distance_miles,
+                'subject_square_feet': subject.square_feet,
+                'comp_square_feet': comp.square_feet,
+                'subject_list_price': subject.list_price,
+                'comp_price': comp.sold_price or comp.list_price,
+                'subject_bedrooms': subject.bedrooms,
+                'comp_bedrooms': comp.bedrooms,
+                'subject_bathrooms': subject.bathrooms,
+                'comp_bathrooms': comp.bathrooms,
+                'subject_year_built': subject.year_built,
+                'comp_year_built': comp.year_built,
+                'property_type_match': subject.property_type == comp.property_type,
+                'subject_json': subject_json,
+            })
+
+        self._pending_selections += 1
+        if self._pending_selections >= self.flush_every:
+            self.flush()
+
+    def record_feedback(self, mls_number: str, rating: float, notes: Optional[str] = None):
+        """Buffer user feedback for a subject's most recent selection so far."""
+        self._feedback_rows.append({
+            'subject_mls_number': mls_number,
+            'rating': rating,
+            'notes': notes,
+            'timestamp': datetime.now(),
+        })
+
+    def flush(self):
+        """Write buffered rows as new Parquet part files."""
+        self._write_part(self.SELECTIONS_DIR, self._selection_rows)
+        self._write_part(self.FEEDBACK_DIR, self._feedback_rows)
+        self._selection_rows = []
+        self._feedback_rows = []
+        self._pending_selections = 0
+
+    def _write_part(self, subdir: str, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        self._part_counter += 1
+        filename = f"part-{datetime.now():%Y%m%d%H%M%S%f}-{os.getpid()}-{self._part_counter}.parquet"
+        try:
+            pd.DataFrame(rows).to_parquet(os.path.join(self.path, subdir, filename), index=False)
+        except Exception as e:
+            logger.warning(f"Failed to write learning data to {self.path}: {e}")
+
+    def _read_dir(self, subdir: str) -> pd.DataFrame:
+        directory = os.path.join(self.path, subdir)
+        parts = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.endswith(".parquet")
+        )
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat((pd.read_parquet(part) for part in parts), ignore_index=True)
+
+    def read(self) -> pd.DataFrame:
+        """Read all stored selections, with user feedback joined on.
+
+        Each rating applies to the subject's latest selection made before it, as
+        in the in-memory learning records; later selections stay unrated. When a
+        selection is rated more than once, the newest rating wins.
+        """
+        self.flush()
+        selections = self._read_dir(self.SELECTIONS_DIR)
+        if selections.empty:
+            return selections
+
+        feedback = self._read_dir(self.FEEDBACK_DIR)
+        if not feedback.empty:
+            keys = ['subject_mls_number', 'timestamp']
+            selection_times = selections[keys].drop_duplicates().sort_values('timestamp')
+            feedback = feedback.sort_values('timestamp', kind='stable').rename(
+                columns={'timestamp': 'rated_at'}
+            )
+            rated = pd.merge_asof(
+                feedback,
+                selection_times,
+                left_on='rated_at',
+                right_on='timestamp',
+                by='subject_mls_number',
+            ).dropna(subset=['timestamp'])
+            ratings = rated.groupby(keys)['rating'].last()
+            selections['user_feedback'] = selections['user_feedback'].fillna(
+                selections.join(ratings, on=keys)['rating']
+            )
+        return selections
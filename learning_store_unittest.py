@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+
+from models import CompProperty, PropertyType
+from unittest_helpers import make_property
+
+
+class TestLearningDataStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_append_flush_and_read_joins_feedback(self) -> None:
+        from learning_store import LearningDataStore
+
+        store = LearningDataStore(self.tmpdir.name, flush_every=1)
+        subject = make_property("S", square_feet=1800, list_price=400000.0)
+        comps = [
+            CompProperty(
+                property=make_property("C1", square_feet=1700, sold_price=390000.0),
+                similarity_score=0.8,
+                distance_miles=1.0,
+            ),
+            CompProperty(
+                property=make_property("C2", property_type=PropertyType.CONDO),
+                similarity_score=0.5,
+            ),
+        ]
+        store.append(subject, comps)
+        store.append(make_property("T"), comps[:1])
+        store.record_feedback("S", 0.5)
+        store.flush()
+
+        # A fresh store on the same directory sees everything written so far
+        table = LearningDataStore(self.tmpdir.name).read()
+
+        self.assertEqual(len(table), 3)
+        self.assertEqual(list(table["comp_mls_number"]), ["C1", "C2", "C1"])
+        self.assertEqual(list(table["user_feedback"].fillna(-1)), [0.5, 0.5, -1])
+        self.assertEqual(list(table["property_type_match"]), [True, False, True])
+
+    def test_feedback_rates_only_the_selection_before_it(self) -> None:
+        from datetime import datetime, timedelta
+
+        from learning_store import LearningDataStore
+
+        store = LearningDataStore(self.tmpdir.name)
+        comps = [CompProperty(property=make_property("C1"), similarity_score=0.8)]
+        now = datetime.now()
+        store.append(make_property("S"), comps, timestamp=now - timedelta(hours=2))
+        store.append(make_property("S"), comps, timestamp=now - timedelta(hours=1))
+        store.record_feedback("S", 0.1)
+        store.record_feedback("S", 0.3)
+        store.append(make_property("S"), comps, timestamp=now + timedelta(hours=1))
+
+        table = store.read()
+
+        self.assertEqual(list(table["user_feedback"].fillna(-1)), [-1, 0.3, -1])
+
+    def test_table_features_match_per_record_features(self) -> None:
+        from comp_analyzer import CompAnalyzer
+        from learning_store import LearningDataStore
+        from trainer import CompTrainer
+
+        subject = make_property(
+            "S",
+            square_feet=1800,
+            list_price=400000.0,
+            bedrooms=3,
+            bathrooms=2.0,
+            year_built=2001,
+            latitude=33.40,
+            longitude=-111.80,
+        )
+        comp_properties = [
+            make_property(
+                "C1",
+                square_feet=1650,
+                sold_price=385000.0,
+                bedrooms=4,
+                bathrooms=2.5,
+                year_built=1985,
+                latitude=33.41,
+                longitude=-111.81,
+            ),
+            make_property("C2", property_type=PropertyType.CONDO, list_price=350000.0),
+        ]
+        from comp_analyzer import _haversine_scalar
+
+        comps = [
+            CompProperty(
+                property=comp_properties[0],
+                similarity_score=0.8,
+                distance_miles=_haversine_scalar(33.40, -111.80, 33.41, -111.81),
+            ),
+            CompProperty(property=comp_properties[1], similarity_score=0.4),
+        ]
+        store = LearningDataStore(self.tmpdir.name)
+        store.append(subject, comps, user_feedback=0.5)
+
+        trainer = CompTrainer(CompAnalyzer())
+        X, y = trainer._extract_table_features(store.read())
+
+        for row, comp in zip(X, comps):
+            expected = trainer._extract_features(subject, comp.property)
+            for actual_value, expected_value in zip(row, expected):
+                self.assertAlmostEqual(actual_value, expected_value)
+        self.assertAlmostEqual(y[0], 0.4)
+        self.assertAlmostEqual(y[1], 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,48 @@
 """Command-line interface for MLS Comp Bot."""
 import argparse
-import json
 import sys
-from bot import MLSCompBot
-from config import settings
-from report_generator import ReportGenerator
+
+from json_utils import dumps_line
+
+# Header and subject block of print_comp_result, filled in with one format_map
+_SUBJECT_TEMPLATE = (
+    "\n" + "=" * 80 + "\n"
+    "COMPARABLE PROPERTY ANALYSIS\n"
+    + "=" * 80 + "\n"
+    "\n"
+    "Subject Property:\n"
+    "  Address: {address}, {city}, {state} {zip_code}\n"
+    "  MLS#: {mls_number}\n"
+    "  Type: {property_type}\n"
+    "  Bedrooms: {bedrooms}\n"
+    "  Bathrooms: {bathrooms}\n"
+    "  Square Feet: {square_feet}\n"
+    "  List Price: {list_price}\n"
+    "\n"
+    "Found {comp_count} Comparable Properties\n"
+    "Confidence Score: {confidence_score:.2%}\n"
+)
+
 
 def print_comp_result(result):
     """Pretty print comp results."""
-    print("\n" + "="*80)
-    print("COMPARABLE PROPERTY ANALYSIS")
-    print("="*80)
-    
     subject = result.subject_property
-    print(f"\nSubject Property:")
-    print(f"  Address: {subject.address}, {subject.city}, {subject.state} {subject.zip_code}")
-    print(f"  MLS#: {subject.mls_number}")
-    print(f"  Type: {subject.property_type.value}")
-    print(f"  Bedrooms: {subject.bedrooms or 'N/A'}")
-    print(f"  Bathrooms: {subject.bathrooms or 'N/A'}")
-    print(f"  Square Feet: {subject.square_feet:,}" if subject.square_feet else "  Square Feet: N/A")
-    print(f"  List Price: ${subject.list_price:,.0f}" if subject.list_price else "  List Price: N/A")
-    
-    print(f"\nFound {len(result.comparable_properties)} Comparable Properties")
-    print(f"Confidence Score: {result.confidence_score:.2%}")
+    sqft = subject.square_feet
+    list_price = subject.list_price
+    sys.stdout.write(_SUBJECT_TEMPLATE.format_map({
+        "address": subject.address,
+        "city": subject.city,
+        "state": subject.state,
+        "zip_code": subject.zip_code,
+        "mls_number": subject.mls_number,
+        "property_type": subject.property_type.value,
+        "bedrooms": subject.bedrooms or 'N/A',
+        "bathrooms": subject.bathrooms or 'N/A',
+        "square_feet": f"{sqft:,}" if sqft else "N/A",
+        "list_price": f"${list_price:,.0f}" if list_price else "N/A",
+        "comp_count": len(result.comparable_properties),
+        "confidence_score": result.confidence_score,
+    }))
     
     if result.average_price:
         print(f"\nAverage Comp Price: ${result.average_price:,.0f}")
@@ -41,24 +60,112 @@ def print_comp_result(result):
         print(f"\n{i}. {prop.address}, {prop.city}, {prop.state}")
         print(f"   MLS#: {prop.mls_number}")
         print(f"   Similarity Score: {comp.similarity_score:.2%}")
-        if comp.distance_miles:
-            print(f"   Distance: {comp.distance_miles:.2f} miles")
+        distance = comp.distance_miles
+        if distance:
+            print(f"   Distance: {distance:.2f} miles")
         print(f"   Bedrooms: {prop.bedrooms or 'N/A'}, Bathrooms: {prop.bathrooms or 'N/A'}")
-        print(f"   Square Feet: {prop.square_feet:,}" if prop.square_feet else "   Square Feet: N/A")
-        if prop.sold_price:
-            print(f"   Sold Price: ${prop.sold_price:,.0f}")
-            if prop.sold_date:
-                print(f"   Sold Date: {prop.sold_date.strftime('%Y-%m-%d')}")
+        sqft = prop.square_feet
+        print(f"   Square Feet: {sqft:,}" if sqft else "   Square Feet: N/A")
+        sold_price = prop.sold_price
+        if sold_price:
+            print(f"   Sold Price: ${sold_price:,.0f}")
+            sold_date = prop.sold_date
+            if sold_date:
+                print(f"   Sold Date: {sold_date.strftime('%Y-%m-%d')}")
         elif prop.list_price:
             print(f"   List Price: ${prop.list_price:,.0f}")
-        if comp.price_difference:
-            print(f"   Price Difference: ${comp.price_difference:,.0f} ({comp.price_difference_percent:+.1f}%)")
+        price_difference = comp.price_difference
+        if price_difference:
+            print(f"   Price Difference: ${price_difference:,.0f} ({comp.price_difference_percent:+.1f}%)")
         if comp.match_reasons:
             print(f"   Match Reasons: {', '.join(comp.match_reasons)}")
     
     print("\n" + "="*80)
 
 
+def _comp_json(cp):
+    """JSON-serializable fields of one comparable property."""
+    prop = cp.property
+    return {
+        "mls_number": prop.mls_number,
+        "address": prop.address,
+        "city": prop.city,
+        "state": prop.state,
+        "zip_code": prop.zip_code,
+        "similarity_score": cp.similarity_score,
+        "distance_miles": cp.distance_miles,
+        "sold_price": prop.sold_price,
+        "list_price": prop.list_price,
+        "bedrooms": prop.bedrooms,
+        "bathrooms": prop.bathrooms,
+        "square_feet": prop.square_feet,
+        "sold_date": prop.sold_date,
+        "price_difference": cp.price_difference,
+        "price_difference_percent": cp.price_difference_percent,
+        "match_reasons": cp.match_reasons
+    }
+
+
+def print_comp_json(result):
+    """Print comp results as JSON."""
+    # Convert to JSON-serializable format
+    subject = result.subject_property
+    output = {
+        "subject_property": {
+            "mls_number": subject.mls_number,
+            "address": subject.address,
+            "city": subject.city,
+            "state": subject.state,
+            "zip_code": subject.zip_code,
+            "property_type": subject.property_type.value,
+            "bedrooms": subject.bedrooms,
+            "bathrooms": subject.bathrooms,
+            "square_feet": subject.square_feet,
+            "list_price": subject.list_price,
+        },
+        "comparable_properties": [_comp_json(cp) for cp in result.comparable_properties],
+        "average_price": result.average_price,
+        "average_price_per_sqft": result.average_price_per_sqft,
+        "estimated_value": result.estimated_value,
+        "confidence_score": result.confidence_score
+    }
+    # Encoded with orjson when installed; the stdlib fallback needs datetimes spelled out
+    sys.stdout.flush()
+    sys.stdout.buffer.write(
+        dumps_line(output, default=lambda value: value.isoformat(), indent=True)
+    )
+    sys.stdout.buffer.flush()
+
+
+def _find_comps_from_stdin(bot, args):
+    """Run one comp search per stdin line of 'address|city|state|zip' on one connection."""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        parts = [part.strip() or None for part in line.split('|')]
+        address, city, state, zip_code = (parts + [None] * 4)[:4]
+        print(f"Finding comps for {address}...")
+        try:
+            result = bot.find_comps_for_property(
+                address=address,
+                city=city,
+                state=state,
+                zip_code=zip_code,
+                max_comps=args.max_comps
+            )
+        except Exception as e:
+            # One bad address should not end the whole batch
+            print(f"ERROR: {line}: {e}", file=sys.stderr)
+            continue
+        if not result:
+            print(f"ERROR: Could not find comparable properties for {line}", file=sys.stderr)
+        elif args.json:
+            print_comp_json(result)
+        else:
+            print_comp_result(result)
+
+
 def main():
     parser = argparse.ArgumentParser(description="MLS Comp Bot - Find comparable properties")
     parser.add_argument("--mls-number", help="MLS number of subject property")
@@ -77,9 +184,19 @@ def main():
     parser.add_argument("--save-report", type=str, help="Save report to file (specify format: text, html, or markdown)")
     parser.add_argument("--train", action="store_true", help="Train the model with collected data")
     parser.add_argument("--feedback", type=float, help="Provide feedback rating (0.0-1.0) for last result")
+    parser.add_argument("--stdin", action="store_true",
+                        help="Read subjects from stdin, one 'address|city|state|zip' per line, reusing one connection")
     
     args = parser.parse_args()
     
+    # Reject invocations with nothing to do before building and connecting the bot
+    if not (args.train or args.stdin or args.mls_number or args.address or args.city):
+        parser.print_help()
+        sys.exit(1)
+    
+    # Heavy imports are deferred until after argument parsing, so --help stays fast
+    from bot import MLSCompBot
+    
     # Initialize bot
     bot = MLSCompBot()
     
@@ -97,6 +214,10 @@ def main():
             print("Training completed!")
             return
         
+        if args.stdin:
+            _find_comps_from_stdin(bot, args)
+            return
+        
         # Find comps
         result = None
         
@@ -116,9 +237,6 @@ def main():
             print(f"Finding comps by criteria in {args.city}...")
             print("NOTE: ATTOM API requires a specific address. Please use --address instead.")
             result = None
-        else:
-            parser.print_help()
-            sys.exit(1)
         
         if not result:
             print("ERROR: Could not find comparable properties.")
@@ -126,6 +244,8 @@ def main():
         
         # Generate report if requested
         if args.report or args.save_report:
+            from report_generator import ReportGenerator
+            
             report_gen = ReportGenerator()
             
             if args.save_report:
@@ -144,10 +264,10 @@ def main():
                 print("REPORT PREVIEW (first 50 lines):")
                 print("="*80)
                 report_content = report_gen.generate_report(result, format_type)
-                preview_lines = report_content.split('\n')[:50]
-                print('\n'.join(preview_lines))
-                if len(report_content.split('\n')) > 50:
-                    print(f"\n... ({len(report_content.split('\n')) - 50} more lines - see full report in file)")
+                lines = report_content.split('\n')
+                print('\n'.join(lines[:50]))
+                if len(lines) > 50:
+                    print(f"\n... ({len(lines) - 50} more lines - see full report in file)")
             else:
                 # Just display report
                 report_content = report_gen.generate_report(result, "text")
@@ -162,47 +282,7 @@ def main():
         
         # Output results
         if args.json:
-            # Convert to JSON-serializable format
-            output = {
-                "subject_property": {
-                    "mls_number": result.subject_property.mls_number,
-                    "address": result.subject_property.address,
-                    "city": result.subject_property.city,
-                    "state": result.subject_property.state,
-                    "zip_code": result.subject_property.zip_code,
-                    "property_type": result.subject_property.property_type.value,
-                    "bedrooms": result.subject_property.bedrooms,
-                    "bathrooms": result.subject_property.bathrooms,
-                    "square_feet": result.subject_property.square_feet,
-                    "list_price": result.subject_property.list_price,
-                },
-                "comparable_properties": [
-                    {
-                        "mls_number": cp.property.mls_number,
-                        "address": cp.property.address,
-                        "city": cp.property.city,
-                        "state": cp.property.state,
-                        "zip_code": cp.property.zip_code,
-                        "similarity_score": cp.similarity_score,
-                        "distance_miles": cp.distance_miles,
-                        "sold_price": cp.property.sold_price,
-                        "list_price": cp.property.list_price,
-                        "bedrooms": cp.property.bedrooms,
-                        "bathrooms": cp.property.bathrooms,
-                        "square_feet": cp.property.square_feet,
-                        "sold_date": cp.property.sold_date.isoformat() if cp.property.sold_date else None,
-                        "price_difference": cp.price_difference,
-                        "price_difference_percent": cp.price_difference_percent,
-                        "match_reasons": cp.match_reasons
-                    }
-                    for cp in result.comparable_properties
-                ],
-                "average_price": result.average_price,
-                "average_price_per_sqft": result.average_price_per_sqft,
-                "estimated_value": result.estimated_value,
-                "confidence_score": result.confidence_score
-            }
-            print(json.dumps(output, indent=2))
+            print_comp_json(result)
         else:
             print_comp_result(result)
         
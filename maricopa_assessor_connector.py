@@ -3,23 +3,93 @@
 This connector is intentionally conservative:
 - It is disabled by default and must be enabled via config.
 - It returns None on failures (rate limits, auth, parsing issues) instead of raising.
-- It only extracts a small set of high-signal fields and stores raw response in mls_data
-  for debugging.
+- It only extracts a small set of high-signal fields; the raw responses are kept in
+  mls_data only when MARICOPA_ASSESSOR_STORE_RAW is set, for debugging.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import settings
+from json_utils import loads
 from mls_connector import MLSConnector
 from models import Property, PropertyStatus, PropertyType
 
 logger = logging.getLogger(__name__)
 
+# Shared pooled session: one address lookup makes several requests to the same
+# host, so keep-alive saves a TCP/TLS handshake on all but the first. Gateway
+# errors and a failed connect are retried briefly; a read timeout is not, since
+# it already waited the full read timeout.
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2, connect=1, read=0, backoff_factor=0.2, status_forcelist=(502, 503, 504)
+    ),
+)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+
+# Field key aliases, in priority order, as seen across assessor vendors.
+_SEARCH_APN_KEYS = ("apn", "APN", "parcel", "parcelNumber", "parcel_number")
+# "parcel" is left out here: the parcel payload nests a whole "parcel" response.
+_APN_KEYS = ("apn", "APN", "parcelNumber", "parcel_number")
+_YEAR_KEYS = ("yearBuilt", "YearBuilt", "builtYear", "BuiltYear", "yr_blt", "YR_BLT")
+_LOT_KEYS = (
+    "lotSizeSqFt",
+    "LotSizeSqFt",
+    "lot_size_sqft",
+    "LotSqFt",
+    "lotSqFt",
+    "lot_sq_ft",
+    "LotAreaSqFt",
+)
+_SQFT_KEYS = (
+    "squareFeet",
+    "SquareFeet",
+    "sqft",
+    "SqFt",
+    "buildingSqFt",
+    "livingAreaSqFt",
+    "LivingArea",
+)
+_ASSESSED_KEYS = ("assessedValue", "AssessedValue", "totalAssessedValue", "TotalAssessedValue")
+_MARKET_KEYS = ("marketValue", "MarketValue", "fullCashValue", "FullCashValue")
+_SITUS_KEYS = ("situsAddress", "SitusAddress", "propertyAddress", "PropertyAddress", "Address")
+
+# Fields pulled from the search + parcel payloads, resolved in one walk.
+_PARSED_FIELDS = {
+    "apn": _APN_KEYS,
+    "year_built": _YEAR_KEYS,
+    "lot_size_sqft": _LOT_KEYS,
+    "square_feet": _SQFT_KEYS,
+    "assessed_value": _ASSESSED_KEYS,
+    "market_value": _MARKET_KEYS,
+    "situs_address": _SITUS_KEYS,
+}
+_PARSED_FIELD_KEYS = frozenset(key for keys in _PARSED_FIELDS.values() for key in keys)
+
+# Parsed fields each parcel sub-endpoint can supply. A sub-endpoint is only
+# fetched when the main parcel response left one of its fields unresolved.
+_ENDPOINT_FIELDS = {
+    "propertyinfo": frozenset({"year_built", "square_feet", "lot_size_sqft", "situs_address"}),
+    "address": frozenset({"situs_address"}),
+    "valuations": frozenset({"assessed_value", "market_value"}),
+    "residential_details": frozenset({"year_built", "square_feet", "lot_size_sqft"}),
+    "owner_details": frozenset(),
+}
+
 
 def _safe_str(value: Any) -> Optional[str]:
     if value is None:
@@ -30,6 +100,11 @@ def _safe_str(value: Any) -> Optional[str]:
 
 def _safe_int(value: Any) -> Optional[int]:
     try:
+        # JSON numbers arrive already typed; bools fall through and parse to None
+        if type(value) is int:
+            return value
+        if type(value) is float:
+            return int(value)
         if value is None or value == "":
             return None
         return int(float(str(value).replace(",", "").strip()))
@@ -39,6 +114,10 @@ def _safe_int(value: Any) -> Optional[int]:
 
 def _safe_float(value: Any) -> Optional[float]:
     try:
+        if type(value) is float:
+            return value
+        if type(value) is int:
+            return float(value)
         if value is None or value == "":
             return None
         return float(str(value).replace(",", "").strip())
@@ -71,28 +150,66 @@ def _unwrap_first_record(payload: Any) -> Any:
     return payload
 
 
-def _deep_find_first(data: Any, keys: list[str]) -> Any:
-    """Deep search nested dict/list for the first matching key."""
-    if data is None:
-        return None
-    if isinstance(data, dict):
-        for k in keys:
-            if k in data and data[k] not in (None, "", [], {}):
-                return data[k]
-        for v in data.values():
-            found = _deep_find_first(v, keys)
-            if found not in (None, "", [], {}):
-                return found
-        return None
-    if isinstance(data, list):
-        for item in data:
-            found = _deep_find_first(item, keys)
-            if found not in (None, "", [], {}):
-                return found
-        return None
+def _deep_find_first(data: Any, keys: Sequence[str]) -> Any:
+    """Deep search nested dict/list for the first matching key.
+
+    Walks depth-first in document order with an explicit stack, so the match is
+    the same one a recursive search would find, without a call per node.
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for k in keys:
+                value = node.get(k)
+                # None, "", [] and {} are empty; JSON zeros and false are real values.
+                if value or value == 0:
+                    return value
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
     return None
 
 
+def _collect_fields(
+    roots: Sequence[Any],
+    wanted: Dict[str, Sequence[str]],
+    wanted_keys: Optional[frozenset] = None,
+) -> Dict[str, Any]:
+    """Deep search several payloads for several fields at once.
+
+    ``roots`` are searched in order, as if they were one list. ``wanted`` maps a
+    field name to its key aliases, and ``wanted_keys`` is the union of those
+    aliases; it is derived if not given. Each field resolves to the same value
+    ``_deep_find_first(list(roots), keys)`` would return, but the payloads are
+    walked once. Fields without a match are left out of the result.
+    """
+    if wanted_keys is None:
+        wanted_keys = frozenset(key for keys in wanted.values() for key in keys)
+    pending = dict(wanted)
+    found: Dict[str, Any] = {}
+    stack = list(reversed(roots))
+    while stack and pending:
+        node = stack.pop()
+        if isinstance(node, dict):
+            # Most nested dicts hold none of the aliases; one set intersection
+            # rules them out before probing field by field.
+            if not node.keys() & wanted_keys:
+                stack.extend(reversed(node.values()))
+                continue
+            for field, keys in list(pending.items()):
+                for k in keys:
+                    value = node.get(k)
+                    if value or value == 0:
+                        found[field] = value
+                        del pending[field]
+                        break
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return found
+
+
 class MaricopaAssessorConnector(MLSConnector):
     """Connector for a Maricopa County Assessor API (exact endpoints vary by vendor).
 
@@ -104,10 +221,37 @@ class MaricopaAssessorConnector(MLSConnector):
     Authentication can be provided via:
     - MARICOPA_ASSESSOR_API_KEY + MARICOPA_ASSESSOR_API_KEY_HEADER (header auth), or
     - MARICOPA_ASSESSOR_API_KEY + MARICOPA_ASSESSOR_API_KEY_QUERY_PARAM (query auth).
+
+    Set MARICOPA_ASSESSOR_STORE_RAW=true to also keep the full search + parcel
+    responses under mls_data["raw"]; by default only the extracted fields are kept.
     """
 
-    def __init__(self) -> None:
+    # Parcel sub-endpoints hydrated after the full /parcel/{apn} record:
+    # (payload key, path under /parcel/{apn})
+    PARCEL_ENDPOINTS = (
+        ("propertyinfo", "/propertyinfo"),
+        ("address", "/address"),
+        ("valuations", "/valuations"),
+        ("residential_details", "/residential-details"),
+        ("owner_details", "/owner-details"),
+    )
+
+    # Address variants often resolve to the same APN; hydrated parcels are reused.
+    # APNs whose endpoints all came back 404 are remembered briefly as well.
+    PARCEL_CACHE_TTL_SECONDS = 3600
+    PARCEL_NEGATIVE_CACHE_TTL_SECONDS = 300
+    PARCEL_CACHE_MAXSIZE = 1024
+    # Parcel responses kept with their ETag/Last-Modified so an expired parcel
+    # is revalidated with a conditional GET (a 304 carries no body).
+    VALIDATOR_CACHE_MAXSIZE = 4096
+
+    # Cap on concurrent address lookups in a batch; each one also fans out its
+    # own parcel sub-requests, so this keeps the total near the session pool size.
+    MAX_ADDRESS_CONCURRENCY = 4
+
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
         super().__init__()
+        self.session = session or _HTTP_SESSION
         self.base_url = (settings.maricopa_assessor_base_url or "").rstrip("/")
         self.api_key = settings.maricopa_assessor_api_key or ""
         # Official docs use AUTHORIZATION header
@@ -116,11 +260,34 @@ class MaricopaAssessorConnector(MLSConnector):
         self.search_path = settings.maricopa_assessor_search_path or "/search/property/"
         self.address_param = settings.maricopa_assessor_address_param or "q"
         self.timeout_seconds = int(settings.maricopa_assessor_timeout_seconds or 30)
+        self.connect_timeout = float(settings.maricopa_assessor_connect_timeout or 3.05)
+        # Fail fast when the host is unreachable, but tolerate slow responses.
+        self.timeout = (self.connect_timeout, self.timeout_seconds)
+        self.store_raw = bool(settings.maricopa_assessor_store_raw)
+
+        # Auth is fixed per connector, so build the request headers/params once.
+        # Per official docs: include custom AUTHORIZATION header and user-agent = null.
+        self._headers: Dict[str, str] = {
+            "Accept": "application/json",
+            "User-Agent": "null",
+        }
+        self._auth_params: Dict[str, str] = {}
+        if self.api_key and self.api_key_query_param:
+            self._auth_params[self.api_key_query_param] = self.api_key
+        elif self.api_key:
+            self._headers[self.api_key_header] = self.api_key
 
         self.last_status_code: Optional[int] = None
         self.last_error: Optional[str] = None
         self.last_endpoint: Optional[str] = None
 
+        # apn -> (expires_at, parcel payload); shared by get_properties_by_addresses workers
+        self._parcel_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        self._parcel_lock = threading.Lock()
+        # parcel path -> (etag, last_modified, parsed body); written from worker threads
+        self._validator_cache: Dict[str, tuple[Optional[str], Optional[str], Any]] = {}
+        self._validator_lock = threading.Lock()
+
     def connect(self) -> bool:
         """Mark connector ready if enabled and base URL is configured."""
         if not settings.maricopa_assessor_enabled:
@@ -155,29 +322,23 @@ class MaricopaAssessorConnector(MLSConnector):
         if not state or str(state).strip().upper() != "AZ":
             return None
 
-        full_address = ", ".join(
-            [p for p in [address, city, f"{state} {zip_code}".strip()] if p]
-        ).strip()
+        street = address.strip() if address else ""
+        locality = city.strip() if city else ""
+        region = f"{state} {zip_code}".strip()
+        if street and locality:
+            full_address = f"{street}, {locality}, {region}"
+        else:
+            full_address = ", ".join([p for p in (street, locality, region) if p])
         if not full_address:
             return None
 
         url = f"{self.base_url}{self.search_path}"
         self.last_endpoint = url
 
-        # Per official docs: include custom AUTHORIZATION header and user-agent = null.
-        headers: Dict[str, str] = {
-            "Accept": "application/json",
-            "User-Agent": "null",
-        }
-        params: Dict[str, Any] = {self.address_param: full_address}
-
-        if self.api_key and self.api_key_query_param:
-            params[self.api_key_query_param] = self.api_key
-        elif self.api_key:
-            headers[self.api_key_header] = self.api_key
+        params: Dict[str, Any] = {self.address_param: full_address, **self._auth_params}
 
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=self.timeout_seconds)
+            resp = self.session.get(url, headers=self._headers, params=params, timeout=self.timeout)
             self.last_status_code = resp.status_code
 
             if resp.status_code in (401, 403):
@@ -192,25 +353,23 @@ class MaricopaAssessorConnector(MLSConnector):
                 return None
 
             resp.raise_for_status()
-            payload = resp.json()
+            payload = loads(resp.content)
 
             # First call returns search result set; extract APN then hydrate parcel endpoints.
-            apn = _safe_str(_deep_find_first(payload, ["apn", "APN", "parcel", "parcelNumber", "parcel_number"]))
+            apn = _safe_str(_deep_find_first(payload, _SEARCH_APN_KEYS))
             record = _unwrap_first_record(payload)
-            if not record and not apn:
+            # The record is nested in the payload, so it holds no APN the search above missed.
+            search_record = record if isinstance(record, dict) else {}
+            if not search_record and not apn:
                 self.last_error = "no_results"
                 return None
 
-            # If search result doesn't contain APN directly, try extracting from first record.
-            if not apn and record:
-                apn = _safe_str(_deep_find_first(record, ["apn", "APN", "parcel", "parcelNumber", "parcel_number"]))
-
             parcel_payload: Dict[str, Any] = {}
             if apn:
                 parcel_payload = self._fetch_parcel_details(apn) or {}
 
             prop = self._parse_combined(
-                search_record=record if isinstance(record, dict) else {},
+                search_record=search_record,
                 parcel_payload=parcel_payload,
                 apn=apn,
                 address=address,
@@ -235,46 +394,135 @@ class MaricopaAssessorConnector(MLSConnector):
             logger.warning(f"Maricopa Assessor unexpected error for {full_address}: {e}")
             return None
 
+    def get_properties_by_addresses(
+        self, rows: Sequence[Tuple[str, str, str, str]]
+    ) -> List[Optional[Property]]:
+        """Look up many (address, city, state, zip_code) rows concurrently.
+
+        Results are returned in input order, with None for misses. The last_*
+        breadcrumbs reflect whichever lookup finished last.
+        """
+        if not self.connected:
+            raise ConnectionError("Not connected to Maricopa Assessor API")
+        if len(rows) <= 1:
+            return [self.get_property_by_address(*row) for row in rows]
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.MAX_ADDRESS_CONCURRENCY, len(rows))
+        ) as executor:
+            return list(executor.map(lambda row: self.get_property_by_address(*row), rows))
+
+    def _get_parcel_cached(self, apn: str) -> Optional[Dict[str, Any]]:
+        """Return an unexpired parcel payload, or None."""
+        with self._parcel_lock:
+            entry = self._parcel_cache.pop(apn, None)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                return None
+            # Re-insert so eviction drops the least recently used APN
+            self._parcel_cache[apn] = entry
+            return payload
+
+    def _set_parcel_cached(self, apn: str, payload: Dict[str, Any], ttl_seconds: float) -> None:
+        """Cache a parcel payload, evicting the least recently used entry when full."""
+        with self._parcel_lock:
+            self._parcel_cache.pop(apn, None)
+            if len(self._parcel_cache) >= self.PARCEL_CACHE_MAXSIZE:
+                del self._parcel_cache[next(iter(self._parcel_cache))]
+            self._parcel_cache[apn] = (time.monotonic() + ttl_seconds, payload)
+
+    def _set_validators_cached(
+        self, path: str, etag: Optional[str], last_modified: Optional[str], body: Any
+    ) -> None:
+        """Cache a parcel response's validators, evicting the oldest entry when full."""
+        with self._validator_lock:
+            self._validator_cache.pop(path, None)
+            if len(self._validator_cache) >= self.VALIDATOR_CACHE_MAXSIZE:
+                del self._validator_cache[next(iter(self._validator_cache))]
+            self._validator_cache[path] = (etag, last_modified, body)
+
     def _fetch_parcel_details(self, apn: str) -> Optional[Dict[str, Any]]:
         """Hydrate additional parcel endpoints once we have an APN."""
         if not apn:
             return None
 
+        cached = self._get_parcel_cached(apn)
+        if cached is not None:
+            return cached
+
+        # Auth, rate-limit and network failures are transient and never cached.
+        transient_failures: list[str] = []
+
         def _get(path: str) -> Optional[Any]:
             url = f"{self.base_url}{path}"
-            headers: Dict[str, str] = {
-                "Accept": "application/json",
-                "User-Agent": "null",
-            }
-            params: Dict[str, Any] = {}
-            if self.api_key and self.api_key_query_param:
-                params[self.api_key_query_param] = self.api_key
-            elif self.api_key:
-                headers[self.api_key_header] = self.api_key
-
+            headers = self._headers
+            validators = self._validator_cache.get(path)
+            if validators is not None:
+                etag, last_modified, _ = validators
+                headers = dict(headers)
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
             try:
-                r = requests.get(url, headers=headers, params=params, timeout=self.timeout_seconds)
+                r = self.session.get(
+                    url, headers=headers, params=self._auth_params, timeout=self.timeout
+                )
                 self.last_status_code = r.status_code
+                if r.status_code == 304 and validators is not None:
+                    return validators[2]
                 if r.status_code in (401, 403):
                     self.last_error = f"auth_failed: HTTP {r.status_code}"
+                    transient_failures.append(path)
                     return None
                 if r.status_code == 429:
                     self.last_error = "rate_limited: HTTP 429"
+                    transient_failures.append(path)
+                    return None
+                if r.status_code == 404:
                     return None
                 r.raise_for_status()
-                return r.json()
-            except requests.exceptions.RequestException as e:
+                body = loads(r.content)
+                etag = r.headers.get("ETag")
+                last_modified = r.headers.get("Last-Modified")
+                if etag or last_modified:
+                    self._set_validators_cached(path, etag, last_modified, body)
+                return body
+            except (requests.exceptions.RequestException, ValueError) as e:
                 logger.warning(f"Maricopa Assessor parcel request failed for {path}: {e}")
+                transient_failures.append(path)
                 return None
 
-        # Pull a small, high-signal set of endpoints.
+        # The full parcel record usually carries everything we parse; only pull
+        # the sub-endpoints that can fill fields it left empty.
+        parcel = _get(f"/parcel/{apn}")
+        resolved = _collect_fields((parcel,), _PARSED_FIELDS, _PARSED_FIELD_KEYS)
+        endpoints = [
+            (key, path)
+            for key, path in self.PARCEL_ENDPOINTS
+            if _ENDPOINT_FIELDS[key] - resolved.keys()
+        ]
+
+        # The remaining endpoints are independent, so fetch them concurrently
+        # over the pooled session.
+        responses = [parcel]
+        if len(endpoints) == 1:
+            responses.append(_get(f"/parcel/{apn}{endpoints[0][1]}"))
+        elif endpoints:
+            with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+                responses.extend(
+                    executor.map(lambda endpoint: _get(f"/parcel/{apn}{endpoint[1]}"), endpoints)
+                )
         payload: Dict[str, Any] = {"apn": apn}
-        payload["parcel"] = _get(f"/parcel/{apn}")  # full parcel data
-        payload["propertyinfo"] = _get(f"/parcel/{apn}/propertyinfo")
-        payload["address"] = _get(f"/parcel/{apn}/address")
-        payload["valuations"] = _get(f"/parcel/{apn}/valuations")
-        payload["residential_details"] = _get(f"/parcel/{apn}/residential-details")
-        payload["owner_details"] = _get(f"/parcel/{apn}/owner-details")
+        for (key, _), response in zip([("parcel", "")] + endpoints, responses):
+            payload[key] = response
+
+        if not transient_failures:
+            found = any(response is not None for response in responses)
+            ttl = self.PARCEL_CACHE_TTL_SECONDS if found else self.PARCEL_NEGATIVE_CACHE_TTL_SECONDS
+            self._set_parcel_cached(apn, payload, ttl)
         return payload
 
     def _parse_combined(
@@ -288,65 +536,27 @@ class MaricopaAssessorConnector(MLSConnector):
         zip_code: str,
     ) -> Optional[Property]:
         """Best-effort parsing across search + parcel payloads (schema varies)."""
-        combined: Dict[str, Any] = {
-            "search": search_record,
-            "parcel_payload": parcel_payload,
-        }
+        wanted = _PARSED_FIELDS
+        if apn:
+            wanted = {field: keys for field, keys in wanted.items() if field != "apn"}
+        fields = _collect_fields((search_record, parcel_payload), wanted, _PARSED_FIELD_KEYS)
+        if not apn and not fields:
+            # A search miss (e.g. zero counts and empty result lists): nothing to merge.
+            self.last_error = "no_results"
+            return None
 
-        apn_val = apn or _safe_str(
-            _deep_find_first(combined, ["apn", "APN", "parcelNumber", "parcel_number"])
-        )
-        year_built = _safe_int(
-            _deep_find_first(combined, ["yearBuilt", "YearBuilt", "builtYear", "BuiltYear", "yr_blt", "YR_BLT"])
-        )
-        lot_size_sqft = _safe_float(
-            _deep_find_first(
-                combined,
-                [
-                    "lotSizeSqFt",
-                    "LotSizeSqFt",
-                    "lot_size_sqft",
-                    "LotSqFt",
-                    "lotSqFt",
-                    "lot_sq_ft",
-                    "LotAreaSqFt",
-                ],
-            )
-        )
-        square_feet = _safe_int(
-            _deep_find_first(
-                combined,
-                [
-                    "squareFeet",
-                    "SquareFeet",
-                    "sqft",
-                    "SqFt",
-                    "buildingSqFt",
-                    "livingAreaSqFt",
-                    "LivingArea",
-                ],
-            )
-        )
+        apn_val = apn or _safe_str(fields.get("apn"))
+        year_built = _safe_int(fields.get("year_built"))
+        lot_size_sqft = _safe_float(fields.get("lot_size_sqft"))
+        square_feet = _safe_int(fields.get("square_feet"))
 
-        # Valuations often come as arrays; we store raw in mls_data and pull best-effort value fields.
-        assessed_value = _safe_float(
-            _deep_find_first(
-                combined,
-                ["assessedValue", "AssessedValue", "totalAssessedValue", "TotalAssessedValue"],
-            )
-        )
-        market_value = _safe_float(
-            _deep_find_first(combined, ["marketValue", "MarketValue", "fullCashValue", "FullCashValue"])
-        )
-
-        situs_address = _safe_str(
-            _deep_find_first(
-                combined,
-                ["situsAddress", "SitusAddress", "propertyAddress", "PropertyAddress", "Address"],
-            )
-        )
+        # Valuations often come as arrays; pull best-effort value fields.
+        assessed_value = _safe_float(fields.get("assessed_value"))
+        market_value = _safe_float(fields.get("market_value"))
+
+        situs_address = _safe_str(fields.get("situs_address"))
 
-        # Always return a Property instance so bot can merge missing fields.
+        # Return a Property even when only some fields were found so bot can merge them.
         prop_id = apn_val or f"maricopa:{(situs_address or address).strip()}"
         status = PropertyStatus.ACTIVE
 
@@ -355,8 +565,9 @@ class MaricopaAssessorConnector(MLSConnector):
             "apn": apn_val,
             "assessed_value": assessed_value,
             "market_value": market_value,
-            "raw": combined,
         }
+        if self.store_raw:
+            mls_data["raw"] = {"search": search_record, "parcel_payload": parcel_payload}
 
         try:
             return Property(
@@ -1,38 +1,35 @@
+import json
 import unittest
 from unittest.mock import Mock, patch
 
 
 class TestMaricopaAssessorConnector(unittest.TestCase):
-    @patch("maricopa_assessor_connector.requests.get")
+    @patch("maricopa_assessor_connector._HTTP_SESSION.get")
     def test_get_property_by_address_returns_property_on_success(
         self, mock_get: Mock
     ) -> None:
         # Arrange: mock HTTP response
         def side_effect(url: str, *args: object, **kwargs: object) -> Mock:
-            resp = Mock()
+            resp = Mock(headers={})
             resp.raise_for_status.return_value = None
             if "/search/property/" in url:
                 resp.status_code = 200
-                resp.json.return_value = {
-                    "results": [{"APN": "123-45-678"}],
-                }
+                resp.content = json.dumps({"results": [{"APN": "123-45-678"}]}).encode()
                 return resp
             if "/parcel/123-45-678/residential-details" in url:
                 resp.status_code = 200
-                resp.json.return_value = {
-                    "YearBuilt": 1999,
-                    "SqFt": 1837,
-                    "LotSizeSqFt": 7200,
-                }
+                resp.content = json.dumps(
+                    {"YearBuilt": 1999, "SqFt": 1837, "LotSizeSqFt": 7200}
+                ).encode()
                 return resp
             if "/parcel/123-45-678/valuations" in url:
                 resp.status_code = 200
-                resp.json.return_value = [{"TotalAssessedValue": 312000}]
+                resp.content = json.dumps([{"TotalAssessedValue": 312000}]).encode()
                 return resp
 
             # Default for other parcel endpoints we call
             resp.status_code = 200
-            resp.json.return_value = {}
+            resp.content = b"{}"
             return resp
 
         mock_get.side_effect = side_effect
@@ -56,8 +53,9 @@ class TestMaricopaAssessorConnector(unittest.TestCase):
         self.assertEqual(prop.lot_size_sqft, 7200.0)
         self.assertEqual(prop.square_feet, 1837)
         self.assertEqual(prop.mls_data.get("source"), "maricopa_assessor")
+        self.assertNotIn("raw", prop.mls_data)
 
-    @patch("maricopa_assessor_connector.requests.get")
+    @patch("maricopa_assessor_connector._HTTP_SESSION.get")
     def test_get_property_by_address_handles_auth_failure(self, mock_get: Mock) -> None:
         resp = Mock()
         resp.status_code = 401
@@ -72,6 +70,144 @@ class TestMaricopaAssessorConnector(unittest.TestCase):
         self.assertIsNone(prop)
         self.assertIn("auth_failed", conn.last_error or "")
 
+    @patch("maricopa_assessor_connector._HTTP_SESSION.get")
+    def test_complete_parcel_is_fetched_once_and_cached_by_apn(self, mock_get: Mock) -> None:
+        def side_effect(url: str, *args: object, **kwargs: object) -> Mock:
+            resp = Mock(headers={})
+            resp.raise_for_status.return_value = None
+            resp.status_code = 200
+            if "/search/property/" in url:
+                resp.content = json.dumps({"results": [{"APN": "123-45-678"}]}).encode()
+            else:
+                resp.content = json.dumps(
+                    {
+                        "PropertyAddress": "3644 E CONSTITUTION DR",
+                        "YearBuilt": 1999,
+                        "LivingArea": 1837,
+                        "LotSizeSqFt": 7200,
+                        "Valuations": [{"FullCashValue": 400000, "AssessedValue": 40000}],
+                    }
+                ).encode()
+            return resp
+
+        mock_get.side_effect = side_effect
+
+        from maricopa_assessor_connector import MaricopaAssessorConnector
+
+        conn = MaricopaAssessorConnector()
+        conn.connected = True
+
+        first = conn.get_property_by_address("3644 E CONSTITUTION DR", "GILBERT", "AZ", "85296")
+        parcel_calls = mock_get.call_count - 1
+        second = conn.get_property_by_address("3644 E. Constitution Dr", "GILBERT", "AZ", "85296")
+
+        assert first is not None and second is not None
+        # /parcel/{apn} resolved every field, so no sub-endpoint was requested
+        self.assertEqual(parcel_calls, 1)
+        # Only the second search request went out
+        self.assertEqual(mock_get.call_count, parcel_calls + 2)
+        self.assertEqual(second.year_built, 1999)
+
+    @patch("maricopa_assessor_connector._HTTP_SESSION.get")
+    def test_expired_parcel_is_revalidated_with_etag(self, mock_get: Mock) -> None:
+        def side_effect(url: str, *args: object, **kwargs: object) -> Mock:
+            resp = Mock(headers={})
+            resp.raise_for_status.return_value = None
+            resp.status_code = 200
+            if "/search/property/" in url:
+                resp.content = json.dumps({"results": [{"APN": "123-45-678"}]}).encode()
+            elif kwargs["headers"].get("If-None-Match") == '"v1"':
+                resp.status_code = 304
+                resp.content = b""
+            else:
+                resp.headers = {"ETag": '"v1"'}
+                resp.content = json.dumps({"YearBuilt": 1999, "LivingArea": 1837}).encode()
+            return resp
+
+        mock_get.side_effect = side_effect
+
+        from maricopa_assessor_connector import MaricopaAssessorConnector
+
+        conn = MaricopaAssessorConnector()
+        conn.connected = True
+        conn.get_property_by_address("1 MAIN ST", "MESA", "AZ", "85201")
+        conn._parcel_cache.clear()
+
+        prop = conn.get_property_by_address("1 MAIN ST", "MESA", "AZ", "85201")
+
+        assert prop is not None
+        self.assertEqual(conn.last_status_code, 304)
+        self.assertEqual(prop.year_built, 1999)
+        self.assertEqual(prop.square_feet, 1837)
+
+    @patch("maricopa_assessor_connector._HTTP_SESSION.get")
+    def test_search_miss_returns_none(self, mock_get: Mock) -> None:
+        resp = Mock(headers={}, status_code=200)
+        resp.content = json.dumps({"TotalCount": 0, "RealProperty": []}).encode()
+        mock_get.return_value = resp
+
+        from maricopa_assessor_connector import MaricopaAssessorConnector
+
+        conn = MaricopaAssessorConnector()
+        conn.connected = True
+
+        self.assertIsNone(conn.get_property_by_address("1 MAIN ST", "MESA", "AZ", "85201"))
+        self.assertEqual(conn.last_error, "no_results")
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_get_properties_by_addresses_keeps_input_order(self) -> None:
+        from maricopa_assessor_connector import MaricopaAssessorConnector
+
+        conn = MaricopaAssessorConnector()
+        conn.connected = True
+        rows = [
+            ("1 MAIN ST", "MESA", "AZ", "85201"),
+            ("2 MAIN ST", "LA", "CA", "90001"),
+            ("3 MAIN ST", "MESA", "AZ", "85201"),
+        ]
+
+        with patch.object(
+            conn, "get_property_by_address", side_effect=lambda address, *rest: address
+        ):
+            self.assertEqual(conn.get_properties_by_addresses(rows), [row[0] for row in rows])
+        self.assertEqual(conn.get_properties_by_addresses([rows[1]]), [None])
+
+    def test_parcel_cache_is_safe_across_worker_threads(self) -> None:
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from maricopa_assessor_connector import MaricopaAssessorConnector
+
+        class YieldingDict(dict):
+            # Give up the GIL on every lookup so check-then-act races surface
+            def get(self, *args):
+                value = super().get(*args)
+                time.sleep(0)
+                return value
+
+            def pop(self, *args):
+                value = super().pop(*args)
+                time.sleep(0)
+                return value
+
+        conn = MaricopaAssessorConnector()
+        conn.PARCEL_CACHE_MAXSIZE = 2
+        conn._parcel_cache = YieldingDict()
+        apns = [f"123-45-{i:03d}" for i in range(4)]
+
+        def churn(worker: int) -> None:
+            for i in range(500):
+                apn = apns[(worker + i) % len(apns)]
+                conn._set_parcel_cached(apn, {"apn": apn}, ttl_seconds=-1 if i % 3 == 0 else 60)
+                cached = conn._get_parcel_cached(apn)
+                if cached is not None:
+                    self.assertEqual(cached["apn"], apn)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(churn, range(6)))
+
+        self.assertLessEqual(len(conn._parcel_cache), conn.PARCEL_CACHE_MAXSIZE)
+
     def test_get_property_by_address_non_az_returns_none(self) -> None:
         from maricopa_assessor_connector import MaricopaAssessorConnector
 
@@ -81,5 +217,34 @@ class TestMaricopaAssessorConnector(unittest.TestCase):
         self.assertIsNone(prop)
 
 
+class TestCollectFields(unittest.TestCase):
+    def test_matches_per_field_deep_search(self) -> None:
+        from maricopa_assessor_connector import (
+            _PARSED_FIELDS,
+            _collect_fields,
+            _deep_find_first,
+        )
+
+        payload = {
+            "search": {"APN": "", "Address": {"Street": "1 MAIN ST"}},
+            "parcel_payload": {
+                "apn": "123-45-678",
+                "parcel": {"Valuations": [{"FullCashValue": 0}, {"marketValue": 5}]},
+                "valuations": [{"AssessedValue": None}, {"TotalAssessedValue": "31,200"}],
+                "residential_details": {"SqFt": 1837, "squareFeet": 1900, "YearBuilt": 1999},
+            },
+        }
+
+        roots = (payload["search"], payload["parcel_payload"])
+        fields = _collect_fields(roots, _PARSED_FIELDS)
+
+        for field, keys in _PARSED_FIELDS.items():
+            self.assertEqual(fields.get(field), _deep_find_first(payload, keys), field)
+        self.assertEqual(fields["apn"], "123-45-678")
+        self.assertEqual(fields["square_feet"], 1900)
+        self.assertEqual(fields["market_value"], 0)
+        self.assertNotIn("lot_size_sqft", fields)
+
+
 if __name__ == "__main__":
     unittest.main()
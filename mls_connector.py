@@ -1,12 +1,76 @@
 """MLS connection module supporting RETS and RESO Web API."""
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from config import settings
+from json_utils import loads
 from models import Property, PropertyType, PropertyStatus
 
 logger = logging.getLogger(__name__)
 
+# Search filter clauses, in query order. search_properties supplies one value
+# per template; clauses whose value is empty are left out.
+_RETS_FILTER_TEMPLATES = (
+    "(City={})",
+    "(PostalCode={})",
+    "(PropertyType={})",
+    "(ListPrice>={})",
+    "(ListPrice<={})",
+    "(LivingArea>={})",
+    "(LivingArea<={})",
+    "(BedroomsTotal={})",
+    "(StandardStatus={})",
+    "(CloseDate>={})",
+)
+_RESO_FILTER_TEMPLATES = (
+    "City eq {}",
+    "PostalCode eq {}",
+    "ListPrice ge {}",
+    "ListPrice le {}",
+    "LivingArea ge {}",
+    "LivingArea le {}",
+    "BedroomsTotal eq {}",
+    "CloseDate ge {}",
+)
+
+# Shared pooled session for RESO Web API calls: comp lookups hit the same host
+# back to back, so keep-alive skips the TCP/TLS handshake after the first call.
+# Gateway errors on GETs are retried with a short backoff.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    ),
+)
+
+
+def _join_filters(templates: tuple, values: tuple, separator: str) -> str:
+    """Render each template whose value is set and join the clauses."""
+    return separator.join(
+        template.format(value) for template, value in zip(templates, values) if value
+    )
+
+
+def _odata_str(value: str) -> str:
+    """Quote an OData string literal (an embedded quote is doubled)."""
+    return "'{}'".format(value.replace("'", "''"))
+
+
+def _odata_filter_param(filter_query: str) -> str:
+    """Percent-encode a $filter expression for the query string."""
+    return "$filter=" + quote(filter_query, safe="'")
+
 
 class MLSConnector:
     """Base class for MLS connectors."""
@@ -42,6 +106,10 @@ class MLSConnector:
     def get_property_by_mls(self, mls_number: str) -> Optional[Property]:
         """Get a specific property by MLS number."""
         raise NotImplementedError
+    
+    def get_properties_by_mls(self, mls_numbers: List[str]) -> List[Optional[Property]]:
+        """Get several properties by MLS number, in input order (None when not found)."""
+        return [self.get_property_by_mls(mls_number) for mls_number in mls_numbers]
 
 
 class RETSConnector(MLSConnector):
@@ -52,6 +120,8 @@ class RETSConnector(MLSConnector):
         self.session = None
         self.rets = None
         try:
+            # Optional, RETS-only dependency: imported here so loading this module
+            # (the base of every connector) never pays for it
             import rets
             self.rets = rets
         except ImportError:
@@ -108,31 +178,19 @@ class RETSConnector(MLSConnector):
             raise ConnectionError("Not connected to MLS")
         
         # Build RETS query
-        query_parts = []
-        
-        if city:
-            query_parts.append(f"(City={city})")
-        if zip_code:
-            query_parts.append(f"(PostalCode={zip_code})")
-        if property_type:
+        query = _join_filters(_RETS_FILTER_TEMPLATES, (
+            city,
+            zip_code,
             # Map PropertyType to RETS property type codes
-            query_parts.append(f"(PropertyType={property_type.value})")
-        if min_price:
-            query_parts.append(f"(ListPrice>={min_price})")
-        if max_price:
-            query_parts.append(f"(ListPrice<={max_price})")
-        if min_sqft:
-            query_parts.append(f"(LivingArea>={min_sqft})")
-        if max_sqft:
-            query_parts.append(f"(LivingArea<={max_sqft})")
-        if bedrooms:
-            query_parts.append(f"(BedroomsTotal={bedrooms})")
-        if status:
-            query_parts.append(f"(StandardStatus={status.value})")
-        if sold_after:
-            query_parts.append(f"(CloseDate>={sold_after.strftime('%Y-%m-%d')})")
-        
-        query = " AND ".join(query_parts) if query_parts else "*"
+            property_type.value if property_type else None,
+            min_price,
+            max_price,
+            min_sqft,
+            max_sqft,
+            bedrooms,
+            status.value if status else None,
+            sold_after.strftime('%Y-%m-%d') if sold_after else None,
+        ), " AND ") or "*"
         
         try:
             # Standard RETS resource/class (adjust based on your MLS)
@@ -180,7 +238,8 @@ class RETSConnector(MLSConnector):
                 latitude=float(row.get("Latitude", 0)) if row.get("Latitude") else None,
                 longitude=float(row.get("Longitude", 0)) if row.get("Longitude") else None,
                 description=row.get("PublicRemarks", ""),
-                mls_data=dict(row)
+                # Rows usually arrive as plain dicts already; only copy other mappings
+                mls_data=row if type(row) is dict else dict(row)
             )
         except Exception as e:
             logger.error(f"Error parsing RETS row: {e}")
@@ -197,26 +256,48 @@ class RETSConnector(MLSConnector):
     
     def get_property_by_mls(self, mls_number: str) -> Optional[Property]:
         """Get property by MLS number."""
-        results = self.search_properties(limit=1)
-        # Filter by MLS number
-        for prop in results:
-            if prop.mls_number == mls_number:
-                return prop
-        return None
+        if not self.connected:
+            raise ConnectionError("Not connected to MLS")
+        
+        try:
+            results = self.session.search(
+                resource="Property",
+                resource_class="RES",
+                search_filter=f"(ListingID={mls_number})",
+                limit=1
+            )
+            for row in results:
+                return self._parse_rets_row(row)
+            return None
+        except Exception as e:
+            logger.error(f"Error getting RETS property by MLS: {e}")
+            return None
 
 
 class RESOWebAPIConnector(MLSConnector):
     """RESO Web API connector."""
     
-    def __init__(self):
+    # ListingIds per batched lookup; keeps the $filter URL under common length limits
+    MLS_BATCH_SIZE = 50
+    # Cap on batch requests in flight at once (fits the shared session's pool)
+    MAX_BATCH_CONCURRENCY = 4
+    
+    # Comp sessions re-request the same listings by MLS number; parsed properties
+    # from those lookups are reused briefly (search results are not cached)
+    PROPERTY_CACHE_TTL_SECONDS = 3600
+    PROPERTY_CACHE_MAXSIZE = 2048
+    
+    def __init__(self, session: Optional[requests.Session] = None):
         super().__init__()
+        self.session = session or _HTTP_SESSION
         self.access_token = None
         self.token_expires = None
+        self._auth_headers: Dict[str, str] = {}
+        # mls_number -> (expires_at, property)
+        self._property_cache: Dict[str, tuple] = {}
     
     def connect(self) -> bool:
         """Connect to RESO Web API using OAuth2."""
-        import requests
-        
         try:
             # OAuth2 token request
             token_url = f"{settings.reso_api_url}/token"
@@ -226,11 +307,12 @@ class RESOWebAPIConnector(MLSConnector):
                 "client_secret": settings.reso_client_secret
             }
             
-            response = requests.post(token_url, data=data)
+            response = self.session.post(token_url, data=data)
             response.raise_for_status()
             
-            token_data = response.json()
+            token_data = loads(response.content)
             self.access_token = token_data.get("access_token")
+            self._auth_headers = {"Authorization": f"Bearer {self.access_token}"}
             expires_in = token_data.get("expires_in", 3600)
             self.token_expires = datetime.now() + timedelta(seconds=expires_in)
             self.connected = True
@@ -250,6 +332,7 @@ class RESOWebAPIConnector(MLSConnector):
     def disconnect(self):
         """Disconnect from RESO Web API."""
         self.access_token = None
+        self._auth_headers = {}
         self.connected = False
     
     def search_properties(
@@ -267,44 +350,31 @@ class RESOWebAPIConnector(MLSConnector):
         limit: int = 100
     ) -> List[Property]:
         """Search properties via RESO Web API."""
-        import requests
-        
         if not self.connected:
             raise ConnectionError("Not connected to MLS")
         
         self._ensure_token()
         
         # Build OData query
-        query_params = []
-        if city:
-            query_params.append(f"City eq '{city}'")
-        if zip_code:
-            query_params.append(f"PostalCode eq '{zip_code}'")
-        if min_price:
-            query_params.append(f"ListPrice ge {min_price}")
-        if max_price:
-            query_params.append(f"ListPrice le {max_price}")
-        if min_sqft:
-            query_params.append(f"LivingArea ge {min_sqft}")
-        if max_sqft:
-            query_params.append(f"LivingArea le {max_sqft}")
-        if bedrooms:
-            query_params.append(f"BedroomsTotal eq {bedrooms}")
-        if sold_after:
-            query_params.append(f"CloseDate ge {sold_after.isoformat()}")
-        
-        filter_query = " and ".join(query_params) if query_params else ""
-        url = f"{settings.reso_api_url}/Property"
+        filter_query = _join_filters(_RESO_FILTER_TEMPLATES, (
+            _odata_str(city) if city else None,
+            _odata_str(zip_code) if zip_code else None,
+            min_price,
+            max_price,
+            min_sqft,
+            max_sqft,
+            bedrooms,
+            sold_after.isoformat() if sold_after else None,
+        ), " and ")
+        url = f"{settings.reso_api_url}/Property?$top={limit}"
         if filter_query:
-            url += f"?$filter={filter_query}"
-        url += f"&$top={limit}"
+            url += "&" + _odata_filter_param(filter_query)
         
         try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=self._auth_headers)
             response.raise_for_status()
             
-            data = response.json()
+            data = loads(response.content)
             properties = []
             for item in data.get("value", []):
                 prop = self._parse_reso_property(item)
@@ -355,22 +425,100 @@ class RESOWebAPIConnector(MLSConnector):
         except:
             return None
     
+    def _get_property_cached(self, mls_number: str) -> Optional[Property]:
+        """Return a copy of an unexpired cached property, or None."""
+        entry = self._property_cache.get(mls_number)
+        if entry is None:
+            return None
+        expires_at, prop = entry
+        if expires_at <= time.monotonic():
+            del self._property_cache[mls_number]
+            return None
+        # Callers enrich the properties they get back; keep the cached one pristine
+        return prop.model_copy(deep=True)
+    
+    def _set_property_cached(self, prop: Property):
+        """Cache a parsed property, evicting the oldest entry when full."""
+        self._property_cache.pop(prop.mls_number, None)
+        if len(self._property_cache) >= self.PROPERTY_CACHE_MAXSIZE:
+            del self._property_cache[next(iter(self._property_cache))]
+        self._property_cache[prop.mls_number] = (
+            time.monotonic() + self.PROPERTY_CACHE_TTL_SECONDS,
+            prop.model_copy(deep=True),
+        )
+    
     def get_property_by_mls(self, mls_number: str) -> Optional[Property]:
         """Get property by MLS number."""
-        import requests
+        cached = self._get_property_cached(mls_number)
+        if cached is not None:
+            return cached
         
         self._ensure_token()
         url = f"{settings.reso_api_url}/Property('{mls_number}')"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
         
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=self._auth_headers)
             response.raise_for_status()
-            data = response.json()
-            return self._parse_reso_property(data)
+            data = loads(response.content)
+            prop = self._parse_reso_property(data)
+            if prop:
+                self._set_property_cached(prop)
+            return prop
         except Exception as e:
             logger.error(f"Error getting property by MLS: {e}")
             return None
+    
+    def get_properties_by_mls(self, mls_numbers: List[str]) -> List[Optional[Property]]:
+        """Get several properties by MLS number with one OData request per batch."""
+        found: Dict[str, Property] = {}
+        missing = []
+        for mls_number in dict.fromkeys(mls_numbers):
+            cached = self._get_property_cached(mls_number)
+            if cached is not None:
+                found[mls_number] = cached
+            else:
+                missing.append(mls_number)
+        if not missing:
+            return [found.get(mls_number) for mls_number in mls_numbers]
+        
+        self._ensure_token()
+        batches = [
+            missing[start:start + self.MLS_BATCH_SIZE]
+            for start in range(0, len(missing), self.MLS_BATCH_SIZE)
+        ]
+        if len(batches) == 1:
+            results = [self._fetch_mls_batch(batches[0])]
+        else:
+            # Batches are independent; overlap their round-trips
+            with ThreadPoolExecutor(
+                max_workers=min(self.MAX_BATCH_CONCURRENCY, len(batches))
+            ) as executor:
+                results = list(executor.map(self._fetch_mls_batch, batches))
+        
+        for props in results:
+            for prop in props:
+                self._set_property_cached(prop)
+                found[prop.mls_number] = prop
+        return [found.get(mls_number) for mls_number in mls_numbers]
+    
+    def _fetch_mls_batch(self, batch: List[str]) -> List[Property]:
+        """Fetch one batch of listings with a single OData $filter request."""
+        filter_query = " or ".join(f"ListingId eq {_odata_str(mls_number)}" for mls_number in batch)
+        url = (
+            f"{settings.reso_api_url}/Property?{_odata_filter_param(filter_query)}&$top={len(batch)}"
+        )
+        try:
+            response = self.session.get(url, headers=self._auth_headers)
+            response.raise_for_status()
+            properties = []
+            for item in loads(response.content).get("value", []):
+                prop = self._parse_reso_property(item)
+                if prop:
+                    properties.append(prop)
+            return properties
+        except Exception as e:
+            logger.error(f"Error getting properties by MLS: {e}")
+            return []
 
 
 def get_mls_connector() -> MLSConnector:
@@ -379,7 +527,8 @@ def get_mls_connector() -> MLSConnector:
     Note: This function is deprecated. The codebase now uses ATTOM only.
     Use ATTOMConnector directly instead.
     """
-    # Default to ATTOM (only supported option now)
+    # Default to ATTOM (only supported option now). Imported here because
+    # attom_connector imports MLSConnector from this module.
     from attom_connector import ATTOMConnector
     if not settings.attom_api_key:
         raise ValueError("ATTOM API key required. Set ATTOM_API_KEY in .env")
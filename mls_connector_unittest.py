@@ -0,0 +1,113 @@
+import json
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from urllib.parse import unquote
+
+
+class TestRESOWebAPIConnector(unittest.TestCase):
+    def test_search_builds_filter_from_set_criteria(self) -> None:
+        from mls_connector import RESOWebAPIConnector
+
+        response = Mock()
+        response.content = json.dumps({"value": []}).encode()
+        session = Mock()
+        session.get.return_value = response
+        conn = RESOWebAPIConnector(session=session)
+        conn.connected = True
+        conn.access_token = "token"
+        conn.token_expires = datetime.max
+
+        with patch("mls_connector.settings", Mock(reso_api_url="https://mls.test")):
+            conn.search_properties(city="O'Fallon", min_price=0, max_sqft=2000, limit=5)
+            conn.search_properties()
+
+        filtered, unfiltered = (call.args[0] for call in session.get.call_args_list)
+        self.assertEqual(
+            unquote(filtered),
+            "https://mls.test/Property?$top=5&$filter=City eq 'O''Fallon' and LivingArea le 2000",
+        )
+        self.assertEqual(unfiltered, "https://mls.test/Property?$top=100")
+
+    def test_get_properties_by_mls_batches_into_one_request(self) -> None:
+        from mls_connector import RESOWebAPIConnector
+
+        response = Mock()
+        response.content = json.dumps({
+            "value": [
+                {"ListingId": "B", "City": "MESA", "StateOrProvince": "AZ"},
+                {"ListingId": "O'NEIL", "City": "MESA", "StateOrProvince": "AZ"},
+            ]
+        }).encode()
+        session = Mock()
+        session.get.return_value = response
+        conn = RESOWebAPIConnector(session=session)
+        conn.access_token = "token"
+        conn.token_expires = datetime.max
+
+        # RESO settings are no longer part of config.Settings (ATTOM is the default source)
+        with patch("mls_connector.settings", Mock(reso_api_url="https://mls.test")):
+            result = conn.get_properties_by_mls(["A", "B", "O'NEIL", "B"])
+
+        self.assertEqual(
+            [prop.mls_number if prop else None for prop in result], [None, "B", "O'NEIL", "B"]
+        )
+        session.get.assert_called_once()
+        url = unquote(session.get.call_args.args[0])
+        self.assertIn("ListingId eq 'A' or ListingId eq 'B' or ListingId eq 'O''NEIL'", url)
+        self.assertIn("$top=3", url)
+
+    def test_get_properties_by_mls_fans_out_batches(self) -> None:
+        from mls_connector import RESOWebAPIConnector
+
+        def get(url: str, **kwargs: object) -> Mock:
+            query = unquote(url.split("$filter=")[1].split("&")[0])
+            ids = [part.split("'")[1] for part in query.split(" or ")]
+            response = Mock()
+            response.content = json.dumps({
+                "value": [{"ListingId": i, "City": "MESA", "StateOrProvince": "AZ"} for i in ids]
+            }).encode()
+            return response
+
+        session = Mock()
+        session.get.side_effect = get
+        conn = RESOWebAPIConnector(session=session)
+        conn.MLS_BATCH_SIZE = 2
+        conn.access_token = "token"
+        conn.token_expires = datetime.max
+        ids = [f"M{i}" for i in range(7)]
+
+        with patch("mls_connector.settings", Mock(reso_api_url="https://mls.test")):
+            result = conn.get_properties_by_mls(ids)
+
+        self.assertEqual(session.get.call_count, 4)
+        self.assertEqual([prop.mls_number for prop in result], ids)
+
+    def test_repeat_lookups_served_from_cache_as_copies(self) -> None:
+        from mls_connector import RESOWebAPIConnector
+
+        response = Mock()
+        response.content = json.dumps(
+            {"ListingId": "A", "City": "MESA", "StateOrProvince": "AZ"}
+        ).encode()
+        session = Mock()
+        session.get.return_value = response
+        conn = RESOWebAPIConnector(session=session)
+        conn.access_token = "token"
+        conn.token_expires = datetime.max
+
+        with patch("mls_connector.settings", Mock(reso_api_url="https://mls.test")):
+            first = conn.get_property_by_mls("A")
+            first.mls_data["source_enrichment"] = ["maricopa_assessor"]
+            second = conn.get_property_by_mls("A")
+            batched = conn.get_properties_by_mls(["A"])
+
+        session.get.assert_called_once()
+        self.assertIsNot(first, second)
+        self.assertEqual(second.mls_number, "A")
+        self.assertNotIn("source_enrichment", second.mls_data)
+        self.assertEqual(batched[0].mls_number, "A")
+
+
+if __name__ == "__main__":
+    unittest.main()
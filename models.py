@@ -1,5 +1,6 @@
 """Data models for properties and comps."""
-from pydantic import BaseModel, Field
+import sys
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
@@ -106,6 +107,16 @@ class Property(BaseModel):
     # MLS metadata
     mls_data: dict = Field(default_factory=dict)
     
+    @field_validator(
+        'city', 'state', 'zip_code', 'garage_type', 'condition', 'architectural_style',
+        'heating_type', 'cooling_type', 'roof_material', 'school_district', 'view_type',
+        'financing_type',
+    )
+    @classmethod
+    def _intern_categorical(cls, value: Optional[str]) -> Optional[str]:
+        """Intern short categorical strings so identical values across comps share one object."""
+        return sys.intern(value) if isinstance(value, str) else value
+    
     def calculate_price_per_sqft(self) -> Optional[float]:
         """Calculate price per square foot."""
         price = self.sold_price or self.list_price
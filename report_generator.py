@@ -11,7 +11,7 @@ from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from config import settings
 from models import CompProperty, CompResult, Property
@@ -65,6 +65,9 @@ class ReportGenerator:
     WARNING_COLOR = "#ed8936"  # Orange for warnings
     DANGER_COLOR = "#e53e3e"  # Red for negative values
     LIGHT_BG = "#f7fafc"  # Light gray background
+
+    # File extension for each report format
+    EXTENSIONS = {"text": "txt", "html": "html", "markdown": "md", "pdf": "pdf"}
     
     def __init__(self):
         self.reports_dir = Path("reports")
@@ -324,29 +327,33 @@ class ReportGenerator:
 
     def save_report(self, comp_result: CompResult, format: str = "text") -> str:
         """Save report to file and return filepath."""
-        report_content = self.generate_report(comp_result, format)
+        return self.save_reports(comp_result, [format])[format]
 
-        # Generate filename
+    def save_reports(self, comp_result: CompResult, formats: Iterable[str]) -> Dict[str, str]:
+        """Save the report in several formats and return {format: filepath}.
+
+        The filename (address and timestamp) is built once, so every format
+        of one run shares the same name apart from its extension.
+        """
         subject = comp_result.subject_property
         address_safe = (
             subject.address.replace(" ", "_").replace(",", "").replace("/", "-")[:50]
         )
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        stem = f"valuation_report_{address_safe}_{timestamp}"
 
-        extension = {"text": "txt", "html": "html", "markdown": "md", "pdf": "pdf"}.get(
-            format, "txt"
-        )
-
-        filename = f"valuation_report_{address_safe}_{timestamp}.{extension}"
-        filepath = self.reports_dir / filename
-
-        if format == "pdf":
-            # PDF is saved directly by the generator
-            return str(filepath)
-        else:
+        paths = {}
+        for format in formats:
+            report_content = self.generate_report(comp_result, format)
+            if format == "pdf":
+                # PDF is saved directly by the generator, which returns its path
+                paths[format] = report_content
+                continue
+            filepath = self.reports_dir / f"{stem}.{self.EXTENSIONS.get(format, 'txt')}"
             with open(filepath, "w", encoding="utf-8") as f:
                 f.write(report_content)
-            return str(filepath)
+            paths[format] = str(filepath)
+        return paths
 
     def send_email_report(
         self, comp_result: CompResult, to_email: str, format: str = "pdf"
@@ -2,9 +2,11 @@
 import logging
 from typing import List, Dict, Any
 import numpy as np
+import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
-from comp_analyzer import CompAnalyzer
+from comp_analyzer import CompAnalyzer, _haversine_scalar
+from config import runtime_policy
 from models import Property, CompProperty
 
 logger = logging.getLogger(__name__)
@@ -30,7 +32,9 @@ class CompTrainer:
         for record in learning_data:
             subject = record['subject']
             selected_comps = record['selected_comps']
-            feedback = record.get('user_feedback', 1.0)  # Default positive feedback
+            feedback = record.get('user_feedback')
+            if feedback is None:
+                feedback = 1.0  # Default positive feedback
             
             # Create features for each comp selection
             for comp_prop in selected_comps:
@@ -39,12 +43,63 @@ class CompTrainer:
                 # Target: similarity score adjusted by feedback
                 y.append(comp_prop.similarity_score * feedback)
         
-        if len(X) < 10:
+        self._fit(np.array(X), np.array(y))
+    
+    def train_from_table(self, table: pd.DataFrame):
+        """Train model from a columnar learning table (see LearningDataStore.read).
+        
+        Features are computed for all rows at once with NumPy instead of
+        walking Property objects one comp at a time.
+        """
+        if table.empty:
             logger.warning("Not enough training examples")
             return
         
-        X = np.array(X)
-        y = np.array(y)
+        X, y = self._extract_table_features(table)
+        self._fit(X, y)
+    
+    def _extract_table_features(self, table: pd.DataFrame):
+        """Vectorized _extract_features over a learning table; returns (X, y)."""
+        def col(name: str) -> np.ndarray:
+            return table[name].to_numpy(dtype=float, na_value=np.nan)
+        
+        def present(values: np.ndarray) -> np.ndarray:
+            # Matches the truthiness checks in _extract_features (None/0 = missing)
+            return ~np.isnan(values) & (values != 0)
+        
+        def rel_diff(subject: np.ndarray, comp: np.ndarray, floor: float) -> np.ndarray:
+            valid = present(subject) & present(comp)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                diff = np.abs(subject - comp) / np.maximum(subject, floor)
+            return np.where(valid, diff, 1.0)
+        
+        distance = col('distance_miles')
+        subject_sqft = col('subject_square_feet')
+        subject_price = col('subject_list_price')
+        subject_year = col('subject_year_built')
+        comp_year = col('comp_year_built')
+        
+        with np.errstate(invalid='ignore'):
+            year_diff = np.minimum(np.abs(subject_year - comp_year) / 100.0, 1.0)
+        
+        X = np.column_stack([
+            np.where(np.isnan(distance), 1.0, distance / runtime_policy.max_comp_distance_miles),
+            rel_diff(subject_sqft, col('comp_square_feet'), 0.0),
+            rel_diff(subject_price, col('comp_price'), 0.0),
+            rel_diff(col('subject_bedrooms'), col('comp_bedrooms'), 1.0),
+            rel_diff(col('subject_bathrooms'), col('comp_bathrooms'), 0.5),
+            np.where(present(subject_year) & present(comp_year), year_diff, 1.0),
+            table['property_type_match'].to_numpy(dtype=float),
+        ])
+        feedback = col('user_feedback')
+        y = col('similarity_score') * np.where(np.isnan(feedback), 1.0, feedback)
+        return X, y
+    
+    def _fit(self, X: np.ndarray, y: np.ndarray):
+        """Fit the model and update the analyzer's weights from feature importances."""
+        if len(X) < 10:
+            logger.warning("Not enough training examples")
+            return
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -95,18 +150,15 @@ class CompTrainer:
     
     def _extract_features(self, subject: Property, candidate: Property) -> List[float]:
         """Extract numerical features for ML model."""
-        from geopy.distance import geodesic
-        from config import settings
-        
         features = []
         
         # Distance
         if subject.latitude and subject.longitude and candidate.latitude and candidate.longitude:
-            distance = geodesic(
-                (subject.latitude, subject.longitude),
-                (candidate.latitude, candidate.longitude)
-            ).miles
-            features.append(distance / settings.max_comp_distance_miles)  # Normalize
+            distance = _haversine_scalar(
+                subject.latitude, subject.longitude,
+                candidate.latitude, candidate.longitude
+            )
+            features.append(distance / runtime_policy.max_comp_distance_miles)  # Normalize
         else:
             features.append(1.0)  # Max distance if unknown
         
@@ -0,0 +1,17 @@
+"""Shared fixtures for the *_unittest.py suites."""
+from models import Property, PropertyStatus, PropertyType
+
+
+def make_property(mls_number: str, **kwargs: object) -> Property:
+    """Build a sold Mesa, AZ residential Property; kwargs override any field."""
+    fields = dict(
+        mls_number=mls_number,
+        address="1 MAIN ST",
+        city="MESA",
+        state="AZ",
+        zip_code="85201",
+        property_type=PropertyType.RESIDENTIAL,
+        status=PropertyStatus.SOLD,
+    )
+    fields.update(kwargs)
+    return Property(**fields)